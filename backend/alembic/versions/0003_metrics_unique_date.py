@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003_metrics_unique_date"
+down_revision = "0002_ingestion_runs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keep only the newest row per (instrument, day) before enforcing uniqueness.
+    op.execute(
+        sa.text(
+            "DELETE FROM metrics WHERE id NOT IN ("
+            "SELECT max(id) FROM metrics GROUP BY instrument_id, as_of_date)"
+        )
+    )
+    with op.batch_alter_table("metrics") as batch:
+        batch.create_unique_constraint(
+            "uq_metrics_instrument_date", ["instrument_id", "as_of_date"]
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("metrics") as batch:
+        batch.drop_constraint("uq_metrics_instrument_date", type_="unique")
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from alembic import op
+
+revision = "0004_hot_path_indexes"
+down_revision = "0003_metrics_unique_date"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Latest-metric lookups are served by the (instrument_id, as_of_date)
+    # index backing uq_metrics_instrument_date, scanned backwards for DESC.
+    op.create_index(
+        "ix_instruments_type_market_cap",
+        "instruments",
+        ["instrument_type", "market_cap"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_instruments_type_market_cap", table_name="instruments")
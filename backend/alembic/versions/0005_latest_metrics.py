@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005_latest_metrics"
+down_revision = "0004_hot_path_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "latest_metrics",
+        sa.Column(
+            "instrument_id",
+            sa.Integer(),
+            sa.ForeignKey("instruments.id"),
+            primary_key=True,
+        ),
+        sa.Column(
+            "metric_id",
+            sa.Integer(),
+            sa.ForeignKey("metrics.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+    )
+    op.execute(
+        """
+        INSERT INTO latest_metrics (instrument_id, metric_id)
+        SELECT instrument_id, metric_id FROM (
+            SELECT i.id AS instrument_id,
+                   (SELECT m.id FROM metrics m
+                    WHERE m.instrument_id = i.id
+                    ORDER BY m.as_of_date DESC, m.id DESC
+                    LIMIT 1) AS metric_id
+            FROM instruments i
+        ) AS latest
+        WHERE metric_id IS NOT NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("latest_metrics")
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006_metric_analytics"
+down_revision = "0005_latest_metrics"
+branch_labels = None
+depends_on = None
+
+COLUMNS = ("volatility", "drawdown", "sma_50", "sma_200", "momentum")
+
+
+def upgrade() -> None:
+    # Filled by ``python -m app.cli.analytics`` for existing history.
+    with op.batch_alter_table("metrics") as batch:
+        for name in COLUMNS:
+            batch.add_column(sa.Column(name, sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("metrics") as batch:
+        for name in reversed(COLUMNS):
+            batch.drop_column(name)
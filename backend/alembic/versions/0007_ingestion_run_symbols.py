@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007_ingestion_run_symbols"
+down_revision = "0006_metric_analytics"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ingestion_run_symbols",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "run_id",
+            sa.Integer(),
+            sa.ForeignKey("ingestion_runs.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "instrument_id",
+            sa.Integer(),
+            sa.ForeignKey("instruments.id"),
+            nullable=False,
+        ),
+        sa.Column(
+            "status",
+            sa.Enum("OK", "FAILED", name="ingestionstatus"),
+            nullable=False,
+        ),
+        sa.Column("as_of_date", sa.Date(), nullable=True),
+        sa.Column("error", sa.String(), nullable=True),
+        sa.Column("duration_ms", sa.Float(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+    )
+    op.create_index(
+        "ix_ingestion_run_symbols_instrument_status",
+        "ingestion_run_symbols",
+        ["instrument_id", "status", "run_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_ingestion_run_symbols_instrument_status",
+        table_name="ingestion_run_symbols",
+    )
+    op.drop_table("ingestion_run_symbols")
@@ -1,22 +1,59 @@
 from __future__ import annotations
 
 import time
+from typing import Any
+
 from fastapi import APIRouter, Request
 from pydantic import BaseModel
 
+from app.core.cache import LRUCache
 from app.core.config import get_settings
+from app.services.interpretation import interpret_cache
+from app.services.portfolio import recommendation_cache, selection_cache
 
 router = APIRouter()
 
 
+class CacheStatsPayload(BaseModel):
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    size: int
+    maxsize: int
+    hit_ratio: float
+
+
 class MetricsResponse(BaseModel):
     build: str
     uptime_seconds: float
+    recommendation_cache: CacheStatsPayload
+    selection_cache: CacheStatsPayload
+    interpret_cache: CacheStatsPayload
+
+
+def _cache_stats(cache: LRUCache[Any, Any]) -> CacheStatsPayload:
+    stats = cache.stats()
+    return CacheStatsPayload(
+        hits=stats.hits,
+        misses=stats.misses,
+        evictions=stats.evictions,
+        expirations=stats.expirations,
+        size=stats.size,
+        maxsize=stats.maxsize,
+        hit_ratio=stats.hit_ratio,
+    )
 
 
 @router.get("/metrics", response_model=MetricsResponse)
 def metrics(request: Request) -> MetricsResponse:
-    """Return basic build info and process uptime."""
+    """Return basic build info, process uptime and cache counters."""
     settings = get_settings()
     uptime = time.time() - request.app.state.start_time
-    return MetricsResponse(build=settings.APP_ENV, uptime_seconds=uptime)
+    return MetricsResponse(
+        build=settings.APP_ENV,
+        uptime_seconds=uptime,
+        recommendation_cache=_cache_stats(recommendation_cache),
+        selection_cache=_cache_stats(selection_cache),
+        interpret_cache=_cache_stats(interpret_cache),
+    )
@@ -1,22 +1,39 @@
 from __future__ import annotations
 
-from typing import Generator
+from typing import Any, AsyncGenerator, Generator
 
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.rate_limit import limiter
 
 
-from app.core.config import get_settings
-from app.db.session import get_engine, get_session
-from app.services.portfolio import recommend_portfolio
-from app.services.nlp.mock_interpreter import MockInterpreter
+from app.core.config import Settings, get_settings
+from app.db.session import get_async_session_factory, get_session_factory
+from app.domain.universe import UniverseSnapshot
+from app.services.portfolio import (
+    PortfolioIntent,
+    cached_recommend_portfolio,
+    cached_recommend_portfolio_async,
+    recommend_portfolios,
+    recommend_portfolios_async,
+    selection_cache,
+    stream_recommendation,
+    stream_recommendation_async,
+)
+from app.services.universe import universe_store
+from app.services.interpretation import interpreter
+from app.services.nlp.base import Intent
 from app.core.constants import DISCLAIMER
 
 
 from .schemas import (
+    BatchScreenRequest,
+    BatchScreenResponse,
     InterpretRequest,
     InterpretResponse,
     RecommendRequest,
@@ -24,22 +41,118 @@ from .schemas import (
     ScreenResponse,
 )
 
+NDJSON = "application/x-ndjson"
+
 router = APIRouter()
+# /screen and /recommend come in a blocking and an asyncio flavour; the app
+# mounts the one selected by ``Settings.DB_ASYNC`` (see ``screen_router``).
+sync_router = APIRouter()
+async_router = APIRouter()
 
-_interpreter = MockInterpreter()
+_interpreter = interpreter
 
 
 def get_db() -> Generator[Session, None, None]:
-    """Yield a database session bound to the configured engine."""
-    settings = get_settings()
-    engine = get_engine(settings.DATABASE_URL)
-    session = get_session(engine)
+    """Yield a session from the process-wide connection pool."""
+    session = get_session_factory(get_settings())()
     try:
         yield session
     finally:
         session.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Yield an async session from the process-wide async connection pool."""
+    async with get_async_session_factory(get_settings())() as session:
+        yield session
+
+
+def screen_router(settings: Settings) -> APIRouter:
+    """Return the router serving /screen and /recommend for ``settings``."""
+    return async_router if settings.DB_ASYNC else sync_router
+
+
+def _snapshot_enabled() -> bool:
+    settings = get_settings()
+    universe_store.refresh_seconds = settings.UNIVERSE_REFRESH_SECONDS
+    return settings.UNIVERSE_SNAPSHOT_ENABLED
+
+
+def _universe(session: Session) -> UniverseSnapshot | None:
+    """Return the shared universe snapshot when snapshot screening is enabled."""
+    if not _snapshot_enabled():
+        return None
+    return universe_store.get(session)
+
+
+async def _universe_async(session: AsyncSession) -> UniverseSnapshot | None:
+    """:func:`_universe` for an :class:`AsyncSession`."""
+    if not _snapshot_enabled():
+        return None
+    return await universe_store.get_async(session)
+
+
+_STREAM_RESPONSES: dict[int | str, dict[str, Any]] = {
+    200: {"content": {NDJSON: {}}}
+}
+_STREAM = Query(
+    False, description=f"Stream the result as {NDJSON} records instead of JSON"
+)
+
+
+def _respond(result: dict[str, Any]) -> ScreenResponse | Response:
+    """Return a portfolio payload from a handler.
+
+    Payloads are built by the service layer in the exact response shape, so
+    by default they are encoded once with orjson and FastAPI's response model
+    validation is skipped.  ``STRICT_RESPONSE_VALIDATION`` restores the
+    validated path, e.g. to check the payload against the schema.
+    """
+    if get_settings().STRICT_RESPONSE_VALIDATION:
+        return ScreenResponse(**result)
+    return Response(orjson.dumps(result), media_type="application/json")
+
+
+def _respond_batch(
+    results: list[dict[str, Any]],
+) -> BatchScreenResponse | Response:
+    """:func:`_respond` for /screen/batch results."""
+    if get_settings().STRICT_RESPONSE_VALIDATION:
+        return BatchScreenResponse(results=[ScreenResponse(**r) for r in results])
+    return Response(orjson.dumps({"results": results}), media_type="application/json")
+
+
+def _batch_intents(payload: BatchScreenRequest) -> list[PortfolioIntent]:
+    return [
+        PortfolioIntent(r.budget_inr, r.horizon_years, r.risk_profile, r.goal)
+        for r in payload.requests
+    ]
+
+
+def _resolve_intent(payload: RecommendRequest, intent: Intent) -> Intent:
+    """Merge explicit request fields over the interpreted ``intent``.
+
+    Raises ``HTTPException(400)`` when the result is still incomplete.
+    """
+    if payload.budget_inr is not None:
+        intent["budget_inr"] = payload.budget_inr
+    if payload.horizon_years is not None:
+        intent["horizon_years"] = payload.horizon_years
+    if payload.risk_profile is not None:
+        intent["risk_profile"] = payload.risk_profile
+    if payload.goal is not None:
+        intent["goal"] = payload.goal
+
+    if (
+        intent.get("budget_inr", 0) <= 0
+        or intent.get("horizon_years") is None
+        or intent.get("risk_profile") is None
+        or intent.get("goal") is None
+    ):
+        raise HTTPException(status_code=400, detail="Incomplete intent")
+    return intent
+
+
 @router.post("/interpret", response_model=InterpretResponse)
 @limiter.limit("60/minute")
 def interpret_text(payload: InterpretRequest, request: Request) -> InterpretResponse:  # noqa: ARG001
@@ -49,54 +162,139 @@ def interpret_text(payload: InterpretRequest, request: Request) -> InterpretResp
     return InterpretResponse(**intent)
 
 
-@router.post("/screen", response_model=ScreenResponse)
+@sync_router.post(
+    "/screen", response_model=ScreenResponse, responses=_STREAM_RESPONSES
+)
 def screen_portfolio(
-    request: ScreenRequest, db: Session = Depends(get_db)
-) -> ScreenResponse:
-    """Return a recommended portfolio for the given input parameters."""
-    result = recommend_portfolio(
+    request: ScreenRequest, stream: bool = _STREAM, db: Session = Depends(get_db)
+) -> ScreenResponse | Response:
+    """Return a recommended portfolio for the given input parameters.
+
+    With ``stream=true`` the portfolio is sent as NDJSON records rendered on
+    the fly (see :func:`~app.services.portfolio.ndjson_recommendation`).
+    """
+    if stream:
+        lines = stream_recommendation(
+            db,
+            budget_inr=request.budget_inr,
+            horizon_years=request.horizon_years,
+            risk_profile=request.risk_profile,
+            goal=request.goal,
+            snapshot=_universe(db),
+            selection_cache=selection_cache,
+        )
+        return StreamingResponse(lines, media_type=NDJSON)
+    result = cached_recommend_portfolio(
         db,
         budget_inr=request.budget_inr,
         horizon_years=request.horizon_years,
         risk_profile=request.risk_profile,
         goal=request.goal,
+        snapshot=_universe(db),
     )
-    return ScreenResponse(**result)
+    return _respond(result)
 
 
-@router.post("/recommend", response_model=ScreenResponse)
+@sync_router.post("/screen/batch", response_model=BatchScreenResponse)
+def screen_batch(
+    payload: BatchScreenRequest, db: Session = Depends(get_db)
+) -> BatchScreenResponse | Response:
+    """Screen many requests at once, returning results in request order.
+
+    Requests sharing filter parameters are screened once against the same
+    universe snapshot.
+    """
+    results = recommend_portfolios(
+        db,
+        _batch_intents(payload),
+        snapshot=_universe(db),
+        selection_cache=selection_cache,
+    )
+    return _respond_batch(results)
+
+
+@sync_router.post("/recommend", response_model=ScreenResponse)
 @limiter.limit("60/minute")
 def recommend(
     payload: RecommendRequest, request: Request, db: Session = Depends(get_db)
-) -> ScreenResponse:  # noqa: ARG001
+) -> ScreenResponse | Response:  # noqa: ARG001
     """Interpret free text and return a recommended portfolio."""
-    intent = _interpreter.interpret(payload.text)
-    if payload.budget_inr is not None:
-        intent["budget_inr"] = payload.budget_inr
-    if payload.horizon_years is not None:
-        intent["horizon_years"] = payload.horizon_years
-    if payload.risk_profile is not None:
-        intent["risk_profile"] = payload.risk_profile
-    if payload.goal is not None:
-        intent["goal"] = payload.goal
+    intent = _resolve_intent(payload, _interpreter.interpret(payload.text))
+    result = cached_recommend_portfolio(
+        db,
+        budget_inr=intent["budget_inr"],
+        horizon_years=intent["horizon_years"],
+        risk_profile=intent["risk_profile"],
+        goal=intent["goal"],
+        snapshot=_universe(db),
+    )
+    return _respond(result)
 
 
-    if (
-        intent.get("budget_inr", 0) <= 0
-        or intent.get("horizon_years") is None
-        or intent.get("risk_profile") is None
-        or intent.get("goal") is None
-    ):
-        raise HTTPException(status_code=400, detail="Incomplete intent")
+@async_router.post(
+    "/screen", response_model=ScreenResponse, responses=_STREAM_RESPONSES
+)
+async def screen_portfolio_async(
+    request: ScreenRequest,
+    stream: bool = _STREAM,
+    db: AsyncSession = Depends(get_async_db),
+) -> ScreenResponse | Response:
+    """:func:`screen_portfolio` on the event loop with an async session."""
+    if stream:
+        lines = await stream_recommendation_async(
+            db,
+            budget_inr=request.budget_inr,
+            horizon_years=request.horizon_years,
+            risk_profile=request.risk_profile,
+            goal=request.goal,
+            snapshot=await _universe_async(db),
+            selection_cache=selection_cache,
+        )
+        return StreamingResponse(lines, media_type=NDJSON)
+    result = await cached_recommend_portfolio_async(
+        db,
+        budget_inr=request.budget_inr,
+        horizon_years=request.horizon_years,
+        risk_profile=request.risk_profile,
+        goal=request.goal,
+        snapshot=await _universe_async(db),
+    )
+    return _respond(result)
+
 
-    result = recommend_portfolio(
+@async_router.post("/screen/batch", response_model=BatchScreenResponse)
+async def screen_batch_async(
+    payload: BatchScreenRequest, db: AsyncSession = Depends(get_async_db)
+) -> BatchScreenResponse | Response:
+    """:func:`screen_batch` on the event loop with an async session."""
+    results = await recommend_portfolios_async(
+        db,
+        _batch_intents(payload),
+        snapshot=await _universe_async(db),
+        selection_cache=selection_cache,
+    )
+    return _respond_batch(results)
+
+
+@async_router.post("/recommend", response_model=ScreenResponse)
+@limiter.limit("60/minute")
+async def recommend_async(
+    payload: RecommendRequest,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+) -> ScreenResponse | Response:  # noqa: ARG001
+    """:func:`recommend` on the event loop with an async session."""
+    interpreted = await _interpreter.interpret_async(payload.text)
+    intent = _resolve_intent(payload, interpreted)
+    result = await cached_recommend_portfolio_async(
         db,
         budget_inr=intent["budget_inr"],
         horizon_years=intent["horizon_years"],
         risk_profile=intent["risk_profile"],
         goal=intent["goal"],
+        snapshot=await _universe_async(db),
     )
-    return ScreenResponse(**result)
+    return _respond(result)
 
 @router.get("/info")
 def info() -> dict[str, str]:
@@ -18,10 +18,25 @@ class ScreenRequest(BaseModel):
     goal: Goal
 
 
+MAX_BATCH_SIZE = 200
+
+
+class BatchScreenRequest(BaseModel):
+    """Request model for the /screen/batch endpoint."""
+
+    requests: List[ScreenRequest] = Field(
+        ..., min_length=1, max_length=MAX_BATCH_SIZE
+    )
+
+
 class Allocation(BaseModel):
     symbol: str
     percent: float
     amount_inr: float
+    shares: Optional[int] = Field(
+        None, description="Whole shares bought at the latest price"
+    )
+    cost_inr: Optional[float] = Field(None, description="Cost of those shares")
 
 
 class MetricPayload(BaseModel):
@@ -50,11 +65,19 @@ class ExplanationsPayload(BaseModel):
 
 class ScreenResponse(BaseModel):
     allocations: List[Allocation]
+    residual_cash_inr: Optional[float] = Field(
+        None, description="Budget left after buying whole shares"
+    )
     instruments: List[InstrumentPayload]
     explanations: ExplanationsPayload
     disclaimer: str
 
 
+class BatchScreenResponse(BaseModel):
+    """Responses for a /screen/batch call, in request order."""
+
+    results: List[ScreenResponse]
+
 
 class InterpretRequest(BaseModel):
     """Request payload for the /interpret endpoint."""
@@ -0,0 +1,51 @@
+"""Recompute the rolling analytics of every stored metric.
+
+Usage: ``python -m app.cli.analytics [SINCE]``
+
+Ingestion keeps the statistics of new days current; run this once after
+migrating an existing database, or with an ISO ``SINCE`` date to redo the
+days from then on.
+"""
+from __future__ import annotations
+
+import sys
+from datetime import date
+
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.db.base import Base
+from app.db.models import IngestionRun
+from app.db.session import get_engine, get_session
+from app.services.analytics import update_analytics
+from app.services.universe import universe_store
+
+
+def backfill(session: Session, since: date | None = None) -> int:
+    """Recompute analytics from ``since`` (default: all days) and commit.
+
+    The update is recorded as an ``IngestionRun`` so snapshots and caches in
+    other processes reload it.
+    """
+    written = update_analytics(session, since=since)
+    session.add(IngestionRun())
+    session.commit()
+    universe_store.invalidate()
+    return written
+
+
+def main(argv: list[str] | None = None) -> None:  # pragma: no cover - CLI wrapper
+    argv = argv or []
+    since = date.fromisoformat(argv[0]) if argv else None
+    settings = get_settings()
+    engine = get_engine(settings.DATABASE_URL)
+    Base.metadata.create_all(engine)
+    session = get_session(engine)
+    try:
+        print(f"updated {backfill(session, since)} metrics")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main(sys.argv[1:])
@@ -0,0 +1,57 @@
+"""Backtest every risk profile and goal against the stored metric history.
+
+Usage: ``python -m app.cli.backtest [START [END [MONTHS [WORKERS]]]]``
+
+Rebalances at every ``MONTHS``-th month end (default 1) between the ISO
+dates ``START`` and ``END`` (default: the whole history), with ``WORKERS``
+processes (default: one per CPU), and prints each profile's performance
+and the wall time per simulated year.
+"""
+from __future__ import annotations
+
+import sys
+from datetime import date
+
+from app.core.config import get_settings
+from app.db.session import get_engine, get_session
+from app.domain.backtest import BacktestResult
+from app.services.backtest import BacktestConfig, run_backtest
+
+
+def report(result: BacktestResult) -> str:
+    """Format the profile summaries and timing of ``result`` as a table."""
+    lines = [
+        f"{'profile':<20} {'periods':>7} {'total':>8} {'annual':>8}"
+        f" {'vol':>7} {'max dd':>7} {'holdings':>8}"
+    ]
+    for s in result.summaries():
+        lines.append(
+            f"{s.risk_profile.value + '/' + s.goal.value:<20} {s.periods:>7}"
+            f" {s.total_return:8.1%} {s.annualized_return:8.1%}"
+            f" {s.annualized_volatility:7.1%} {s.max_drawdown:7.1%}"
+            f" {s.mean_holdings:8.1f}"
+        )
+    lines.append(
+        f"simulated {result.years:.1f} years in {result.seconds:.2f} s"
+        f" ({result.seconds_per_year:.3f} s per year)"
+    )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> None:  # pragma: no cover - CLI wrapper
+    argv = argv or []
+    config = BacktestConfig(
+        start=date.fromisoformat(argv[0]) if len(argv) > 0 else None,
+        end=date.fromisoformat(argv[1]) if len(argv) > 1 else None,
+        months=int(argv[2]) if len(argv) > 2 else 1,
+    )
+    workers = int(argv[3]) if len(argv) > 3 else None
+    session = get_session(get_engine(get_settings().DATABASE_URL))
+    try:
+        print(report(run_backtest(session, config, workers)))
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main(sys.argv[1:])
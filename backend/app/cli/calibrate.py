@@ -0,0 +1,95 @@
+"""Sweep the screening thresholds of a profile over a grid.
+
+Usage: ``python -m app.cli.calibrate RISK GOAL [AS_OF [WORKERS]]``
+
+Evaluates the :data:`~app.domain.calibration.DEFAULT_GRID` of market cap,
+debt to equity, ROE and dividend yield thresholds around the profile's
+other filters, against the current universe or the one as of the ISO date
+``AS_OF``, with ``WORKERS`` processes (default: one per CPU).  Prints what
+the profile's current thresholds screen and the most diversified grid
+points that still fill a screen.
+"""
+from __future__ import annotations
+
+import sys
+import time
+from datetime import date
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.db.session import get_engine, get_session
+from app.domain.calibration import (
+    DEFAULT_GRID,
+    SWEPT_FIELDS,
+    CalibrationArrays,
+    GridStats,
+    evaluate_grid,
+)
+from app.domain.mapping import Goal, RiskProfile, map_intent_to_filters
+from app.domain.types import FilterParams
+from app.domain.universe import UniverseSnapshot, build_universe_snapshot
+from app.services.backtest import universe_as_of
+from app.services.calibration import sweep
+
+
+def report(current: GridStats, stats: GridStats, min_candidates: int) -> str:
+    """Format the current thresholds' row and the best grid points as a table."""
+    lines = [
+        f"{'':<8} {'mcap':>9} {'max d/e':>7} {'min roe':>7} {'min yld':>7}"
+        f" {'stocks':>6} {'sectors':>7} {'hhi':>5} {'mean yld':>8} {'med yld':>7}"
+    ]
+
+    def row(label: str, data: GridStats, i: int) -> str:
+        cap, de, roe, dy = data.points[i]
+        return (
+            f"{label:<8} {cap:9.2e} {de:7.2f} {roe:7.1%} {dy:7.2%}"
+            f" {data.candidates[i]:>6} {data.sectors[i]:>7}"
+            f" {data.concentration[i]:5.2f} {data.mean_yield[i]:8.2%}"
+            f" {data.median_yield[i]:7.2%}"
+        )
+
+    lines.append(row("current", current, 0))
+    for rank, i in enumerate(stats.best(min_candidates), start=1):
+        lines.append(row(f"#{rank}", stats, i))
+    return "\n".join(lines)
+
+
+def calibrate(
+    snapshot: UniverseSnapshot, base: FilterParams, workers: int | None = None
+) -> str:
+    """Sweep :data:`DEFAULT_GRID` around ``base`` and report the results."""
+    started = time.perf_counter()
+    points = DEFAULT_GRID.points()
+    stats = sweep(snapshot, base, points, workers)
+    seconds = time.perf_counter() - started
+    point = np.array([[getattr(base, f) for f in SWEPT_FIELDS]], dtype=np.float64)
+    current = evaluate_grid(CalibrationArrays.from_snapshot(snapshot, base), point)
+    return (
+        report(current, stats, base.max_instruments * 2)
+        + f"\nswept {len(points)} points over {len(snapshot)} instruments"
+        f" in {seconds:.2f} s"
+    )
+
+
+def main(argv: list[str] | None = None) -> None:  # pragma: no cover - CLI wrapper
+    argv = argv or []
+    if len(argv) < 2:
+        sys.exit(__doc__)
+    base = map_intent_to_filters(RiskProfile(argv[0]), Goal(argv[1]), 5)
+    as_of = date.fromisoformat(argv[2]) if len(argv) > 2 else None
+    workers = int(argv[3]) if len(argv) > 3 else None
+    session = get_session(get_engine(get_settings().DATABASE_URL))
+    try:
+        snapshot = (
+            build_universe_snapshot(session)
+            if as_of is None
+            else universe_as_of(session, as_of)
+        )
+    finally:
+        session.close()
+    print(calibrate(snapshot, base, workers))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main(sys.argv[1:])
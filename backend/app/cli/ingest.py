@@ -1,47 +1,149 @@
+"""Fetch the latest metrics of every instrument, or only the stale ones.
+
+Usage: ``python -m app.cli.ingest [--incremental [AS_OF]]``
+
+``--incremental`` fetches only the instruments without metrics for the ISO
+date ``AS_OF`` (default: today, or the Friday before on a weekend), such
+as the symbols that failed in the previous run.
+"""
 from __future__ import annotations
 
+import logging
+import sys
+import time
+from datetime import date, datetime, timedelta
+
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
 from app.db.base import Base
-from app.db.models import IngestionRun, InstrumentType, Metric
+from app.db.models import IngestionRun, IngestionStatus, InstrumentType
 from app.db.session import get_engine, get_session
+from app.repositories.ingestion_runs import IngestionRunRepository
 from app.repositories.instruments import InstrumentRepository
 from app.repositories.metrics import MetricRepository
+from app.services.analytics import update_analytics
+from app.services.ingestion.base import Ingestor
 from app.services.ingestion.yf_ingestor import YFIngestor
+from app.services.universe import universe_store
+
+logger = logging.getLogger("app")
+
 
+def last_weekday(day: date) -> date:
+    """Return ``day``, or the Friday before it if it falls on a weekend."""
+    return day - timedelta(days=max(day.weekday() - 4, 0))
 
-def ingest(session: Session) -> None:
-    """Fetch and persist metrics for all instruments."""
+
+def ingest(
+    session: Session,
+    ingestor: Ingestor | None = None,
+    incremental: bool = False,
+    as_of: date | None = None,
+) -> IngestionRun | None:
+    """Fetch and persist metrics for all instruments, or only the stale ones.
+
+    All rows are upserted on ``(instrument_id, as_of_date)`` and committed
+    together with the refreshed ``latest_metrics`` pointers and the
+    ``IngestionRun`` record, so re-running on the same day updates rather
+    than duplicates metrics and readers never see a half-refreshed state.
+    The rolling analytics of the fetched instruments are recomputed from the
+    earliest fetched day in the same transaction.
+
+    The status, duration and attempts of every fetched symbol are recorded
+    under the run.  With ``incremental`` only the instruments
+    :meth:`~app.repositories.instruments.InstrumentRepository.list_stale`
+    reports for ``as_of`` (default: :func:`last_weekday` of today) are
+    fetched, so a re-run after a partial failure fetches just the symbols
+    that are still missing.  Returns the run, or ``None`` when an
+    incremental run found nothing to fetch.
+    """
+    started = time.perf_counter()
+    if ingestor is None:
+        ingestor = YFIngestor.from_settings(get_settings())
     inst_repo = InstrumentRepository(session)
     metric_repo = MetricRepository(session)
-    instruments = inst_repo.list_all()
-    symbols = [inst.symbol for inst in instruments]
-    data = YFIngestor().fetch_metrics(symbols)
-    for inst in instruments:
-        m = data.get(inst.symbol)
+    if incremental:
+        as_of = as_of or last_weekday(datetime.utcnow().date())
+        instruments = inst_repo.list_stale(as_of)
+        if not instruments:
+            logger.info("ingestion skipped", extra={"as_of": as_of.isoformat()})
+            return None
+    else:
+        instruments = inst_repo.list_all()
+    results = ingestor.fetch([inst.symbol for inst in instruments])
+    rows: list[dict[str, object]] = []
+    outcomes: list[dict[str, object]] = []
+    fetched_ids: set[int] = set()
+    since: date | None = None
+    for inst, result in zip(instruments, results):
+        m = result.metrics
+        outcomes.append(
+            {
+                "instrument_id": inst.id,
+                "status": IngestionStatus.OK if result.ok else IngestionStatus.FAILED,
+                "as_of_date": m["as_of_date"] if m is not None else None,
+                "error": result.error,
+                "duration_ms": result.duration_ms,
+                "attempts": result.attempts,
+            }
+        )
         if m is None:
             continue
-        metric_repo.create(
-            Metric(
-                instrument_id=inst.id,
-                as_of_date=m["as_of_date"],
-                price=m["price"],
-                pe=m.get("pe") if inst.instrument_type is InstrumentType.STOCK else None,
-                dividend_yield=m.get("dividend_yield"),
-            )
+        day = m["as_of_date"]
+        assert isinstance(day, date)
+        fetched_ids.add(inst.id)
+        since = day if since is None else min(since, day)
+        rows.append(
+            {
+                "instrument_id": inst.id,
+                "as_of_date": day,
+                "price": m["price"],
+                "pe": m.get("pe") if inst.instrument_type is InstrumentType.STOCK else None,
+                "dividend_yield": m.get("dividend_yield"),
+            }
         )
-    session.add(IngestionRun())
+    # Metrics, analytics, latest pointers and the run with its per-symbol
+    # outcomes land in one transaction.
+    metric_repo.bulk_upsert(rows)
+    if rows:
+        update_analytics(session, since=since, instrument_ids=fetched_ids)
+    metric_repo.refresh_latest(fetched_ids if incremental else None)
+    run = IngestionRun()
+    session.add(run)
+    session.flush()
+    IngestionRunRepository(session).add_symbols(run.id, outcomes)
     session.commit()
+    universe_store.invalidate()
+    logger.info(
+        "ingestion finished",
+        extra={
+            "incremental": incremental,
+            "requested": len(instruments),
+            "fetched": len(rows),
+            "failed": len(instruments) - len(rows),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+        },
+    )
+    return run
 
 
-def main() -> None:  # pragma: no cover - wrapper for CLI
+def main(argv: list[str] | None = None) -> None:
+    """Run :func:`ingest` for ``argv`` (default: the process arguments)."""
+    argv = sys.argv[1:] if argv is None else argv
+    incremental = argv[:1] == ["--incremental"]
+    if len(argv) > (2 if incremental else 0):
+        sys.exit(__doc__)
+    try:
+        as_of = date.fromisoformat(argv[1]) if len(argv) == 2 else None
+    except ValueError:
+        sys.exit(__doc__)
     settings = get_settings()
     engine = get_engine(settings.DATABASE_URL)
     Base.metadata.create_all(engine)
     session = get_session(engine)
     try:
-        ingest(session)
+        ingest(session, incremental=incremental, as_of=as_of)
     finally:
         session.close()
 
@@ -13,7 +13,31 @@ class Settings(BaseSettings):
     DATABASE_URL: str = "sqlite:///:memory:"
     AI_PROVIDER: Literal["mock", "openai"] = "mock"
     AI_API_KEY: str | None = None
+    AI_BASE_URL: str = "https://api.openai.com/v1"
+    AI_MODEL: str = "gpt-4o-mini"
+    AI_TIMEOUT_SECONDS: float = 3.0
+    AI_MAX_CONCURRENCY: int = 16
     CORS_ORIGINS: List[str] = ["*"]
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE: int = 1800
+    DB_ASYNC: bool = False
+    ASYNC_DATABASE_URL: str | None = None
+    UNIVERSE_SNAPSHOT_ENABLED: bool = True
+    UNIVERSE_REFRESH_SECONDS: float = 30.0
+    RECOMMEND_CACHE_SIZE: int = 1024
+    RECOMMEND_CACHE_TTL_SECONDS: float = 300.0
+    SELECTION_CACHE_SIZE: int = 256
+    INTERPRET_CACHE_SIZE: int = 4096
+    INTERPRET_CACHE_TTL_SECONDS: float = 86400.0
+    INTERPRET_CACHE_PATH: str | None = None
+    INGEST_CONCURRENCY: int = 8
+    INGEST_TIMEOUT_SECONDS: float = 30.0
+    INGEST_MAX_RETRIES: int = 2
+    INGEST_BACKOFF_SECONDS: float = 1.0
+    INGEST_BATCH_SIZE: int = 100
+    STRICT_RESPONSE_VALIDATION: bool = False
 
 
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=True)
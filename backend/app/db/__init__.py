@@ -1 +1,7 @@
 """Database utilities and models."""
+
+# Importing the pointer maintenance registers its ORM listeners whenever the
+# models are used.
+from app.db.latest_metrics import refresh_latest_metrics
+
+__all__ = ["refresh_latest_metrics"]
@@ -0,0 +1,56 @@
+"""Maintenance of the ``latest_metrics`` pointer table."""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+from sqlalchemy import Connection, delete, event, insert, inspect, select
+from sqlalchemy.orm import Mapper
+
+from app.db.models import Instrument, LatestMetric, Metric
+
+
+def refresh_latest_metrics(
+    connection: Connection, instrument_ids: Iterable[int] | None = None
+) -> None:
+    """Recompute ``latest_metrics`` for ``instrument_ids`` (default: all).
+
+    Ties on ``as_of_date`` are broken by the highest metric ``id``.  Runs on
+    the caller's connection so it commits together with the metric writes.
+    """
+
+    latest_id = (
+        select(Metric.id)
+        .where(Metric.instrument_id == Instrument.id)
+        .order_by(Metric.as_of_date.desc(), Metric.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    pairs = select(Instrument.id.label("instrument_id"), latest_id.label("metric_id"))
+    clear = delete(LatestMetric)
+    if instrument_ids is not None:
+        ids = list(instrument_ids)
+        pairs = pairs.where(Instrument.id.in_(ids))
+        clear = clear.where(LatestMetric.instrument_id.in_(ids))
+    source = pairs.subquery()
+    connection.execute(clear)
+    connection.execute(
+        insert(LatestMetric).from_select(
+            ["instrument_id", "metric_id"],
+            select(source).where(source.c.metric_id.is_not(None)),
+        )
+    )
+
+
+# Metrics written through the ORM keep their instrument's pointer current,
+# and that of the instrument an update moved them away from; bulk Core
+# writes (ingestion) call refresh_latest_metrics explicitly.
+@event.listens_for(Metric, "after_insert")
+@event.listens_for(Metric, "after_update")
+@event.listens_for(Metric, "after_delete")
+def _sync_latest_metric(
+    mapper: Mapper[Metric], connection: Connection, target: Metric
+) -> None:
+    ids = {target.instrument_id}
+    ids.update(inspect(target).attrs.instrument_id.history.deleted)
+    refresh_latest_metrics(connection, ids)
@@ -5,6 +5,7 @@ from enum import Enum
 from typing import Optional
 
 from sqlalchemy import Date, Enum as SqlEnum, Float, ForeignKey, Integer, String
+from sqlalchemy import Index, UniqueConstraint
 from sqlalchemy import DateTime
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -19,6 +20,9 @@ class InstrumentType(str, Enum):
 
 class Instrument(Base):
     __tablename__ = "instruments"
+    __table_args__ = (
+        Index("ix_instruments_type_market_cap", "instrument_type", "market_cap"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     symbol: Mapped[str] = mapped_column(String, unique=True, nullable=False)
@@ -39,12 +43,62 @@ class IngestionRun(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     run_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
 
+    symbols: Mapped[list["IngestionRunSymbol"]] = relationship(back_populates="run")
+
+
+class IngestionStatus(str, Enum):
+    OK = "ok"
+    FAILED = "failed"
+
+
+class IngestionRunSymbol(Base):
+    """Outcome of fetching one instrument during an ingestion run."""
+
+    __tablename__ = "ingestion_run_symbols"
+    # Serves "last successful fetch per instrument" lookups.
+    __table_args__ = (
+        Index(
+            "ix_ingestion_run_symbols_instrument_status",
+            "instrument_id",
+            "status",
+            "run_id",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    run_id: Mapped[int] = mapped_column(
+        ForeignKey("ingestion_runs.id", ondelete="CASCADE"), nullable=False
+    )
+    instrument_id: Mapped[int] = mapped_column(
+        ForeignKey("instruments.id"), nullable=False
+    )
+    status: Mapped[IngestionStatus] = mapped_column(
+        SqlEnum(IngestionStatus), nullable=False
+    )
+    as_of_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    duration_ms: Mapped[float] = mapped_column(Float, nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+
+    run: Mapped[IngestionRun] = relationship(back_populates="symbols")
+
 
 class Metric(Base):
     __tablename__ = "metrics"
+    # The unique constraint's (instrument_id, as_of_date) index also serves
+    # "latest metric per instrument" lookups, read backwards for DESC order.
+    __table_args__ = (
+        UniqueConstraint(
+            "instrument_id", "as_of_date", name="uq_metrics_instrument_date"
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    instrument_id: Mapped[int] = mapped_column(ForeignKey("instruments.id"), nullable=False)
+    # The previous value is loaded on change so the listeners keeping
+    # ``latest_metrics`` current can also refresh the instrument left behind.
+    instrument_id: Mapped[int] = mapped_column(
+        ForeignKey("instruments.id"), nullable=False, active_history=True
+    )
     as_of_date: Mapped[date] = mapped_column(Date, nullable=False)
     price: Mapped[float] = mapped_column(Float, nullable=False)
     pe: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
@@ -53,5 +107,29 @@ class Metric(Base):
     dividend_yield: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     revenue_growth: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     earnings_growth: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    # Rolling price statistics maintained by app.services.analytics.
+    volatility: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    drawdown: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    sma_50: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    sma_200: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    momentum: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
 
     instrument: Mapped[Instrument] = relationship(back_populates="metrics")
+
+
+class LatestMetric(Base):
+    """Pointer to the most recent ``Metric`` row of each instrument.
+
+    Maintained by :func:`app.db.latest_metrics.refresh_latest_metrics` so
+    reads resolve the latest metric with primary-key lookups instead of
+    ranking the whole history.
+    """
+
+    __tablename__ = "latest_metrics"
+
+    instrument_id: Mapped[int] = mapped_column(
+        ForeignKey("instruments.id"), primary_key=True
+    )
+    metric_id: Mapped[int] = mapped_column(
+        ForeignKey("metrics.id", ondelete="CASCADE"), nullable=False
+    )
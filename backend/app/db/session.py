@@ -1,12 +1,149 @@
-from sqlalchemy import Engine, create_engine
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import Engine, create_engine, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import Settings
+
+_engine: Engine | None = None
+_session_factory: sessionmaker[Session] | None = None
+_async_engine: AsyncEngine | None = None
+_async_session_factory: async_sessionmaker[AsyncSession] | None = None
+
+# Async drivers substituted for the default sync ones when
+# ASYNC_DATABASE_URL is not set explicitly.  psycopg 3 serves both modes.
+_ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "psycopg"}
+_SYNC_ONLY_DRIVERS = ("pysqlite", "psycopg2")
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (
+        None,
+        "",
+        ":memory:",
+    )
+
 
+def _pool_options(settings: Settings) -> dict[str, Any]:
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
 
-def get_engine(url: str) -> Engine:
-    """Create a database engine for the given URL."""
-    return create_engine(url, future=True)
+
+def get_engine(url: str, **pool_options: Any) -> Engine:
+    """Create a database engine for the given URL.
+
+    ``pool_options`` are forwarded to :func:`sqlalchemy.create_engine` unless
+    the URL is an in-memory SQLite database.  Such a database lives inside a
+    single connection, which is shared by all threads using the engine.
+    """
+    if _is_memory_sqlite(url):
+        pool_options = {
+            "poolclass": StaticPool,
+            "connect_args": {"check_same_thread": False},
+        }
+    return create_engine(url, future=True, **pool_options)
 
 
 def get_session(engine: Engine) -> Session:
     """Create a new session bound to the provided engine."""
     return sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)()
+
+
+def async_database_url(url: str) -> str:
+    """Return ``url`` with a sync-only driver swapped for an asyncio one.
+
+    URLs already naming an async-capable driver are returned unchanged.
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    driver = _ASYNC_DRIVERS.get(backend)
+    if driver is None or parsed.get_driver_name() not in _SYNC_ONLY_DRIVERS:
+        return url
+    _, rest = url.split(":", 1)
+    return f"{backend}+{driver}:{rest}"
+
+
+def get_async_engine(url: str, **pool_options: Any) -> AsyncEngine:
+    """Async counterpart of :func:`get_engine`; ``url`` needs an async driver."""
+    if _is_memory_sqlite(url):
+        pool_options = {"poolclass": StaticPool}
+    return create_async_engine(url, **pool_options)
+
+
+def init_engine(settings: Settings) -> Engine:
+    """Create the process-wide engine and session factory from ``settings``.
+
+    Calling it again replaces (and disposes) any previously created engine.
+    """
+    global _engine, _session_factory
+    dispose_engine()
+    _engine = get_engine(settings.DATABASE_URL, **_pool_options(settings))
+    _session_factory = sessionmaker(
+        bind=_engine, autoflush=False, autocommit=False, future=True
+    )
+    return _engine
+
+
+def get_session_factory(settings: Settings) -> sessionmaker[Session]:
+    """Return the process-wide session factory, creating it on first use."""
+    if _session_factory is None:
+        init_engine(settings)
+    assert _session_factory is not None
+    return _session_factory
+
+
+def dispose_engine() -> None:
+    """Close all pooled connections and forget the process-wide engine."""
+    global _engine, _session_factory
+    if _engine is not None:
+        _engine.dispose()
+    _engine = None
+    _session_factory = None
+
+
+def init_async_engine(settings: Settings) -> AsyncEngine:
+    """Create the process-wide async engine and session factory.
+
+    The URL is ``ASYNC_DATABASE_URL`` or, when unset, ``DATABASE_URL`` with
+    its driver swapped by :func:`async_database_url`.  Any previous async
+    engine is dropped without awaiting its disposal; use
+    :func:`dispose_async_engine` for an orderly shutdown.
+    """
+    global _async_engine, _async_session_factory
+    url = settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+    _async_engine = get_async_engine(url, **_pool_options(settings))
+    _async_session_factory = async_sessionmaker(
+        bind=_async_engine, autoflush=False, expire_on_commit=False
+    )
+    return _async_engine
+
+
+def get_async_session_factory(settings: Settings) -> async_sessionmaker[AsyncSession]:
+    """Return the process-wide async session factory, creating it on first use."""
+    if _async_session_factory is None:
+        init_async_engine(settings)
+    assert _async_session_factory is not None
+    return _async_session_factory
+
+
+async def dispose_async_engine() -> None:
+    """Close all pooled async connections and forget the async engine."""
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    _async_engine = None
+    _async_session_factory = None
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+from sqlalchemy import Table
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.sql.dml import Insert
+
+
+def upsert(
+    dialect_name: str,
+    table: Table,
+    index_elements: Sequence[str],
+    update_columns: Sequence[str],
+) -> Insert:
+    """Return an ``INSERT ... ON CONFLICT DO UPDATE`` for ``dialect_name``.
+
+    Rows conflicting on ``index_elements`` have ``update_columns`` overwritten
+    with the incoming values.  The statement is meant to be executed with a
+    list of parameter dictionaries so SQLAlchemy batches the rows.  Raises
+    ``ValueError`` for dialects other than PostgreSQL and SQLite.
+    """
+    stmt: postgresql.Insert | sqlite.Insert
+    if dialect_name == "postgresql":
+        stmt = postgresql.insert(table)
+    elif dialect_name == "sqlite":
+        stmt = sqlite.insert(table)
+    else:
+        raise ValueError(f"upsert is not supported for {dialect_name}")
+    return stmt.on_conflict_do_update(
+        index_elements=list(index_elements),
+        set_={name: stmt.excluded[name] for name in update_columns},
+    )
@@ -1,10 +1,18 @@
 from __future__ import annotations
 
+import heapq
 from dataclasses import dataclass
-from typing import List
+from typing import Iterable, List, Sequence
+
+import numpy as np
+import numpy.typing as npt
 
 from app.db.models import Instrument, InstrumentType
-from .types import FilterParams
+from .types import FilterParams, WeightingScheme
+
+FloatArray = npt.NDArray[np.float64]
+IntArray = npt.NDArray[np.int64]
+BoolArray = npt.NDArray[np.bool_]
 
 
 @dataclass(frozen=True)
@@ -16,6 +24,34 @@ class AllocationItem:
     amount_inr: int
 
 
+@dataclass(frozen=True)
+class TargetWeight:
+    """Budget-independent share of the portfolio for a single instrument."""
+
+    symbol: str
+    percent: int
+
+
+@dataclass(frozen=True)
+class ShareItem:
+    """Whole-share holding for a single instrument.
+
+    ``shares`` and ``cost_inr`` are ``None`` when the instrument has no price.
+    """
+
+    symbol: str
+    shares: int | None
+    cost_inr: float | None
+
+
+@dataclass(frozen=True)
+class SharePlan:
+    """Result of :func:`allocate_shares`."""
+
+    items: tuple[ShareItem, ...]
+    residual_cash_inr: float
+
+
 def allocate(
     candidates: List[Instrument], budget: float, filters: FilterParams
 ) -> List[AllocationItem]:
@@ -27,6 +63,477 @@ def allocate(
     corrected so that the total sums to exactly 100.
     """
 
+    return apply_budget(target_weights(candidates, filters), budget)
+
+
+def target_weights(
+    candidates: Sequence[Instrument],
+    filters: FilterParams,
+    volatility: Sequence[float | None] | None = None,
+    score: Sequence[float | None] | None = None,
+) -> List[TargetWeight]:
+    """Select instruments and their percentages, independent of the budget.
+
+    This is the part of :func:`allocate` that depends only on ``candidates``
+    and ``filters``; :func:`apply_budget` turns it into rupee amounts.
+
+    At most ``filters.max_instruments`` are selected: the first ETF when
+    ``filters.include_etfs`` is set, then one instrument per sector and then
+    the rest, ordered by type, sector and symbol.  Their weights follow
+    ``filters.weighting`` (see :func:`scheme_weights`; ``volatility`` and
+    ``score`` are aligned with ``candidates`` and needed only by their
+    schemes) and the caps in ``filters`` (see :func:`cap_weights`), and are
+    rounded to whole percents summing to exactly 100.
+    """
+
+    # Read each ORM attribute once; instrumented attribute access dominates
+    # the cost for large candidate sets.
+    rows = [(c.instrument_type.value, c.sector, c.symbol) for c in candidates]
+    limit = min(filters.max_instruments, len(candidates))
+    selected = _select(rows, limit, filters.include_etfs)
+    if not selected:
+        return []
+
+    def column(values: Sequence[float | None] | None) -> FloatArray | None:
+        return None if values is None else _float_array(values[i] for i in selected)
+
+    weights = scheme_weights(
+        filters.weighting,
+        len(selected),
+        market_cap=(
+            _float_array(candidates[i].market_cap for i in selected)
+            if filters.weighting is WeightingScheme.MARKET_CAP
+            else None
+        ),
+        volatility=column(volatility),
+        score=column(score),
+    )
+    if filters.max_weight is not None or filters.max_sector_weight is not None:
+        codes: dict[str | None, int] = {}
+        sectors = np.array(
+            [codes.setdefault(rows[i][1], len(codes)) for i in selected],
+            dtype=np.intp,
+        )
+        weights = cap_weights(
+            weights, filters.max_weight, sectors, filters.max_sector_weight
+        )
+    return [
+        TargetWeight(symbol=rows[i][2], percent=int(percent))
+        for i, percent in zip(selected, integer_percents(weights).tolist())
+    ]
+
+
+def _select(
+    rows: Sequence[tuple[str, str | None, str]], limit: int, etf_first: bool
+) -> List[int]:
+    """Return the indices of the instruments :func:`target_weights` keeps.
+
+    ``rows`` holds ``(instrument type, sector, symbol)`` per candidate.
+    """
+
+    if limit <= 0:
+        return []
+
+    selected: list[int] = []
+    if etf_first:
+        etf = next(
+            (i for i, row in enumerate(rows) if row[0] == InstrumentType.ETF.value),
+            None,
+        )
+        if etf is not None:
+            selected.append(etf)
+
+    remaining = sorted(
+        (i for i in range(len(rows)) if i not in selected),
+        key=lambda i: (rows[i][0], rows[i][1] or "", rows[i][2]),
+    )
+
+    chosen = set(selected)
+    seen_sectors = {rows[i][1] for i in selected}
+    for i in remaining:
+        if len(selected) >= limit:
+            break
+        sector = rows[i][1]
+        if sector not in seen_sectors:
+            selected.append(i)
+            chosen.add(i)
+            seen_sectors.add(sector)
+
+    for i in remaining:
+        if len(selected) >= limit:
+            break
+        if i not in chosen:
+            selected.append(i)
+            chosen.add(i)
+
+    return selected
+
+
+def _float_array(values: Iterable[float | None]) -> FloatArray:
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+
+def _fill_missing(values: FloatArray, valid: BoolArray) -> FloatArray:
+    """Replace invalid entries by the mean of the valid ones (all ones if none)."""
+    if not valid.any():
+        return np.ones_like(values)
+    return np.where(valid, values, values[valid].mean())
+
+
+def scheme_weights(
+    scheme: WeightingScheme,
+    n: int,
+    market_cap: FloatArray | None = None,
+    volatility: FloatArray | None = None,
+    score: FloatArray | None = None,
+) -> FloatArray:
+    """Return ``n`` non-negative weights summing to 1 under ``scheme``.
+
+    Market-cap weights are proportional to ``market_cap``, inverse-volatility
+    weights to ``1 / volatility`` and score weights to ``score`` clipped at
+    zero.  Missing (``NaN``) or unusable values (non-positive caps or
+    volatilities) are replaced by the mean of the usable ones, so such an
+    instrument is weighted like an average one.  A scheme whose weights are
+    all zero falls back to equal weights.  Raises :class:`ValueError` when
+    the input ``scheme`` needs is not given.
+    """
+
+    if scheme is WeightingScheme.EQUAL:
+        raw = np.ones(n)
+    elif scheme is WeightingScheme.MARKET_CAP:
+        values = _required(market_cap, "market_cap", n)
+        with np.errstate(invalid="ignore"):
+            raw = _fill_missing(values, np.isfinite(values) & (values > 0))
+    elif scheme is WeightingScheme.INVERSE_VOLATILITY:
+        values = _required(volatility, "volatility", n)
+        with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+            inverse = 1.0 / values
+            valid = np.isfinite(inverse) & (values > 0)
+            raw = _fill_missing(inverse, valid)
+    else:
+        values = _required(score, "score", n)
+        raw = _fill_missing(np.clip(values, 0.0, None), np.isfinite(values))
+
+    # Scaling by the largest weight first keeps the sum finite.
+    largest = float(raw.max()) if n else 0.0
+    if not largest > 0:
+        return np.full(n, 1.0 / n)
+    raw = raw / largest
+    return raw / float(raw.sum())
+
+
+def _required(values: FloatArray | None, name: str, n: int) -> FloatArray:
+    if values is None:
+        raise ValueError(f"{name} is required for this weighting scheme")
+    values = np.asarray(values, dtype=np.float64)
+    if values.shape != (n,):
+        raise ValueError(f"{name} must have {n} entries, got {values.shape}")
+    return values
+
+
+def cap_weights(
+    weights: FloatArray,
+    max_weight: float | None = None,
+    sectors: IntArray | None = None,
+    max_sector_weight: float | None = None,
+) -> FloatArray:
+    """Limit ``weights`` (summing to 1) per instrument and per sector.
+
+    ``sectors`` holds a small integer code per instrument.  Weight cut from
+    instruments above ``max_weight`` or sectors above ``max_sector_weight``
+    is handed to the instruments still below both caps, in proportion to
+    their weights, until no cap is exceeded.  Caps tighter than an equal
+    split (``1 / n`` instruments, ``1 / k`` sectors) are raised to it.  When
+    the two caps cannot hold together the sector cap yields first.
+    """
+
+    w = np.array(weights, dtype=np.float64)
+    n = len(w)
+    if n == 0:
+        return w
+    eps = 1e-12
+    instrument_cap = None if max_weight is None else max(max_weight, 1.0 / n)
+    sector_cap = None
+    if max_sector_weight is not None and sectors is not None:
+        k = len(np.unique(sectors))
+        sector_cap = max(max_sector_weight, 1.0 / k)
+
+    # Every pass that moves weight freezes at least one more instrument or
+    # sector; dropping the sector cap can restart that once, so 2 * (n + 1)
+    # passes suffice.
+    frozen = np.zeros(n, dtype=bool)
+    for _ in range(2 * (n + 1)):
+        excess = 0.0
+        if instrument_cap is not None:
+            over = w > instrument_cap + eps
+            excess += float((w[over] - instrument_cap).sum())
+            w[over] = instrument_cap
+            frozen |= w >= instrument_cap - eps
+        if sector_cap is not None:
+            assert sectors is not None
+            totals = np.bincount(sectors, weights=w)
+            over_sector = totals > sector_cap + eps
+            if over_sector.any():
+                limit = sector_cap / np.maximum(totals, eps)
+                scale = np.where(over_sector, limit, 1.0)
+                scaled = w * scale[sectors]
+                excess += float((w - scaled).sum())
+                w = scaled
+            full = np.bincount(sectors, weights=w) >= sector_cap - eps
+            frozen |= full[sectors]
+        if excess <= eps:
+            break
+        receivers = ~frozen
+        if not receivers.any():
+            # The caps cannot all hold: drop the sector cap and keep filling
+            # instruments below their own cap.
+            sector_cap = None
+            frozen = np.zeros(n, dtype=bool)
+            if instrument_cap is not None:
+                frozen = w >= instrument_cap - eps
+            receivers = ~frozen
+            if not receivers.any():
+                receivers[:] = True
+        share = w[receivers]
+        total = share.sum()
+        w[receivers] += (
+            excess * share / total if total > 0 else excess / receivers.sum()
+        )
+    return w / float(w.sum())
+
+
+def integer_percents(weights: FloatArray) -> IntArray:
+    """Round ``weights`` (summing to 1) to whole percents summing to 100.
+
+    Uses largest remainders: every instrument gets the floor of its share and
+    the leftover points go to the largest fractional parts, earlier entries
+    first on ties.  Equal weights therefore give the first ``100 % n``
+    instruments one extra point.
+    """
+
+    shares = np.asarray(weights, dtype=np.float64) * 100
+    # The small offset keeps shares like 10.000000000000002 or 9.99999999
+    # from losing a point to floating point error.
+    floors = np.floor(shares + 1e-9)
+    residual = 100 - int(floors.sum())
+    percents = floors.astype(np.int64)
+    if residual > 0:
+        remainders = np.round(shares - floors, 9)
+        order = np.argsort(-remainders, kind="stable")
+        percents[order[:residual]] += 1
+    return percents
+
+
+def apply_budget(targets: Sequence[TargetWeight], budget: float) -> List[AllocationItem]:
+    """Split ``budget`` into whole-rupee amounts following ``targets``.
+
+    Rounding differences are added to the first item so amounts sum to the
+    rounded budget.
+    """
+
+    if not targets:
+        return []
+
+    amounts = [int(round(budget * t.percent / 100)) for t in targets]
+    diff = int(round(budget)) - sum(amounts)
+    if diff != 0:
+        amounts[0] += diff
+
+    return [
+        AllocationItem(symbol=t.symbol, percent=t.percent, amount_inr=amt)
+        for t, amt in zip(targets, amounts)
+    ]
+
+
+def allocate_shares(
+    targets: Sequence[TargetWeight],
+    prices: Sequence[float | None],
+    budget: float,
+    lot_sizes: Sequence[int] | None = None,
+) -> SharePlan:
+    """Convert ``targets`` into whole lots bought with ``budget``.
+
+    ``prices`` (per share) and ``lot_sizes`` (shares per lot, 1 by default)
+    are aligned with ``targets``.  Each instrument first gets as many lots as
+    fit in its target amount.  The remaining cash then goes, lot by lot, to
+    the affordable instrument furthest below its target amount until no lot
+    fits, so the residual cash is smaller than every tradable lot.
+
+    Single lots are bought from a heap, which is cheap while few lots are
+    left.  The leftover can be large, though, for instance when an
+    instrument without a price holds part of the target.  After a few heap
+    steps per instrument this instead finds by bisection the lowest
+    shortfall every affordable instrument can be brought down to and buys
+    all those lots at once, so the cost does not grow with the budget.  The
+    result matches :func:`allocate_shares_reference` up to floating point
+    ties.
+
+    Instruments with a missing or non-positive price get no shares; their
+    target amount is left over and spent on the others like any remainder.
+    """
+
+    target, unit, lots, tradable = _share_inputs(targets, prices, budget, lot_sizes)
+    count = _fitting_lots(target, unit, tradable)
+    cash = float(budget - (count * unit).sum())
+    shortfall = target - count * unit
+    active = tradable
+    while True:
+        cash = _buy_lots_by_heap(
+            count, shortfall, unit, active, cash, _HEAP_LOTS * len(targets)
+        )
+        active = active & (unit <= cash + _CASH_TOLERANCE)
+        idx = np.flatnonzero(active)
+        if not idx.size:
+            break
+        extra = _lots_to_level(shortfall[idx], unit[idx], cash)
+        spent = extra * unit[idx]
+        count[idx] += extra
+        shortfall[idx] -= spent
+        cash -= float(spent.sum())
+    return _share_plan(targets, count, lots, unit, tradable, budget)
+
+
+def allocate_shares_reference(
+    targets: Sequence[TargetWeight],
+    prices: Sequence[float | None],
+    budget: float,
+    lot_sizes: Sequence[int] | None = None,
+) -> SharePlan:
+    """Reference implementation of :func:`allocate_shares`.
+
+    Buys every lot after the first pass with one heap step, so its cost
+    grows with the leftover cash divided by the cheapest lot.
+    """
+
+    target, unit, lots, tradable = _share_inputs(targets, prices, budget, lot_sizes)
+    count = _fitting_lots(target, unit, tradable)
+    cash = float(budget - (count * unit).sum())
+    _buy_lots_by_heap(count, target - count * unit, unit, tradable, cash)
+    return _share_plan(targets, count, lots, unit, tradable, budget)
+
+
+# Prices are in paise; the tolerance keeps exact fits from being rejected
+# because of floating point error.
+_CASH_TOLERANCE = 1e-6
+
+
+def _share_inputs(
+    targets: Sequence[TargetWeight],
+    prices: Sequence[float | None],
+    budget: float,
+    lot_sizes: Sequence[int] | None,
+) -> tuple[FloatArray, FloatArray, IntArray, BoolArray]:
+    n = len(targets)
+    price = _float_array(prices)
+    lots = np.asarray([1] * n if lot_sizes is None else lot_sizes, dtype=np.int64)
+    if price.shape != (n,) or lots.shape != (n,):
+        raise ValueError("prices and lot_sizes must align with targets")
+    if (lots < 1).any():
+        raise ValueError("lot sizes must be positive")
+    tradable = np.isfinite(price) & (price > 0)
+    unit = np.where(tradable, price * lots, 0.0)
+    target = budget * np.array([t.percent for t in targets], dtype=np.float64) / 100
+    return target, unit, lots, tradable
+
+
+# Heap steps per instrument before :func:`allocate_shares` switches to
+# buying lots in bulk.
+_HEAP_LOTS = 4
+
+
+def _buy_lots_by_heap(
+    count: IntArray,
+    shortfall: FloatArray,
+    unit: FloatArray,
+    active: BoolArray,
+    cash: float,
+    max_lots: int | None = None,
+) -> float:
+    """Spend ``cash`` one lot at a time on the largest shortfall.
+
+    ``count`` and ``shortfall`` are updated in place.  Stops when no active
+    lot is affordable or after ``max_lots`` lots; returns the cash left.
+    """
+
+    heap = [(-shortfall[i], i) for i in np.flatnonzero(active).tolist()]
+    heapq.heapify(heap)
+    bought = 0
+    while heap and bought != max_lots:
+        _, i = heap[0]
+        if unit[i] > cash + _CASH_TOLERANCE:
+            # Cash only decreases, so this instrument is out for good.
+            heapq.heappop(heap)
+            continue
+        count[i] += 1
+        shortfall[i] -= unit[i]
+        cash -= unit[i]
+        bought += 1
+        heapq.heapreplace(heap, (-shortfall[i], i))
+    return cash
+
+
+def _fitting_lots(
+    target: FloatArray, unit: FloatArray, tradable: BoolArray
+) -> IntArray:
+    fit = np.divide(target, unit, out=np.zeros(len(target)), where=tradable)
+    return np.floor(fit + 1e-9).astype(np.int64)
+
+
+def _lots_to_level(shortfall: FloatArray, unit: FloatArray, cash: float) -> IntArray:
+    """Return the lots bringing every shortfall down to the lowest level
+    ``cash`` pays for."""
+
+    def extra(level: float) -> FloatArray:
+        return np.maximum(np.ceil((shortfall - level) / unit), 0.0)
+
+    # Nothing is bought at ``hi``; at ``lo`` the largest shortfall alone
+    # needs more than ``cash``.  Once the levels are a single lot apart the
+    # caller buys that lot, if affordable, as a tie-break step.
+    hi = float(shortfall.max())
+    lo = hi - cash - float(unit.max())
+    hi_lots, lo_lots = extra(hi), extra(lo)
+    while lo_lots.sum() - hi_lots.sum() > 1:
+        mid = (lo + hi) / 2
+        if mid in (lo, hi):
+            break
+        lots = extra(mid)
+        if float((lots * unit).sum()) <= cash + _CASH_TOLERANCE:
+            hi, hi_lots = mid, lots
+        else:
+            lo, lo_lots = mid, lots
+    return hi_lots.astype(np.int64)
+
+
+def _share_plan(
+    targets: Sequence[TargetWeight],
+    count: IntArray,
+    lots: IntArray,
+    unit: FloatArray,
+    tradable: BoolArray,
+    budget: float,
+) -> SharePlan:
+    shares = count * lots
+    costs = np.round(count * unit, 2)
+    items = tuple(
+        ShareItem(
+            symbol=t.symbol,
+            shares=int(shares[i]) if tradable[i] else None,
+            cost_inr=float(costs[i]) if tradable[i] else None,
+        )
+        for i, t in enumerate(targets)
+    )
+    residual = round(max(float(budget - costs.sum()), 0.0), 2)
+    return SharePlan(items=items, residual_cash_inr=residual)
+
+
+def target_weights_reference(
+    candidates: List[Instrument], filters: FilterParams
+) -> List[TargetWeight]:
+    """Reference implementation of equal-weight :func:`target_weights`.
+
+    Its list-membership checks make it quadratic in the number selected.
+    """
+
     if not candidates or filters.max_instruments <= 0:
         return []
 
@@ -66,12 +573,7 @@ def allocate(
     for i in range(residual):
         percents[i] += 1
 
-    amounts = [int(round(budget * p / 100)) for p in percents]
-    diff = int(round(budget)) - sum(amounts)
-    if diff != 0:
-        amounts[0] += diff
-
     return [
-        AllocationItem(symbol=inst.symbol, percent=percent, amount_inr=amt)
-        for inst, percent, amt in zip(selected, percents, amounts)
+        TargetWeight(symbol=inst.symbol, percent=percent)
+        for inst, percent in zip(selected, percents)
     ]
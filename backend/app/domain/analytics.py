@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from typing import Dict
+
+import numpy as np
+import numpy.typing as npt
+
+FloatArray = npt.NDArray[np.float64]
+
+TRADING_DAYS = 252
+VOLATILITY_WINDOW = 63
+DRAWDOWN_WINDOW = 252
+MOMENTUM_WINDOW = 126
+SMA_WINDOWS = (50, 200)
+
+ANALYTICS_COLUMNS = (
+    "volatility",
+    "drawdown",
+    *(f"sma_{w}" for w in SMA_WINDOWS),
+    "momentum",
+)
+
+# Rows of history needed to compute every statistic for one day.
+LOOKBACK = max(
+    VOLATILITY_WINDOW + 1, DRAWDOWN_WINDOW, MOMENTUM_WINDOW + 1, *SMA_WINDOWS
+)
+
+
+def rolling_analytics(prices: npt.ArrayLike) -> Dict[str, FloatArray]:
+    """Return trailing statistics for each day of a daily price series.
+
+    ``prices`` are in date order, one per trading day.  For each day:
+
+    * ``volatility``: annualized standard deviation of the last
+      ``VOLATILITY_WINDOW`` daily log returns;
+    * ``drawdown``: price relative to the highest price of the last
+      ``DRAWDOWN_WINDOW`` days, minus one (zero at a high, negative below);
+    * ``sma_50`` and ``sma_200``: simple moving averages of the price;
+    * ``momentum``: return over the last ``MOMENTUM_WINDOW`` days.
+
+    Days without a full window are ``NaN``.  A value depends only on the
+    last :data:`LOOKBACK` prices, so appending days only requires that much
+    history.
+    """
+
+    p = np.asarray(prices, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.diff(np.log(p))
+        volatility = np.concatenate(
+            ([np.nan], rolling_std(returns, VOLATILITY_WINDOW))
+        ) * np.sqrt(TRADING_DAYS)
+        drawdown = p / rolling_max(p, DRAWDOWN_WINDOW) - 1
+        momentum = np.full(len(p), np.nan)
+        momentum[MOMENTUM_WINDOW:] = p[MOMENTUM_WINDOW:] / p[:-MOMENTUM_WINDOW] - 1
+    result = {"volatility": volatility, "drawdown": drawdown}
+    for window in SMA_WINDOWS:
+        result[f"sma_{window}"] = rolling_mean(p, window)
+    result["momentum"] = momentum
+    return result
+
+
+def _window_sums(values: FloatArray, window: int) -> FloatArray:
+    sums = np.concatenate(([0.0], np.cumsum(values)))
+    return sums[window:] - sums[:-window]
+
+
+def rolling_mean(values: FloatArray, window: int) -> FloatArray:
+    """Mean of each trailing ``window``; ``NaN`` until the window is full."""
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        out[window - 1 :] = _window_sums(values, window) / window
+    return out
+
+
+def rolling_std(values: FloatArray, window: int) -> FloatArray:
+    """Sample standard deviation of each trailing ``window``."""
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        # Centering first keeps the sum-of-squares formula accurate.
+        centered = values - np.nanmean(values)
+        mean = _window_sums(centered, window) / window
+        squares = _window_sums(centered**2, window)
+        variance = (squares - window * mean**2) / (window - 1)
+        out[window - 1 :] = np.sqrt(np.maximum(variance, 0.0))
+    return out
+
+
+def rolling_max(values: FloatArray, window: int) -> FloatArray:
+    """Maximum of each trailing ``window`` in linear time.
+
+    Uses the van Herk/Gil-Werman method: with the series cut into blocks of
+    ``window`` values, every window is covered by the tail of one block and
+    the head of the next, whose running maxima are computed once.
+    """
+    n = len(values)
+    out = np.full(n, np.nan)
+    if n < window:
+        return out
+    padded = np.concatenate((values, np.full(-n % window, -np.inf)))
+    blocks = padded.reshape(-1, window)
+    head = np.maximum.accumulate(blocks, axis=1).ravel()
+    tail = np.maximum.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+    starts = np.arange(n - window + 1)
+    out[window - 1 :] = np.maximum(tail[starts], head[starts + window - 1])
+    return out
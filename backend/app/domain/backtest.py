@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from typing import List, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from app.db.models import Instrument
+from .allocation import target_weights
+from .mapping import Goal, RiskProfile, map_intent_to_filters
+from .universe import SNAPSHOT_COLUMNS, UniverseSnapshot
+
+FloatArray = npt.NDArray[np.float64]
+
+# Every risk profile with every goal.
+PROFILES = tuple((risk, goal) for risk in RiskProfile for goal in Goal)
+_PRICE = SNAPSHOT_COLUMNS.index("price")
+
+
+@dataclass(frozen=True)
+class PeriodResult:
+    """One profile's portfolio held from ``start`` to ``end``."""
+
+    risk_profile: RiskProfile
+    goal: Goal
+    start: date
+    end: date
+    weights: tuple[tuple[str, int], ...]
+    period_return: float
+
+
+@dataclass(frozen=True)
+class ProfileSummary:
+    """Performance of one profile over all rebalance periods."""
+
+    risk_profile: RiskProfile
+    goal: Goal
+    periods: int
+    total_return: float
+    annualized_return: float
+    annualized_volatility: float
+    max_drawdown: float
+    mean_holdings: float
+
+
+@dataclass(frozen=True)
+class BacktestResult:
+    """Period results in date then profile order, with the run's wall time."""
+
+    periods: tuple[PeriodResult, ...]
+    years: float
+    seconds: float
+
+    @property
+    def seconds_per_year(self) -> float:
+        return self.seconds / self.years if self.years else 0.0
+
+    def summaries(self) -> List[ProfileSummary]:
+        """Summarize every profile in :data:`PROFILES` order."""
+        return [
+            summarize(self.periods, risk, goal, self.years) for risk, goal in PROFILES
+        ]
+
+
+def rebalance_dates(first: date, last: date, months: int = 1) -> List[date]:
+    """Month ends from ``first`` to ``last`` (inclusive), every ``months``."""
+    if months < 1:
+        raise ValueError("months must be at least 1")
+    start = np.datetime64(first, "M")
+    ends = np.arange(start, np.datetime64(last, "M") + 1, months) + 1
+    days = ends.astype("datetime64[D]") - 1
+    days = days[(days >= np.datetime64(first)) & (days <= np.datetime64(last))]
+    return [d.item() for d in days]
+
+
+def historical_snapshot(
+    instruments: Sequence[Instrument], shares: FloatArray, values: FloatArray
+) -> UniverseSnapshot:
+    """Build the universe as it stood when ``values`` were current.
+
+    ``values`` holds the point-in-time metric columns (see
+    :meth:`UniverseSnapshot.from_columns`) aligned with ``instruments``.
+    Only instruments with a price by then are included, so ETFs and stocks
+    that had not listed yet cannot be selected.  Market caps are ``shares``
+    times the price at the time.
+
+    Limitations: no history of shares outstanding, sectors or instrument
+    types is stored, so these are today's values, and instruments delisted
+    since are no longer in the database, so the universe has survivorship
+    bias.
+    """
+    listed = np.isfinite(values[_PRICE])
+    return UniverseSnapshot.from_columns(
+        [inst for inst, keep in zip(instruments, listed) if keep],
+        values[:, listed],
+        market_cap=(shares * values[_PRICE])[listed],
+    )
+
+
+def evaluate_period(
+    instruments: Sequence[Instrument],
+    shares: FloatArray,
+    values: FloatArray,
+    next_prices: FloatArray,
+    start: date,
+    end: date,
+    horizon_years: int = 5,
+) -> List[PeriodResult]:
+    """Run every profile on the universe as of ``start`` and hold to ``end``.
+
+    The universe is :func:`historical_snapshot` of ``values``;
+    ``next_prices`` holds the prices as of ``end``, aligned with
+    ``instruments``.  The period return is the weighted price return of the
+    holdings; a holding without a price at ``end`` contributes nothing, as
+    if its share were held in cash.
+    """
+    snapshot = historical_snapshot(instruments, shares, values)
+    position = {inst.symbol: k for k, inst in enumerate(instruments)}
+    with np.errstate(invalid="ignore", divide="ignore"):
+        growth = next_prices / values[_PRICE] - 1
+    growth = np.where(np.isfinite(growth), growth, 0.0)
+
+    results = []
+    for risk, goal in PROFILES:
+        filters = map_intent_to_filters(risk, goal, horizon_years)
+        targets = target_weights(snapshot.filter(filters), filters)
+        period_return = sum(
+            t.percent / 100 * growth[position[t.symbol]] for t in targets
+        )
+        results.append(
+            PeriodResult(
+                risk_profile=risk,
+                goal=goal,
+                start=start,
+                end=end,
+                weights=tuple((t.symbol, t.percent) for t in targets),
+                period_return=float(period_return),
+            )
+        )
+    return results
+
+
+def summarize(
+    periods: Sequence[PeriodResult], risk: RiskProfile, goal: Goal, years: float
+) -> ProfileSummary:
+    """Compound the returns of one profile's periods."""
+    own = [p for p in periods if p.risk_profile is risk and p.goal is goal]
+    returns = np.array([p.period_return for p in own], dtype=np.float64)
+    wealth = np.cumprod(1 + returns)
+    total = float(wealth[-1] - 1) if len(wealth) else 0.0
+    per_year = len(returns) / years if years else 0.0
+    drawdown = wealth / np.maximum.accumulate(np.r_[1.0, wealth])[1:] - 1
+    return ProfileSummary(
+        risk_profile=risk,
+        goal=goal,
+        periods=len(own),
+        total_return=total,
+        annualized_return=(
+            float((1 + total) ** (1 / years) - 1) if years and total > -1 else total
+        ),
+        annualized_volatility=(
+            float(returns.std(ddof=1) * np.sqrt(per_year)) if len(returns) > 1 else 0.0
+        ),
+        max_drawdown=float(-drawdown.min()) if len(drawdown) else 0.0,
+        mean_holdings=float(np.mean([len(p.weights) for p in own])) if own else 0.0,
+    )
+
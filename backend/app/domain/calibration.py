@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import statistics
+from collections import Counter
+from dataclasses import dataclass, replace
+from typing import Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from .types import FilterParams
+from .universe import UniverseSnapshot
+
+FloatArray = npt.NDArray[np.float64]
+IntArray = npt.NDArray[np.intp]
+
+# The hand-picked thresholds of ``map_intent_to_filters`` a grid sweeps, in
+# the column order of grid points.
+SWEPT_FIELDS = ("min_market_cap", "max_de_ratio", "min_roe", "min_div_yield")
+
+
+@dataclass(frozen=True)
+class ParameterGrid:
+    """Values to try for each swept threshold; the points are every combination."""
+
+    min_market_cap: tuple[float, ...]
+    max_de_ratio: tuple[float, ...]
+    min_roe: tuple[float, ...]
+    min_div_yield: tuple[float, ...]
+
+    def __len__(self) -> int:
+        return int(np.prod([len(getattr(self, f)) for f in SWEPT_FIELDS]))
+
+    def points(self) -> FloatArray:
+        """Return one row per combination, columns in :data:`SWEPT_FIELDS` order."""
+        axes = np.meshgrid(*(getattr(self, f) for f in SWEPT_FIELDS), indexing="ij")
+        return np.stack([axis.ravel() for axis in axes], axis=1).astype(np.float64)
+
+
+# 10 values per threshold spanning the ranges the profiles use, 10,000 points.
+DEFAULT_GRID = ParameterGrid(
+    min_market_cap=tuple(np.geomspace(1e9, 1e12, 10).tolist()),
+    max_de_ratio=tuple(np.linspace(0.25, 2.5, 10).tolist()),
+    min_roe=tuple(np.linspace(0.0, 0.225, 10).tolist()),
+    min_div_yield=tuple(np.linspace(0.0, 0.045, 10).tolist()),
+)
+
+
+def filters_at(base: FilterParams, point: Sequence[float]) -> FilterParams:
+    """Return ``base`` with the swept thresholds taken from ``point``."""
+    cap, de, roe, dy = (float(v) for v in point)
+    return replace(
+        base, min_market_cap=cap, max_de_ratio=de, min_roe=roe, min_div_yield=dy
+    )
+
+
+@dataclass(frozen=True)
+class CalibrationArrays:
+    """The columns the swept thresholds compare, for stocks that can pass.
+
+    Stocks failing the thresholds ``base`` keeps fixed (growth and price
+    history) or missing a swept metric are dropped up front.  ``values``
+    has one row per :data:`SWEPT_FIELDS` entry and ``sectors`` a code per
+    stock; columns are sorted by dividend yield so that a median is a
+    running count away.
+    """
+
+    values: FloatArray
+    sectors: IntArray
+
+    @classmethod
+    def from_snapshot(
+        cls, snapshot: UniverseSnapshot, base: FilterParams
+    ) -> "CalibrationArrays":
+        open_thresholds = filters_at(
+            replace(base, include_etfs=False), (-np.inf, np.inf, -np.inf, -np.inf)
+        )
+        rows = np.flatnonzero(snapshot.mask(open_thresholds))
+        values = np.vstack(
+            (
+                snapshot.market_cap[rows],
+                snapshot.debt_to_equity[rows],
+                snapshot.roe[rows],
+                snapshot.dividend_yield[rows],
+            )
+        )
+        order = np.argsort(values[3], kind="stable")
+        codes: dict[str | None, int] = {}
+        names = (snapshot.instruments[i].sector for i in rows)
+        sectors = np.array(
+            [codes.setdefault(name, len(codes)) for name in names], dtype=np.intp
+        )
+        return cls(values=values[:, order], sectors=sectors[order])
+
+    def __len__(self) -> int:
+        return int(self.values.shape[1])
+
+
+@dataclass(frozen=True)
+class GridStats:
+    """What each grid point would screen, one entry per point.
+
+    ``candidates`` counts the stocks passing the point's thresholds (before
+    the screen's ``max_instruments`` cap), ``sectors`` how many sectors
+    they span and ``concentration`` the Herfindahl index of their sector
+    counts (``1 / sectors`` when spread evenly, 1 for a single sector).
+    Concentration and the yield statistics are ``NaN`` without candidates.
+    """
+
+    points: FloatArray
+    candidates: IntArray
+    sectors: IntArray
+    concentration: FloatArray
+    mean_yield: FloatArray
+    median_yield: FloatArray
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    @classmethod
+    def concat(cls, parts: Sequence["GridStats"]) -> "GridStats":
+        return cls(
+            points=np.concatenate([p.points for p in parts]),
+            candidates=np.concatenate([p.candidates for p in parts]),
+            sectors=np.concatenate([p.sectors for p in parts]),
+            concentration=np.concatenate([p.concentration for p in parts]),
+            mean_yield=np.concatenate([p.mean_yield for p in parts]),
+            median_yield=np.concatenate([p.median_yield for p in parts]),
+        )
+
+    def best(self, min_candidates: int, k: int = 20) -> IntArray:
+        """Indices of the ``k`` most diversified points with enough candidates.
+
+        Points are ranked by sectors spanned, then lower concentration, then
+        higher mean yield.
+        """
+        eligible = np.flatnonzero(self.candidates >= min_candidates)
+        order = np.lexsort(
+            (
+                -self.mean_yield[eligible],
+                self.concentration[eligible],
+                -self.sectors[eligible],
+            )
+        )
+        return eligible[order[:k]]
+
+
+def evaluate_grid(
+    arrays: CalibrationArrays, points: FloatArray, chunk_size: int = 256
+) -> GridStats:
+    """Screen ``arrays`` at every grid point, ``chunk_size`` points at a time.
+
+    Each chunk is one broadcast comparison of the points against every
+    stock; sector counts are a product with the one-hot sector matrix and
+    medians the positions where a running count of passing stocks crosses
+    the middle.
+    """
+    cap, de, roe, dy = arrays.values
+    onehot = np.zeros((len(arrays), int(arrays.sectors.max(initial=-1)) + 1))
+    onehot[np.arange(len(arrays)), arrays.sectors] = 1.0
+    parts = []
+    for lo in range(0, max(len(points), 1), chunk_size):
+        p = points[lo : lo + chunk_size, :, None]
+        mask = (cap >= p[:, 0]) & (de <= p[:, 1]) & (roe >= p[:, 2]) & (dy >= p[:, 3])
+        count = mask.sum(axis=1)
+        per_sector = mask @ onehot
+        running = np.cumsum(mask, axis=1)
+        lower = np.argmax(running > ((count - 1) // 2)[:, None], axis=1)
+        upper = np.argmax(running > (count // 2)[:, None], axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            concentration = ((per_sector / count[:, None]) ** 2).sum(axis=1)
+            mean_yield = (mask @ dy) / count
+        median_yield = np.where(
+            count > 0, (dy[lower] + dy[upper]) / 2 if len(dy) else 0.0, np.nan
+        )
+        parts.append(
+            GridStats(
+                points=points[lo : lo + chunk_size],
+                candidates=count.astype(np.intp),
+                sectors=(per_sector > 0).sum(axis=1).astype(np.intp),
+                concentration=np.where(count > 0, concentration, np.nan),
+                mean_yield=mean_yield,
+                median_yield=median_yield,
+            )
+        )
+    return GridStats.concat(parts)
+
+
+def evaluate_grid_reference(
+    snapshot: UniverseSnapshot, base: FilterParams, points: FloatArray
+) -> GridStats:
+    """:func:`evaluate_grid` screening the snapshot once per point."""
+    candidates, sectors, concentration, means, medians = [], [], [], [], []
+    for point in points:
+        filters = replace(filters_at(base, point), include_etfs=False)
+        rows = np.flatnonzero(snapshot.mask(filters))
+        counts = Counter(snapshot.instruments[i].sector for i in rows)
+        yields = snapshot.dividend_yield[rows].tolist()
+        candidates.append(len(rows))
+        sectors.append(len(counts))
+        if yields:
+            concentration.append(sum((c / len(rows)) ** 2 for c in counts.values()))
+            means.append(statistics.fmean(yields))
+            medians.append(statistics.median(yields))
+        else:
+            concentration.append(np.nan)
+            means.append(np.nan)
+            medians.append(np.nan)
+    return GridStats(
+        points=points,
+        candidates=np.array(candidates, dtype=np.intp),
+        sectors=np.array(sectors, dtype=np.intp),
+        concentration=np.array(concentration, dtype=np.float64),
+        mean_yield=np.array(means, dtype=np.float64),
+        median_yield=np.array(medians, dtype=np.float64),
+    )
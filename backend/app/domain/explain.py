@@ -1,9 +1,8 @@
 from __future__ import annotations
 
-from typing import Iterable, List
+from typing import List, Sized
 
 from app.db.models import Instrument, Metric
-from .allocation import AllocationItem
 from .mapping import Goal, RiskProfile
 
 
@@ -43,12 +42,12 @@ def explain_instrument(
 
 
 def explain_portfolio(
-    allocations: Iterable[AllocationItem],
+    allocations: Sized,
     risk_profile: RiskProfile,
     goal: Goal,
     horizon_years: int,
 ) -> str:
-    count = len(list(allocations))
+    count = len(allocations)
     risk_guidance = {
         RiskProfile.SAFE: "focuses on capital preservation",
         RiskProfile.BALANCED: "balances stability and growth",
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Mapping
+
+import numpy as np
+import numpy.typing as npt
+
+from .types import FactorWeights, ScoreMethod
+
+FloatArray = npt.NDArray[np.float64]
+IntArray = npt.NDArray[np.intp]
+BoolArray = npt.NDArray[np.bool_]
+
+FACTORS = ("roe", "debt_to_equity", "dividend_yield", "growth", "pe")
+# Factors where a lower value is better are negated before scoring.
+_LOWER_IS_BETTER = frozenset({"debt_to_equity", "pe"})
+
+
+def percentile_ranks(values: FloatArray, groups: IntArray | None = None) -> FloatArray:
+    """Rank ``values`` within each group on a 0 (lowest) to 1 (highest) scale.
+
+    Tied values share their average rank and a group with a single value
+    scores 0.5.  ``NaN`` values are left out and stay ``NaN``.  One sort
+    serves every group.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(len(values), np.nan)
+    present = np.flatnonzero(~np.isnan(values))
+    if not len(present):
+        return out
+    v = values[present]
+    g = np.zeros(len(v), dtype=np.intp) if groups is None else groups[present]
+    order = np.lexsort((v, g))
+    v, g = v[order], g[order]
+
+    group_starts = np.r_[True, g[1:] != g[:-1]]
+    first = np.flatnonzero(group_starts)
+    group = np.cumsum(group_starts) - 1
+    size = np.diff(np.r_[first, len(v)])[group]
+
+    run_starts = group_starts | np.r_[True, v[1:] != v[:-1]]
+    run_first = np.flatnonzero(run_starts)
+    run_last = np.r_[run_first[1:], len(v)] - 1
+    rank = ((run_first + run_last) / 2)[np.cumsum(run_starts) - 1] - first[group]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        scores = np.where(size > 1, rank / (size - 1), 0.5)
+    out[present[order]] = scores
+    return out
+
+
+def zscores(values: FloatArray, groups: IntArray | None = None) -> FloatArray:
+    """Standardize ``values`` to mean 0 and unit variance within each group.
+
+    Groups without spread score 0.  ``NaN`` values are left out of the
+    group statistics and stay ``NaN``.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    present = ~np.isnan(values)
+    g = np.zeros(len(values), dtype=np.intp) if groups is None else groups
+    filled = np.where(present, values, 0.0)
+    count = np.bincount(g, weights=present, minlength=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.bincount(g, weights=filled, minlength=1) / count
+        centered = np.where(present, values - mean[g], 0.0)
+        std = np.sqrt(np.bincount(g, weights=centered**2, minlength=1) / count)
+        z = np.where(std[g] > 0, centered / std[g], 0.0)
+    return np.where(present, z, np.nan)
+
+
+def factor_values(columns: Mapping[str, FloatArray]) -> FloatArray:
+    """Return the raw factors (rows in :data:`FACTORS` order) from metrics.
+
+    ``columns`` holds ``roe``, ``debt_to_equity``, ``dividend_yield``,
+    ``revenue_growth``, ``earnings_growth`` and ``pe``.  Growth averages the
+    two growth rates that are present; a non-positive P/E has no meaning as
+    a valuation and is treated as missing.
+    """
+    growth = np.vstack((columns["revenue_growth"], columns["earnings_growth"]))
+    with np.errstate(invalid="ignore"):
+        present = ~np.isnan(growth)
+        total = np.where(present, growth, 0.0).sum(axis=0)
+        count = present.sum(axis=0)
+        mean_growth = np.where(count > 0, total / np.maximum(count, 1), np.nan)
+        pe = np.where(columns["pe"] > 0, columns["pe"], np.nan)
+    return np.vstack(
+        (
+            columns["roe"],
+            columns["debt_to_equity"],
+            columns["dividend_yield"],
+            mean_growth,
+            pe,
+        )
+    )
+
+
+@dataclass(frozen=True)
+class FactorScores:
+    """Cross-sectional scores of every factor, precomputed once per universe.
+
+    Each array has one row per factor (in :data:`FACTORS` order) and one
+    column per instrument; instruments outside the scored set and missing
+    values are ``NaN``.  Scores are oriented so that higher is better.
+    """
+
+    percentile: FloatArray
+    zscore: FloatArray
+    sector_percentile: FloatArray
+    sector_zscore: FloatArray
+
+    def composite(self, weights: FactorWeights) -> FloatArray:
+        """Weighted mean of the scores each instrument has under ``weights``.
+
+        Instruments with none of the weighted scores get ``NaN``.
+        """
+        if weights.method is ScoreMethod.PERCENTILE:
+            scores = (
+                self.sector_percentile if weights.sector_relative else self.percentile
+            )
+        else:
+            scores = self.sector_zscore if weights.sector_relative else self.zscore
+        w = np.array([getattr(weights, f) for f in FACTORS], dtype=np.float64)
+        present = ~np.isnan(scores)
+        total = w @ np.where(present, scores, 0.0)
+        weight = w @ present
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(weight > 0, total / weight, np.nan)
+
+
+def factor_scores(
+    values: FloatArray, sectors: IntArray, scored: BoolArray
+) -> FactorScores:
+    """Score the ``scored`` instruments on each row of ``values``.
+
+    ``values`` comes from :func:`factor_values` and ``sectors`` holds a
+    sector code per instrument.
+    """
+    signs = np.array([-1.0 if f in _LOWER_IS_BETTER else 1.0 for f in FACTORS])
+    oriented = np.where(scored, values * signs[:, None], np.nan)
+
+    def each(
+        score: Callable[[FloatArray, IntArray | None], FloatArray],
+        groups: IntArray | None,
+    ) -> FloatArray:
+        result = np.vstack([score(row, groups) for row in oriented])
+        result.flags.writeable = False
+        return result
+
+    return FactorScores(
+        percentile=each(percentile_ranks, None),
+        zscore=each(zscores, None),
+        sector_percentile=each(percentile_ranks, sectors),
+        sector_zscore=each(zscores, sectors),
+    )
+
+
+def top_k(scores: FloatArray, k: int) -> IntArray:
+    """Indices of the ``k`` highest ``scores``, best first.
+
+    Ties keep index order and ``NaN`` ranks below every number.  A
+    partition finds the ``k``-th best score in linear time, so only the
+    selected entries are sorted.
+    """
+    n = len(scores)
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    keys = np.where(np.isnan(scores), -np.inf, scores)
+    if k < n:
+        kth = np.partition(keys, n - k)[n - k]
+        above = np.flatnonzero(keys > kth)
+        ties = np.flatnonzero(keys == kth)[: k - len(above)]
+        chosen = np.concatenate((above, ties))
+    else:
+        chosen = np.arange(n)
+    return chosen[np.lexsort((chosen, -keys[chosen]))]
@@ -2,20 +2,139 @@ from __future__ import annotations
 
 from typing import List
 
+from sqlalchemy import Select, and_, case, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.models import Instrument, InstrumentType, Metric
+from app.db.models import Instrument, InstrumentType, LatestMetric, Metric
 from .types import FilterParams
+from .universe import Candidate, UniverseSnapshot
 
 
-def filter_candidates(session: Session, filters: FilterParams) -> List[Instrument]:
+def filter_candidates(
+    session: Session,
+    filters: FilterParams,
+    snapshot: UniverseSnapshot | None = None,
+) -> List[Instrument]:
     """Return instruments meeting the given filter criteria.
 
-    The function fetches the latest ``Metric`` for each instrument and applies
-    simple threshold based filtering.  ETFs are always included when
-    ``filters.include_etfs`` is ``True`` regardless of metric availability.
-    The returned list is capped to ``filters.max_instruments * 2`` to leave room
-    for later allocation steps.
+    The latest ``Metric`` for every instrument is resolved through the
+    ``latest_metrics`` pointer table and all thresholds are applied in a
+    single SQL statement.  ETFs are always included when
+    ``filters.include_etfs`` is ``True`` regardless of metric availability and
+    come first in insertion order, followed by stocks by market cap
+    descending.  The returned list is capped to ``filters.max_instruments * 2``
+    to leave room for later allocation steps.
+
+    When an in-memory ``snapshot`` is supplied the same criteria are evaluated
+    against it without touching the database.  With ``filters.factor_weights``
+    stocks are ranked by composite factor score instead of market cap; the
+    scores are precomputed per snapshot, so a ``snapshot`` (such as the one
+    :data:`~app.services.universe.universe_store` holds) is required and
+    :class:`ValueError` is raised without one.
+    """
+    return [c.instrument for c in screen_candidates(session, filters, snapshot)]
+
+
+def screen_candidates(
+    session: Session,
+    filters: FilterParams,
+    snapshot: UniverseSnapshot | None = None,
+) -> List[Candidate]:
+    """Like :func:`filter_candidates` but pair each instrument with its metric.
+
+    The metrics come from the same statement (or snapshot) so callers need no
+    further lookups.
+    """
+
+    if snapshot is not None:
+        return snapshot.screen(filters)
+    _require_snapshot(filters)
+    rows = session.execute(_screen_stmt(filters))
+    return [Candidate(inst, metric) for inst, metric in rows]
+
+
+async def filter_candidates_async(
+    session: AsyncSession,
+    filters: FilterParams,
+    snapshot: UniverseSnapshot | None = None,
+) -> List[Instrument]:
+    """:func:`filter_candidates` for an :class:`AsyncSession`."""
+    candidates = await screen_candidates_async(session, filters, snapshot)
+    return [c.instrument for c in candidates]
+
+
+async def screen_candidates_async(
+    session: AsyncSession,
+    filters: FilterParams,
+    snapshot: UniverseSnapshot | None = None,
+) -> List[Candidate]:
+    """:func:`screen_candidates` for an :class:`AsyncSession`.
+
+    Runs the same statement; the event loop is free while it executes.
+    """
+    if snapshot is not None:
+        return snapshot.screen(filters)
+    _require_snapshot(filters)
+    result = await session.execute(_screen_stmt(filters))
+    return [Candidate(inst, metric) for inst, metric in result]
+
+
+def _require_snapshot(filters: FilterParams) -> None:
+    if filters.factor_weights is not None:
+        raise ValueError("factor ranking needs a universe snapshot")
+
+
+def _screen_stmt(filters: FilterParams) -> Select[Instrument, Metric]:
+    """Build the single screening statement shared by the sync and async paths."""
+
+    is_etf = Instrument.instrument_type == InstrumentType.ETF
+    is_stock = Instrument.instrument_type == InstrumentType.STOCK
+
+    stock_conditions = [
+        is_stock,
+        Instrument.market_cap >= filters.min_market_cap,
+        Metric.id.is_not(None),
+        Metric.debt_to_equity <= filters.max_de_ratio,
+        Metric.roe >= filters.min_roe,
+        func.coalesce(Metric.dividend_yield, 0.0) >= filters.min_div_yield,
+    ]
+    if filters.growth_bias:
+        stock_conditions += [Metric.revenue_growth > 0, Metric.earnings_growth > 0]
+    if filters.max_volatility is not None:
+        stock_conditions.append(Metric.volatility <= filters.max_volatility)
+    if filters.max_drawdown is not None:
+        stock_conditions.append(Metric.drawdown >= -filters.max_drawdown)
+    if filters.min_momentum is not None:
+        stock_conditions.append(Metric.momentum >= filters.min_momentum)
+    if filters.above_sma_200:
+        stock_conditions.append(Metric.price > Metric.sma_200)
+
+    eligible = and_(*stock_conditions)
+    if filters.include_etfs:
+        eligible = or_(is_etf, eligible)
+
+    return (
+        select(Instrument, Metric)
+        .outerjoin(LatestMetric, LatestMetric.instrument_id == Instrument.id)
+        .outerjoin(Metric, Metric.id == LatestMetric.metric_id)
+        .where(eligible)
+        .order_by(
+            case((is_etf, 0), else_=1),
+            case((is_stock, Instrument.market_cap), else_=None).desc(),
+            Instrument.id,
+        )
+        .limit(filters.max_instruments * 2)
+    )
+
+
+def filter_candidates_iterative(
+    session: Session, filters: FilterParams
+) -> List[Instrument]:
+    """Reference implementation of :func:`filter_candidates`.
+
+    Issues one latest-metric query per stock.  Factor ranking is not
+    applied; stocks always come by market cap.
     """
 
     candidates: list[Instrument] = []
@@ -25,6 +144,7 @@ def filter_candidates(session: Session, filters: FilterParams) -> List[Instrumen
         etfs = (
             session.query(Instrument)
             .filter(Instrument.instrument_type == InstrumentType.ETF)
+            .order_by(Instrument.id)
             .all()
         )
         candidates.extend(etfs)
@@ -33,6 +153,7 @@ def filter_candidates(session: Session, filters: FilterParams) -> List[Instrumen
     stocks = (
         session.query(Instrument)
         .filter(Instrument.instrument_type == InstrumentType.STOCK)
+        .order_by(Instrument.id)
         .all()
     )
 
@@ -43,7 +164,7 @@ def filter_candidates(session: Session, filters: FilterParams) -> List[Instrumen
         metric = (
             session.query(Metric)
             .filter(Metric.instrument_id == inst.id)
-            .order_by(Metric.as_of_date.desc())
+            .order_by(Metric.as_of_date.desc(), Metric.id.desc())
             .first()
         )
         if metric is None:
@@ -64,6 +185,22 @@ def filter_candidates(session: Session, filters: FilterParams) -> List[Instrumen
                 or metric.earnings_growth <= 0
             ):
                 continue
+        if filters.max_volatility is not None and (
+            metric.volatility is None or metric.volatility > filters.max_volatility
+        ):
+            continue
+        if filters.max_drawdown is not None and (
+            metric.drawdown is None or metric.drawdown < -filters.max_drawdown
+        ):
+            continue
+        if filters.min_momentum is not None and (
+            metric.momentum is None or metric.momentum < filters.min_momentum
+        ):
+            continue
+        if filters.above_sma_200 and (
+            metric.sma_200 is None or metric.price <= metric.sma_200
+        ):
+            continue
 
         candidates.append(inst)
 
@@ -77,3 +214,4 @@ def filter_candidates(session: Session, filters: FilterParams) -> List[Instrumen
     ordered = etfs_sorted + stocks_sorted
 
     return ordered[: filters.max_instruments * 2]
+
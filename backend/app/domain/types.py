@@ -1,6 +1,43 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from enum import Enum
+
+
+class WeightingScheme(str, Enum):
+    """How selected instruments share the portfolio."""
+
+    EQUAL = "equal"
+    MARKET_CAP = "market_cap"
+    INVERSE_VOLATILITY = "inverse_volatility"
+    SCORE = "score"
+
+
+class ScoreMethod(str, Enum):
+    """How factor values are made comparable across instruments."""
+
+    PERCENTILE = "percentile"
+    ZSCORE = "zscore"
+
+
+@dataclass(frozen=True)
+class FactorWeights:
+    """Relative weights of the factors in a composite score.
+
+    Each factor is scored cross-sectionally over all stocks, or within each
+    sector when ``sector_relative`` is set, with ``method``; the composite
+    is the weighted mean of the scores an instrument has.  Lower debt to
+    equity and P/E score higher.  ``growth`` averages revenue and earnings
+    growth.
+    """
+
+    roe: float = 0.0
+    debt_to_equity: float = 0.0
+    dividend_yield: float = 0.0
+    growth: float = 0.0
+    pe: float = 0.0
+    sector_relative: bool = False
+    method: ScoreMethod = ScoreMethod.PERCENTILE
 
 
 @dataclass(frozen=True)
@@ -9,7 +46,18 @@ class FilterParams:
 
     All numeric fields are expressed in their natural units.  The mapping
     function is responsible for translating user intent into concrete
-    thresholds.
+    thresholds.  ``weighting``, ``max_weight`` and ``max_sector_weight``
+    (fractions of the portfolio) shape the allocation of the selected
+    instruments.
+
+    The optional price-history thresholds apply to stocks and compare with
+    the rolling analytics stored on the latest metric: ``max_volatility``
+    (annualized), ``max_drawdown`` (a positive fraction below the one-year
+    high), ``min_momentum`` (six-month return) and ``above_sma_200``.  Unset
+    thresholds are not applied; stocks without the statistic fail set ones.
+
+    With ``factor_weights`` the stocks passing the thresholds are ranked by
+    their composite factor score instead of by market cap.
     """
 
     min_market_cap: float
@@ -19,3 +67,11 @@ class FilterParams:
     growth_bias: bool
     max_instruments: int
     include_etfs: bool
+    weighting: WeightingScheme = WeightingScheme.EQUAL
+    max_weight: float | None = None
+    max_sector_weight: float | None = None
+    max_volatility: float | None = None
+    max_drawdown: float | None = None
+    min_momentum: float | None = None
+    above_sma_200: bool = False
+    factor_weights: FactorWeights | None = None
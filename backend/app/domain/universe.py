@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, NamedTuple, Sequence
+
+import numpy as np
+import numpy.typing as npt
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.models import Instrument, InstrumentType, LatestMetric, Metric
+from .factors import FactorScores, factor_scores, factor_values, top_k
+from .types import FactorWeights, FilterParams
+
+FloatArray = npt.NDArray[np.float64]
+BoolArray = npt.NDArray[np.bool_]
+
+
+# Metric columns a snapshot is built from, in the row order ``from_columns``
+# expects.
+SNAPSHOT_COLUMNS = (
+    "price",
+    "pe",
+    "roe",
+    "debt_to_equity",
+    "dividend_yield",
+    "revenue_growth",
+    "earnings_growth",
+    "volatility",
+    "drawdown",
+    "sma_200",
+    "momentum",
+)
+
+
+def _value(row: Instrument | Metric | None, name: str) -> float:
+    value = None if row is None else getattr(row, name)
+    return np.nan if value is None else float(value)
+
+
+def _readonly(array: FloatArray) -> FloatArray:
+    array = np.array(array, dtype=np.float64)
+    array.flags.writeable = False
+    return array
+
+
+class Candidate(NamedTuple):
+    """An instrument that passed screening together with its latest metric."""
+
+    instrument: Instrument
+    metric: Metric | None
+
+
+@dataclass(frozen=True, eq=False)
+class UniverseSnapshot:
+    """Immutable column-oriented view of instruments and their latest metrics.
+
+    Rows are stored in screening order (ETFs by id, then stocks by market cap
+    descending) so a filter is a boolean mask followed by a prefix slice.
+    Missing values are ``NaN`` which fail every comparison, matching the SQL
+    ``NULL`` semantics of :func:`~app.domain.filtering.filter_candidates`.
+
+    ``factors`` holds the cross-sectional factor scores of the stocks,
+    computed once when the snapshot is built (after each ingestion run).
+    Screens with ``factor_weights`` rank the matching stocks by their
+    composite score; each composite is computed once per snapshot.
+    """
+
+    instruments: tuple[Instrument, ...]
+    metrics: tuple[Metric | None, ...]
+    is_etf: BoolArray
+    is_stock: BoolArray
+    market_cap: FloatArray
+    roe: FloatArray
+    debt_to_equity: FloatArray
+    dividend_yield: FloatArray
+    revenue_growth: FloatArray
+    earnings_growth: FloatArray
+    price: FloatArray
+    volatility: FloatArray
+    drawdown: FloatArray
+    sma_200: FloatArray
+    momentum: FloatArray
+    factors: FactorScores
+    data_version: int | None = None
+    _composites: Dict[FactorWeights, FloatArray] = field(
+        default_factory=dict, repr=False
+    )
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[tuple[Instrument, Metric | None]],
+        data_version: int | None = None,
+    ) -> "UniverseSnapshot":
+        """Build a snapshot from ``(instrument, latest metric)`` pairs."""
+
+        pairs = list(rows)
+        values = np.array(
+            [[_value(m, name) for _, m in pairs] for name in SNAPSHOT_COLUMNS],
+            dtype=np.float64,
+        ).reshape(len(SNAPSHOT_COLUMNS), len(pairs))
+        return cls.from_columns(
+            [inst for inst, _ in pairs],
+            values,
+            metrics=[metric for _, metric in pairs],
+            data_version=data_version,
+        )
+
+    @classmethod
+    def from_columns(
+        cls,
+        instruments: Sequence[Instrument],
+        values: FloatArray,
+        metrics: Sequence[Metric | None] | None = None,
+        data_version: int | None = None,
+        market_cap: FloatArray | None = None,
+    ) -> "UniverseSnapshot":
+        """Build a snapshot from metric values held as arrays.
+
+        ``values`` has one row per name in :data:`SNAPSHOT_COLUMNS` and one
+        column per instrument, ``NaN`` where a value is missing.  Without
+        ``metrics`` screened candidates carry no metric object.
+        ``market_cap`` replaces ``Instrument.market_cap`` for ordering and
+        screening, e.g. with the caps as of a past date.
+        """
+        caps = (
+            np.array([_value(i, "market_cap") for i in instruments], dtype=np.float64)
+            if market_cap is None
+            else np.asarray(market_cap, dtype=np.float64)
+        )
+
+        def order(i: int) -> tuple[int, float, int]:
+            inst = instruments[i]
+            if inst.instrument_type == InstrumentType.ETF:
+                return (0, 0.0, inst.id)
+            cap = float(caps[i])
+            return (1, -cap if not np.isnan(cap) else np.inf, inst.id)
+
+        rows = sorted(range(len(instruments)), key=order)
+        ordered = tuple(instruments[i] for i in rows)
+        by_name = {
+            name: np.array(values[k], dtype=np.float64)[rows]
+            for k, name in enumerate(SNAPSHOT_COLUMNS)
+        }
+        by_name["dividend_yield"] = np.nan_to_num(by_name["dividend_yield"], nan=0.0)
+        for column in by_name.values():
+            column.flags.writeable = False
+
+        is_etf = np.array(
+            [i.instrument_type == InstrumentType.ETF for i in ordered], dtype=bool
+        )
+        is_stock = np.array(
+            [i.instrument_type == InstrumentType.STOCK for i in ordered], dtype=bool
+        )
+        is_etf.flags.writeable = False
+        is_stock.flags.writeable = False
+        codes: dict[str | None, int] = {}
+        sectors = np.array(
+            [codes.setdefault(i.sector, len(codes)) for i in ordered], dtype=np.intp
+        )
+        factors = factor_scores(factor_values(by_name), sectors, is_stock)
+
+        return cls(
+            instruments=ordered,
+            metrics=(
+                (None,) * len(ordered)
+                if metrics is None
+                else tuple(metrics[i] for i in rows)
+            ),
+            is_etf=is_etf,
+            is_stock=is_stock,
+            market_cap=_readonly(caps[rows]),
+            roe=by_name["roe"],
+            debt_to_equity=by_name["debt_to_equity"],
+            dividend_yield=by_name["dividend_yield"],
+            revenue_growth=by_name["revenue_growth"],
+            earnings_growth=by_name["earnings_growth"],
+            price=by_name["price"],
+            volatility=by_name["volatility"],
+            drawdown=by_name["drawdown"],
+            sma_200=by_name["sma_200"],
+            momentum=by_name["momentum"],
+            factors=factors,
+            data_version=data_version,
+        )
+
+    def __len__(self) -> int:
+        return len(self.instruments)
+
+    def mask(self, filters: FilterParams) -> BoolArray:
+        """Return the rows passing ``filters`` as a boolean mask."""
+        with np.errstate(invalid="ignore"):
+            stocks = (
+                self.is_stock
+                & (self.market_cap >= filters.min_market_cap)
+                & (self.debt_to_equity <= filters.max_de_ratio)
+                & (self.roe >= filters.min_roe)
+                & (self.dividend_yield >= filters.min_div_yield)
+            )
+            if filters.growth_bias:
+                stocks &= (self.revenue_growth > 0) & (self.earnings_growth > 0)
+            if filters.max_volatility is not None:
+                stocks &= self.volatility <= filters.max_volatility
+            if filters.max_drawdown is not None:
+                stocks &= self.drawdown >= -filters.max_drawdown
+            if filters.min_momentum is not None:
+                stocks &= self.momentum >= filters.min_momentum
+            if filters.above_sma_200:
+                stocks &= self.price > self.sma_200
+        if filters.include_etfs:
+            return stocks | self.is_etf
+        return stocks
+
+    def score(self, weights: FactorWeights) -> FloatArray:
+        """Return the composite factor score of every row under ``weights``."""
+        composite = self._composites.get(weights)
+        if composite is None:
+            composite = self.factors.composite(weights)
+            composite.flags.writeable = False
+            self._composites[weights] = composite
+        return composite
+
+    def select(self, filters: FilterParams) -> npt.NDArray[np.intp]:
+        """Return row indices of matching instruments, capped like the SQL path.
+
+        With ``filters.factor_weights`` matching ETFs still come first and
+        the remaining places go to the best scoring stocks.
+        """
+        limit = filters.max_instruments * 2
+        mask = self.mask(filters)
+        if filters.factor_weights is None:
+            return np.flatnonzero(mask)[:limit]
+        etfs = np.flatnonzero(mask & self.is_etf)[:limit]
+        stocks = np.flatnonzero(mask & ~self.is_etf)
+        scores = self.score(filters.factor_weights)[stocks]
+        return np.concatenate((etfs, stocks[top_k(scores, limit - len(etfs))]))
+
+    def filter(self, filters: FilterParams) -> List[Instrument]:
+        """Return matching instruments in screening order."""
+        return [self.instruments[i] for i in self.select(filters)]
+
+    def screen(self, filters: FilterParams) -> List[Candidate]:
+        """Return matching instruments with their latest metrics."""
+        return [
+            Candidate(self.instruments[i], self.metrics[i])
+            for i in self.select(filters)
+        ]
+
+
+def build_universe_snapshot(
+    session: Session, data_version: int | None = None
+) -> UniverseSnapshot:
+    """Load every instrument with its latest metric into a snapshot.
+
+    Loaded objects are expunged from ``session`` so the snapshot can outlive
+    it and be shared across requests.
+    """
+
+    rows = session.execute(
+        select(Instrument, Metric)
+        .outerjoin(LatestMetric, LatestMetric.instrument_id == Instrument.id)
+        .outerjoin(Metric, Metric.id == LatestMetric.metric_id)
+    ).all()
+    for inst, metric in rows:
+        session.expunge(inst)
+        if metric is not None:
+            session.expunge(metric)
+    return UniverseSnapshot.from_rows(
+        ((inst, metric) for inst, metric in rows), data_version=data_version
+    )
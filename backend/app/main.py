@@ -8,6 +8,7 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
+from sqlalchemy.exc import SQLAlchemyError
 
 from slowapi import _rate_limit_exceeded_handler  # type: ignore[import-not-found]
 from slowapi.errors import RateLimitExceeded  # type: ignore[import-not-found]
@@ -16,9 +17,19 @@ from app.core.rate_limit import limiter
 
 from app.api.metrics import router as metrics_router
 
-from app.api.routes import router as api_router
+from app.api.routes import router as api_router, screen_router
 from app.core.config import get_settings
 from app.core.logging import configure_logging, request_id_ctx_var
+from app.db.session import (
+    dispose_async_engine,
+    dispose_engine,
+    get_async_session_factory,
+    get_session_factory,
+    init_async_engine,
+    init_engine,
+)
+from app.services.interpretation import interpreter
+from app.services.universe import universe_store
 
 
 class HealthResponse(BaseModel):
@@ -40,6 +51,7 @@ app.add_middleware(
     allow_headers=["*"],
 )
 app.include_router(api_router)
+app.include_router(screen_router(settings))
 app.include_router(metrics_router)
 
 
@@ -97,6 +109,9 @@ async def unhandled_exception_handler(request: Request, exc: Exception):
 async def startup() -> None:
     settings = get_settings()
     app.state.start_time = time.time()
+    init_engine(settings)
+    if settings.DB_ASYNC:
+        init_async_engine(settings)
 
     logger = logging.getLogger("app")
     logger.setLevel(settings.LOG_LEVEL)
@@ -105,6 +120,27 @@ async def startup() -> None:
         extra={"app_env": settings.APP_ENV, "log_level": settings.LOG_LEVEL},
     )
 
+    if settings.UNIVERSE_SNAPSHOT_ENABLED:
+        universe_store.refresh_seconds = settings.UNIVERSE_REFRESH_SECONDS
+        try:
+            # Build through the engine requests will use so it is reused.
+            if settings.DB_ASYNC:
+                async with get_async_session_factory(settings)() as async_session:
+                    await universe_store.refresh_async(async_session)
+            else:
+                with get_session_factory(settings)() as session:
+                    universe_store.refresh(session)
+        except SQLAlchemyError:
+            logger.warning("universe snapshot unavailable at startup")
+
+
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    dispose_engine()
+    await dispose_async_engine()
+    await interpreter.aclose()
+
+
 @app.get("/health", response_model=HealthResponse)
 async def health() -> HealthResponse:
     """Return service health status."""
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from typing import Any, Mapping, Sequence
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.models import IngestionRun, IngestionRunSymbol
+
+_LATEST_ID = select(func.max(IngestionRun.id))
+
+
+class IngestionRunRepository:
+    """Repository for reading the ingestion run log."""
+
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    def latest_id(self) -> int | None:
+        """Return the id of the most recent ingestion run, if any.
+
+        The id doubles as a data version: it changes whenever new metrics
+        land.
+        """
+        return self._session.scalar(_LATEST_ID)
+
+    def add_symbols(self, run_id: int, rows: Sequence[Mapping[str, Any]]) -> None:
+        """Record the per-instrument outcomes of run ``run_id`` in one statement.
+
+        Each row holds the :class:`IngestionRunSymbol` columns other than
+        ``run_id``.
+        """
+        if rows:
+            self._session.execute(
+                insert(IngestionRunSymbol), [{**row, "run_id": run_id} for row in rows]
+            )
+
+
+class AsyncIngestionRunRepository:
+    """:class:`IngestionRunRepository` for an :class:`AsyncSession`."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def latest_id(self) -> int | None:
+        """Return the id of the most recent ingestion run, if any."""
+        return await self._session.scalar(_LATEST_ID)
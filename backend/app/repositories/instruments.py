@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+from datetime import date
+
+from sqlalchemy import exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.models import Instrument
+from app.db.models import Instrument, LatestMetric, Metric
 
 
 class InstrumentRepository:
@@ -30,6 +34,27 @@ class InstrumentRepository:
         """Return all instruments."""
         return self._session.query(Instrument).all()
 
+    def list_stale(self, as_of: date) -> list[Instrument]:
+        """Return the instruments that still need metrics for the day ``as_of``.
+
+        An instrument is current when its latest metric is dated ``as_of`` or
+        later.  Instruments never fetched, whose fetches all failed, or whose
+        provider had no close for ``as_of`` yet (e.g. a run before that day's
+        data was published) are stale.
+        """
+        has_current_metric = exists().where(
+            LatestMetric.instrument_id == Instrument.id,
+            Metric.id == LatestMetric.metric_id,
+            Metric.as_of_date >= as_of,
+        )
+        return list(
+            self._session.scalars(
+                select(Instrument)
+                .where(~has_current_metric)
+                .order_by(Instrument.id)
+            )
+        )
+
     def upsert_by_symbol(self, instrument: Instrument) -> Instrument:
         """Create or update an instrument based on its symbol."""
         existing = self.get_by_symbol(instrument.symbol)
@@ -43,3 +68,22 @@ class InstrumentRepository:
             self._session.refresh(existing)
             return existing
         return self.create(instrument)
+
+
+class AsyncInstrumentRepository:
+    """Read-only :class:`InstrumentRepository` for an :class:`AsyncSession`."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def get_by_symbol(self, symbol: str) -> Instrument | None:
+        """Retrieve an instrument by its symbol."""
+        result = await self._session.scalars(
+            select(Instrument).where(Instrument.symbol == symbol).limit(1)
+        )
+        return result.first()
+
+    async def list_all(self) -> list[Instrument]:
+        """Return all instruments."""
+        result = await self._session.scalars(select(Instrument))
+        return list(result)
@@ -1,8 +1,92 @@
 from __future__ import annotations
 
-from sqlalchemy.orm import Session
+from datetime import date
+from typing import Any, Iterable, Mapping, Sequence
 
-from app.db.models import Instrument, Metric
+from sqlalchemy import Select, and_, bindparam, case, func, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
+
+from app.db.latest_metrics import refresh_latest_metrics
+from app.db.models import Instrument, LatestMetric, Metric
+from app.db.upsert import upsert
+
+# ``Metric.__table__`` is typed as a plain FromClause; Core DML needs the Table.
+_METRICS = Metric.metadata.tables[Metric.__tablename__]
+
+# Columns written by ingestion; everything except the identity columns.
+METRIC_VALUE_COLUMNS = (
+    "price",
+    "pe",
+    "roe",
+    "debt_to_equity",
+    "dividend_yield",
+    "revenue_growth",
+    "earnings_growth",
+)
+
+
+def _history_stmt(symbol: str) -> Select[Metric]:
+    return (
+        select(Metric)
+        .join(Instrument)
+        .where(Instrument.symbol == symbol)
+        .order_by(Metric.as_of_date)
+    )
+
+
+def _price_window_stmt(
+    since: date | None, instrument_ids: list[int] | None, lookback: int
+) -> Select[int, int, int, float]:
+    """Rows on or after ``since`` plus ``lookback - 1`` earlier ones each.
+
+    The first day needed is looked up once per instrument with an index walk
+    on ``(instrument_id, as_of_date)``, and the metrics of each instrument
+    are read from there, so the cost does not grow with the length of the
+    older history.
+    """
+    columns = (Metric.id, Metric.instrument_id)
+    if since is None:
+        stmt = select(*columns, literal(1), Metric.price).select_from(Metric)
+        if instrument_ids is not None:
+            stmt = stmt.where(Metric.instrument_id.in_(instrument_ids))
+        return stmt.order_by(Metric.instrument_id, Metric.as_of_date)
+
+    earlier = aliased(Metric)
+    first_day = (
+        select(earlier.as_of_date)
+        .where(earlier.instrument_id == Instrument.id, earlier.as_of_date < since)
+        .order_by(earlier.as_of_date.desc())
+        .offset(max(lookback - 2, 0))
+        .limit(1)
+        .scalar_subquery()
+    )
+    # Without enough earlier rows the whole history is read.
+    first = func.coalesce(first_day, date.min) if lookback > 1 else since
+    is_new = case((Metric.as_of_date >= since, 1), else_=0)
+    # Ordering by the instrument id keeps instruments as the outer loop, so
+    # the lookup runs once per instrument rather than once per metric.
+    stmt = (
+        select(*columns, is_new, Metric.price)
+        .select_from(Instrument)
+        .join(
+            Metric,
+            and_(Metric.instrument_id == Instrument.id, Metric.as_of_date >= first),
+        )
+        .order_by(Instrument.id, Metric.as_of_date)
+    )
+    if instrument_ids is not None:
+        stmt = stmt.where(Instrument.id.in_(instrument_ids))
+    return stmt
+
+
+def _latest_by_symbol_stmt(symbol: str) -> Select[Metric]:
+    return (
+        select(Metric)
+        .join(LatestMetric, LatestMetric.metric_id == Metric.id)
+        .join(Instrument, Instrument.id == LatestMetric.instrument_id)
+        .where(Instrument.symbol == symbol)
+    )
 
 
 class MetricRepository:
@@ -18,22 +102,88 @@ class MetricRepository:
         self._session.refresh(metric)
         return metric
 
+    def bulk_upsert(self, rows: Sequence[Mapping[str, Any]]) -> int:
+        """Insert or update many metric rows without committing.
+
+        Rows are keyed on ``(instrument_id, as_of_date)``; re-ingesting a day
+        overwrites its values instead of adding a duplicate.  Every row must
+        provide the same keys.  Returns the number of rows written.
+        """
+        if not rows:
+            return 0
+        columns = [c for c in METRIC_VALUE_COLUMNS if c in rows[0]]
+        stmt = upsert(
+            self._session.get_bind().dialect.name,
+            _METRICS,
+            index_elements=("instrument_id", "as_of_date"),
+            update_columns=columns,
+        )
+        self._session.execute(stmt, [dict(row) for row in rows])
+        return len(rows)
+
+    def refresh_latest(self, instrument_ids: Iterable[int] | None = None) -> None:
+        """Rebuild the ``latest_metrics`` pointers without committing.
+
+        Call after :meth:`bulk_upsert`, which bypasses the ORM events that
+        keep the pointers current for individually added metrics.
+        """
+        refresh_latest_metrics(self._session.connection(), instrument_ids)
+
+    def price_windows(
+        self,
+        since: date | None = None,
+        instrument_ids: Iterable[int] | None = None,
+        lookback: int = 1,
+    ) -> list[tuple[int, int, int, float]]:
+        """Return the prices needed to recompute statistics from ``since``.
+
+        Rows are ``(metric_id, instrument_id, is_new, price)`` ordered by
+        instrument and date: every day on or after ``since`` (``is_new`` 1)
+        preceded by up to ``lookback - 1`` earlier days (``is_new`` 0).
+        Without ``since`` the whole history is returned as new.
+        """
+        ids = None if instrument_ids is None else list(instrument_ids)
+        stmt = _price_window_stmt(since, ids, lookback)
+        return [(a, b, c, d) for a, b, c, d in self._session.execute(stmt)]
+
+    def bulk_update(
+        self, columns: Sequence[str], rows: Sequence[Mapping[str, Any]]
+    ) -> int:
+        """Set ``columns`` of existing metrics by id without committing.
+
+        Each row holds ``metric_id`` and a value for every column.  Like
+        :meth:`bulk_upsert` this bypasses the ORM.  Returns the row count.
+        """
+        if not rows:
+            return 0
+        stmt = (
+            update(_METRICS)
+            .where(_METRICS.c.id == bindparam("metric_id"))
+            .values({c: bindparam(c) for c in columns})
+        )
+        self._session.execute(stmt, list(rows))
+        return len(rows)
+
     def list_by_instrument(self, symbol: str) -> list[Metric]:
         """List metrics for a given instrument symbol ordered by date."""
-        return (
-            self._session.query(Metric)
-            .join(Instrument)
-            .filter(Instrument.symbol == symbol)
-            .order_by(Metric.as_of_date)
-            .all()
-        )
+        return list(self._session.scalars(_history_stmt(symbol)))
 
     def latest_by_instrument(self, symbol: str) -> Metric | None:
         """Return the most recent metric for an instrument symbol."""
-        return (
-            self._session.query(Metric)
-            .join(Instrument)
-            .filter(Instrument.symbol == symbol)
-            .order_by(Metric.as_of_date.desc())
-            .first()
-        )
+        return self._session.scalars(_latest_by_symbol_stmt(symbol)).first()
+
+
+class AsyncMetricRepository:
+    """Read-only :class:`MetricRepository` for an :class:`AsyncSession`."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def list_by_instrument(self, symbol: str) -> list[Metric]:
+        """List metrics for a given instrument symbol ordered by date."""
+        return list(await self._session.scalars(_history_stmt(symbol)))
+
+    async def latest_by_instrument(self, symbol: str) -> Metric | None:
+        """Return the most recent metric for an instrument symbol."""
+        result = await self._session.scalars(_latest_by_symbol_stmt(symbol))
+        return result.first()
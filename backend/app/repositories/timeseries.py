@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from functools import lru_cache
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterator, Sequence
+from urllib.parse import quote
+
+import numpy as np
+import numpy.typing as npt
+from sqlalchemy import Date, Integer, Select, String, bindparam, select, type_coerce
+from sqlalchemy.orm import Session
+
+from app.core.cache import LRUCache
+from app.db.models import Instrument, Metric
+from app.repositories.ingestion_runs import IngestionRunRepository
+from app.repositories.metrics import METRIC_VALUE_COLUMNS
+
+FloatArray = npt.NDArray[np.float64]
+DateArray = npt.NDArray[np.datetime64]
+
+
+@dataclass(frozen=True)
+class MetricSeries:
+    """Metric history of one instrument as column arrays.
+
+    ``dates`` (``datetime64[D]``, ascending) and every array in ``values``
+    have one entry per day.  Missing values are ``NaN``.  Arrays read from a
+    :class:`SeriesCache` are read-only memory maps.
+    """
+
+    dates: DateArray
+    values: Dict[str, FloatArray]
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __getitem__(self, column: str) -> FloatArray:
+        return self.values[column]
+
+    def between(
+        self, start: date | None = None, end: date | None = None
+    ) -> MetricSeries:
+        """Return the days from ``start`` to ``end`` (both inclusive) as views."""
+        lo = 0 if start is None else int(np.searchsorted(self.dates, _day(start)))
+        hi = (
+            len(self.dates)
+            if end is None
+            else int(np.searchsorted(self.dates, _day(end), side="right"))
+        )
+        return self._slice(lo, hi)
+
+    def select(self, columns: Sequence[str]) -> MetricSeries:
+        """Return the series restricted to ``columns``."""
+        return MetricSeries(self.dates, {c: self.values[c] for c in columns})
+
+    def _slice(self, lo: int, hi: int) -> MetricSeries:
+        return MetricSeries(
+            self.dates[lo:hi], {c: v[lo:hi] for c, v in self.values.items()}
+        )
+
+
+def _day(value: date) -> np.datetime64:
+    return np.datetime64(value, "D")
+
+
+def _empty(columns: Sequence[str]) -> MetricSeries:
+    return MetricSeries(
+        np.empty(0, dtype="datetime64[D]"),
+        {c: np.empty(0, dtype=np.float64) for c in columns},
+    )
+
+
+def _from_rows(
+    rows: Sequence[Sequence[object]], columns: Sequence[str]
+) -> MetricSeries:
+    if not rows:
+        return _empty(columns)
+    fields = list(zip(*rows))
+    # ``None`` becomes NaN in a float array.
+    return MetricSeries(
+        np.array(fields[0], dtype="datetime64[D]"),
+        {c: np.array(f, dtype=np.float64) for c, f in zip(columns, fields[1:])},
+    )
+
+
+def _check_columns(columns: Sequence[str]) -> None:
+    unknown = [c for c in columns if c not in METRIC_VALUE_COLUMNS]
+    if unknown:
+        raise ValueError(f"unknown metric columns: {', '.join(unknown)}")
+
+
+@lru_cache(maxsize=256)
+def _series_stmt(
+    columns: tuple[str, ...],
+    start: bool = False,
+    end: bool = False,
+    after: bool = False,
+    limit: bool = False,
+) -> Select[Any]:
+    """Build the history statement once per shape.
+
+    The symbol and the bounds selected by the flags are bound parameters
+    named like them.
+    """
+    table = Metric.__table__
+    # Dates are fetched without per-row conversion to ``date`` objects: as ISO
+    # strings on SQLite and as the driver returns them elsewhere.  NumPy
+    # parses either directly.
+    stmt = (
+        select(
+            type_coerce(Metric.as_of_date, String),
+            *(table.c[c] for c in columns),
+        )
+        .join(Instrument, Instrument.id == Metric.instrument_id)
+        .where(Instrument.symbol == bindparam("symbol"))
+        .order_by(Metric.as_of_date)
+    )
+    if start:
+        stmt = stmt.where(Metric.as_of_date >= bindparam("start", type_=Date))
+    if end:
+        stmt = stmt.where(Metric.as_of_date <= bindparam("end", type_=Date))
+    if after:
+        stmt = stmt.where(Metric.as_of_date > bindparam("after", type_=Date))
+    if limit:
+        stmt = stmt.limit(bindparam("limit", type_=Integer))
+    return stmt
+
+
+def _series_query(
+    symbol: str, columns: Sequence[str], **bounds: date | int | None
+) -> tuple[Select[Any], Dict[str, object]]:
+    params = {k: v for k, v in bounds.items() if v is not None}
+    flags = {k: True for k in params}
+    return _series_stmt(tuple(columns), **flags), {"symbol": symbol, **params}
+
+
+class SeriesCache:
+    """Memory-mapped columnar copies of whole metric histories.
+
+    Each symbol's history is stored under ``directory`` in a subdirectory
+    named after the data version (the latest ingestion run id), so a new
+    ingestion run invalidates every entry.  Symbols are percent-encoded,
+    dots included, so no symbol can name a parent or hidden directory.
+    ``dates.npy`` holds the days and ``values.npy`` one contiguous row per
+    metric column.  Entries are written to a temporary directory and renamed
+    into place, so readers never see partial files; older versions are
+    removed on write.  The most recently used ``maxsize`` entries stay
+    mapped between reads.
+    """
+
+    def __init__(self, directory: str | Path, maxsize: int = 256) -> None:
+        self.directory = Path(directory)
+        self._mapped: LRUCache[tuple[str, int | None], MetricSeries] = LRUCache(
+            maxsize=maxsize
+        )
+
+    def _path(self, symbol: str, version: int | None) -> Path:
+        name = quote(symbol, safe="").replace(".", "%2E") or "%"
+        return self.directory / name / f"v{version or 0}"
+
+    def get(self, symbol: str, version: int | None) -> MetricSeries | None:
+        """Return the cached history of ``symbol`` for ``version``, if any."""
+        key = (symbol, version)
+        series = self._mapped.get(key)
+        if series is not None:
+            return series
+        path = self._path(symbol, version)
+        if not path.is_dir():
+            return None
+        values = np.load(path / "values.npy", mmap_mode="r")
+        series = MetricSeries(
+            np.load(path / "dates.npy", mmap_mode="r"),
+            dict(zip(METRIC_VALUE_COLUMNS, values)),
+        )
+        self._mapped.set(key, series)
+        return series
+
+    def set(self, symbol: str, version: int | None, series: MetricSeries) -> None:
+        """Store the full history of ``symbol`` for ``version``."""
+        path = self._path(symbol, version)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(dir=path.parent, prefix=".tmp-"))
+        values = np.stack([series.values[c] for c in METRIC_VALUE_COLUMNS])
+        try:
+            np.save(staging / "dates.npy", series.dates)
+            np.save(staging / "values.npy", values)
+            os.replace(staging, path)
+        except OSError:
+            # Another writer stored the same version first.
+            shutil.rmtree(staging, ignore_errors=True)
+            if not path.is_dir():
+                raise
+        for old in path.parent.iterdir():
+            if old != path and not old.name.startswith(".tmp-"):
+                shutil.rmtree(old, ignore_errors=True)
+
+
+class MetricHistoryRepository:
+    """Read metric history as arrays instead of ORM objects.
+
+    Reads select only the requested columns for a date range, ordered by day,
+    and build one contiguous array per column.  :meth:`stream` and
+    :meth:`page` bound memory for long histories.  With a ``cache`` the whole
+    history of a symbol is read once per data version and later reads slice
+    its memory maps without touching the database.
+    """
+
+    def __init__(self, session: Session, cache: SeriesCache | None = None) -> None:
+        self._session = session
+        self._cache = cache
+
+    def history(
+        self,
+        symbol: str,
+        columns: Sequence[str] = ("price",),
+        start: date | None = None,
+        end: date | None = None,
+    ) -> MetricSeries:
+        """Return ``columns`` of ``symbol`` from ``start`` to ``end`` inclusive.
+
+        Unknown symbols give an empty series.
+        """
+        _check_columns(columns)
+        cached = self._cached(symbol)
+        if cached is not None:
+            return cached.between(start, end).select(columns)
+        stmt, params = _series_query(symbol, columns, start=start, end=end)
+        rows = self._session.execute(stmt, params).all()
+        return _from_rows(rows, columns)
+
+    def stream(
+        self,
+        symbol: str,
+        columns: Sequence[str] = ("price",),
+        start: date | None = None,
+        end: date | None = None,
+        chunk_size: int = 10_000,
+    ) -> Iterator[MetricSeries]:
+        """Yield :meth:`history` in chunks of at most ``chunk_size`` days.
+
+        Rows are fetched from a server-side cursor as the chunks are
+        consumed.
+        """
+        _check_columns(columns)
+        cached = self._cached(symbol)
+        if cached is not None:
+            window = cached.between(start, end).select(columns)
+            for lo in range(0, len(window), chunk_size):
+                yield window._slice(lo, lo + chunk_size)
+            return
+        stmt, params = _series_query(symbol, columns, start=start, end=end)
+        result = self._session.execute(
+            stmt, params, execution_options={"yield_per": chunk_size}
+        )
+        try:
+            for rows in result.partitions():
+                yield _from_rows(rows, columns)
+        finally:
+            result.close()
+
+    def page(
+        self,
+        symbol: str,
+        columns: Sequence[str] = ("price",),
+        after: date | None = None,
+        limit: int = 1_000,
+    ) -> MetricSeries:
+        """Return up to ``limit`` days strictly after ``after``.
+
+        Pass the last date of a page as ``after`` to get the next one; an
+        empty page marks the end.  Each page is a keyset lookup on
+        ``(instrument_id, as_of_date)``, so its cost does not depend on how
+        many pages came before.
+        """
+        _check_columns(columns)
+        cached = self._cached(symbol)
+        if cached is not None:
+            window = cached.select(columns)
+            lo = 0 if after is None else int(
+                np.searchsorted(window.dates, _day(after), side="right")
+            )
+            return window._slice(lo, lo + limit)
+        stmt, params = _series_query(symbol, columns, after=after, limit=limit)
+        return _from_rows(self._session.execute(stmt, params).all(), columns)
+
+    def _cached(self, symbol: str) -> MetricSeries | None:
+        if self._cache is None:
+            return None
+        version = IngestionRunRepository(self._session).latest_id()
+        series = self._cache.get(symbol, version)
+        if series is None:
+            stmt, params = _series_query(symbol, METRIC_VALUE_COLUMNS)
+            rows = self._session.execute(stmt, params).all()
+            if not rows:
+                # Unknown symbols are not stored, so lookups cannot fill the disk.
+                return _empty(METRIC_VALUE_COLUMNS)
+            self._cache.set(symbol, version, _from_rows(rows, METRIC_VALUE_COLUMNS))
+            series = self._cache.get(symbol, version)
+        return series
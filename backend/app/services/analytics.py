@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import logging
+import time
+from datetime import date
+from typing import Iterable
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.domain.analytics import ANALYTICS_COLUMNS, LOOKBACK, rolling_analytics
+from app.repositories.metrics import MetricRepository
+
+logger = logging.getLogger("app")
+
+
+def update_analytics(
+    session: Session,
+    since: date | None = None,
+    instrument_ids: Iterable[int] | None = None,
+) -> int:
+    """Recompute the rolling statistics of metrics dated ``since`` or later.
+
+    Only the new days are written; each instrument reads just the
+    :data:`~app.domain.analytics.LOOKBACK` days of history they depend on.
+    Without ``since`` every day is recomputed (a backfill).  Statistics are
+    computed per instrument on whole arrays and written back in one batch
+    without committing, so callers keep them in the transaction that wrote
+    the prices.  Returns the number of metrics updated.
+    """
+    started = time.perf_counter()
+    repo = MetricRepository(session)
+    rows = repo.price_windows(since, instrument_ids, LOOKBACK)
+    if not rows:
+        return 0
+    table = np.array(rows, dtype=np.float64)
+    metric_ids = table[:, 0].astype(np.int64)
+    owners = table[:, 1]
+    is_new = table[:, 2] == 1
+    prices = np.ascontiguousarray(table[:, 3])
+
+    starts = np.flatnonzero(np.diff(owners)) + 1
+    stats = np.full((len(ANALYTICS_COLUMNS), len(rows)), np.nan)
+    for lo, hi in zip(np.r_[0, starts], np.r_[starts, len(rows)]):
+        computed = rolling_analytics(prices[lo:hi])
+        for k, column in enumerate(ANALYTICS_COLUMNS):
+            stats[k, lo:hi] = computed[column]
+
+    # ``NaN`` (no full window yet) is stored as NULL.
+    values = stats.astype(object)
+    values[np.isnan(stats)] = None
+    values = values[:, is_new]
+    updates = [
+        dict(zip(ANALYTICS_COLUMNS, column), metric_id=metric_id)
+        for metric_id, column in zip(metric_ids[is_new].tolist(), values.T.tolist())
+    ]
+    written = repo.bulk_update(ANALYTICS_COLUMNS, updates)
+    logger.info(
+        "analytics updated",
+        extra={
+            "metrics": written,
+            "instruments": len(starts) + 1,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+        },
+    )
+    return written
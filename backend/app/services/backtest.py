@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import logging
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Generator, List, Sequence
+
+import numpy as np
+import numpy.typing as npt
+from sqlalchemy import Select, func, select
+from sqlalchemy.orm import Session, aliased
+
+from app.db.models import Instrument, LatestMetric, Metric
+from app.domain.backtest import (
+    BacktestResult,
+    PeriodResult,
+    evaluate_period,
+    historical_snapshot,
+    rebalance_dates,
+)
+from app.domain.universe import SNAPSHOT_COLUMNS, UniverseSnapshot
+
+logger = logging.getLogger("app")
+
+FloatArray = npt.NDArray[np.float64]
+IntArray = npt.NDArray[np.int64]
+
+_VALUE_COLUMNS = tuple(Metric.__table__.c[c] for c in SNAPSHOT_COLUMNS)
+_PRICE = SNAPSHOT_COLUMNS.index("price")
+
+
+@dataclass(frozen=True)
+class BacktestConfig:
+    """Which dates to rebalance on and how profiles are mapped.
+
+    ``start`` and ``end`` default to the first and last day with metrics.
+    Portfolios are rebalanced at every ``months``-th month end in between.
+    """
+
+    start: date | None = None
+    end: date | None = None
+    months: int = 1
+    horizon_years: int = 5
+
+
+def _instruments(session: Session) -> List[Instrument]:
+    """All instruments by id, detached so they can be sent to workers."""
+    instruments = list(session.scalars(select(Instrument).order_by(Instrument.id)))
+    for inst in instruments:
+        session.expunge(inst)
+    return instruments
+
+
+def _dates(session: Session, config: BacktestConfig) -> List[date]:
+    first, last = session.execute(
+        select(func.min(Metric.as_of_date), func.max(Metric.as_of_date))
+    ).one()
+    if first is None:
+        return []
+    return rebalance_dates(config.start or first, config.end or last, config.months)
+
+
+def _latest_rows_stmt(
+    instrument_ids: IntArray, as_of: date, after: date | None
+) -> Select[Any]:
+    """Each instrument's latest metric on or before ``as_of``.
+
+    With ``after``, only metrics after that date count and instruments
+    without one are left out.  The subquery is one backwards seek on the
+    (instrument_id, as_of_date) index per instrument.
+    """
+    candidate = aliased(Metric)
+    window = [
+        candidate.instrument_id == Instrument.id,
+        candidate.as_of_date <= as_of,
+    ]
+    if after is not None:
+        window.append(candidate.as_of_date > after)
+    latest = (
+        select(candidate.id)
+        .where(*window)
+        .order_by(candidate.as_of_date.desc(), candidate.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    return (
+        select(Instrument.id, *_VALUE_COLUMNS)
+        .select_from(Instrument)
+        .join(Metric, Metric.id == latest)
+        .where(Instrument.id.in_(instrument_ids.tolist()))
+        .order_by(Instrument.id)
+    )
+
+
+def point_in_time_values(
+    session: Session, instrument_ids: IntArray, dates: Sequence[date]
+) -> Generator[FloatArray, None, None]:
+    """Yield the metric columns of every instrument as of each of ``dates``.
+
+    Each array has one row per :data:`SNAPSHOT_COLUMNS` entry and one column
+    per id in ``instrument_ids`` (ascending), holding the latest metric on or
+    before the date, or ``NaN``.  Each universe is the previous one updated
+    with the metrics that arrived in between, so instruments that stopped
+    reporting carry their last values forward without being looked up
+    again.  ``dates`` must be ascending.
+    """
+    state = np.full((len(SNAPSHOT_COLUMNS), len(instrument_ids)), np.nan)
+    previous = None
+    for as_of in dates:
+        rows = session.execute(
+            _latest_rows_stmt(instrument_ids, as_of, previous)
+        ).all()
+        if rows:
+            fields = list(zip(*rows))
+            positions = np.searchsorted(instrument_ids, fields[0])
+            state[:, positions] = np.array(fields[1:], dtype=np.float64)
+        previous = as_of
+        yield state.copy()
+
+
+def point_in_time_values_reference(
+    session: Session, instrument_ids: IntArray, as_of: date
+) -> FloatArray:
+    """:func:`point_in_time_values` for one date with a query of its own."""
+    candidate = aliased(Metric)
+    latest = (
+        select(candidate.id)
+        .where(
+            candidate.instrument_id == Instrument.id, candidate.as_of_date <= as_of
+        )
+        .order_by(candidate.as_of_date.desc(), candidate.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    rows = session.execute(
+        select(Instrument.id, *_VALUE_COLUMNS)
+        .select_from(Instrument)
+        .outerjoin(Metric, Metric.id == latest)
+        .where(Instrument.id.in_(instrument_ids.tolist()))
+        .order_by(Instrument.id)
+    ).all()
+    return np.array([row[1:] for row in rows], dtype=np.float64).T.reshape(
+        len(SNAPSHOT_COLUMNS), len(rows)
+    )
+
+
+def _shares(session: Session, instruments: Sequence[Instrument]) -> FloatArray:
+    """Shares outstanding implied by each market cap and latest price.
+
+    ``NaN`` for instruments without either.
+    """
+    rows = session.execute(
+        select(LatestMetric.instrument_id, Metric.price).join(
+            Metric, Metric.id == LatestMetric.metric_id
+        )
+    )
+    prices = {instrument_id: price for instrument_id, price in rows}
+    caps = np.array(
+        [np.nan if i.market_cap is None else i.market_cap for i in instruments],
+        dtype=np.float64,
+    )
+    latest = np.array([prices.get(i.id, np.nan) for i in instruments], dtype=np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return caps / latest
+
+
+def universe_as_of(session: Session, as_of: date) -> UniverseSnapshot:
+    """Return the universe as it stood on ``as_of``.
+
+    See :func:`~app.domain.backtest.historical_snapshot` for what is and
+    is not point-in-time.
+    """
+    instruments = _instruments(session)
+    ids = np.array([inst.id for inst in instruments], dtype=np.int64)
+    values = next(point_in_time_values(session, ids, [as_of]))
+    return historical_snapshot(instruments, _shares(session, instruments), values)
+
+
+# Set in each worker process by ``_init_worker``.
+_worker_instruments: List[Instrument] = []
+_worker_shares: FloatArray = np.empty(0)
+
+
+def _init_worker(instruments: List[Instrument], shares: FloatArray) -> None:
+    global _worker_instruments, _worker_shares
+    _worker_instruments = instruments
+    _worker_shares = shares
+
+
+def _evaluate(
+    values: FloatArray, next_prices: FloatArray, start: date, end: date, horizon: int
+) -> List[PeriodResult]:
+    return evaluate_period(
+        _worker_instruments, _worker_shares, values, next_prices, start, end, horizon
+    )
+
+
+def run_backtest(
+    session: Session,
+    config: BacktestConfig = BacktestConfig(),
+    workers: int | None = None,
+) -> BacktestResult:
+    """Replay every profile at each rebalance date and measure its returns.
+
+    Point-in-time universes come from :func:`point_in_time_values`; every
+    period (one date and the prices at the next) is screened and allocated
+    for all profiles in a pool of ``workers`` processes (default: one per
+    CPU) while later universes are still being built.  ``workers=0`` runs
+    everything in this process.
+    """
+    started = time.perf_counter()
+    instruments = _instruments(session)
+    dates = _dates(session, config)
+    ids = np.array([inst.id for inst in instruments], dtype=np.int64)
+    shares = _shares(session, instruments)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if not dates:
+        return BacktestResult(
+            periods=(), years=0.0, seconds=time.perf_counter() - started
+        )
+    states = point_in_time_values(session, ids, dates)
+
+    pool = None
+    if workers:
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(instruments, shares),
+        )
+    else:
+        _init_worker(instruments, shares)
+    try:
+        futures: List[Future[List[PeriodResult]]] = []
+        previous = next(states)
+        for start, end, values in zip(dates, dates[1:], states):
+            args = (previous, values[_PRICE], start, end, config.horizon_years)
+            if pool is None:
+                future: Future[List[PeriodResult]] = Future()
+                future.set_result(_evaluate(*args))
+            else:
+                future = pool.submit(_evaluate, *args)
+            futures.append(future)
+            previous = values
+        periods = [period for future in futures for period in future.result()]
+    finally:
+        states.close()
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    years = (dates[-1] - dates[0]).days / 365.25 if len(dates) > 1 else 0.0
+    result = BacktestResult(
+        periods=tuple(periods), years=years, seconds=time.perf_counter() - started
+    )
+    logger.info(
+        "backtest finished",
+        extra={
+            "rebalances": max(len(dates) - 1, 0),
+            "instruments": len(instruments),
+            "workers": workers,
+            "duration_ms": round(result.seconds * 1000, 2),
+        },
+    )
+    return result
+
+
+def run_backtest_reference(
+    session: Session, config: BacktestConfig = BacktestConfig()
+) -> BacktestResult:
+    """:func:`run_backtest` querying each date's universe, in this process."""
+    started = time.perf_counter()
+    instruments = _instruments(session)
+    dates = _dates(session, config)
+    ids = np.array([inst.id for inst in instruments], dtype=np.int64)
+    shares = _shares(session, instruments)
+    periods: List[PeriodResult] = []
+    for start, end in zip(dates, dates[1:]):
+        values = point_in_time_values_reference(session, ids, start)
+        next_prices = point_in_time_values_reference(session, ids, end)[_PRICE]
+        periods += evaluate_period(
+            instruments,
+            shares,
+            values,
+            next_prices,
+            start,
+            end,
+            config.horizon_years,
+        )
+    years = (dates[-1] - dates[0]).days / 365.25 if len(dates) > 1 else 0.0
+    return BacktestResult(
+        periods=tuple(periods), years=years, seconds=time.perf_counter() - started
+    )
@@ -1,7 +1,24 @@
 from __future__ import annotations
 
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, List
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+
+@dataclass(frozen=True)
+class FetchResult:
+    """Outcome of fetching metrics for a single symbol."""
+
+    symbol: str
+    metrics: Optional[Dict[str, object]]
+    error: Optional[str] = None
+    duration_ms: float = 0.0
+    attempts: int = 1
+
+    @property
+    def ok(self) -> bool:
+        return self.metrics is not None
 
 
 class Ingestor(ABC):
@@ -11,3 +28,23 @@ class Ingestor(ABC):
     def fetch_metrics(self, symbols: List[str]) -> Dict[str, Dict[str, object]]:
         """Fetch metrics for the provided symbols."""
         raise NotImplementedError
+
+    def fetch(self, symbols: List[str]) -> List[FetchResult]:
+        """Fetch metrics and report a per-symbol outcome, in input order.
+
+        The default implementation wraps :meth:`fetch_metrics` and attributes
+        the total duration evenly; ingestors with per-symbol visibility should
+        override it.
+        """
+        start = time.perf_counter()
+        data = self.fetch_metrics(symbols)
+        duration_ms = (time.perf_counter() - start) * 1000 / max(len(symbols), 1)
+        return [
+            FetchResult(
+                symbol=symbol,
+                metrics=data.get(symbol),
+                error=None if symbol in data else "no data",
+                duration_ms=duration_ms,
+            )
+            for symbol in symbols
+        ]
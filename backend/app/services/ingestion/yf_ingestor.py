@@ -1,31 +1,193 @@
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
 
 import yfinance as yf
 
-from .base import Ingestor
+from app.core.config import Settings
+
+from .base import FetchResult, Ingestor
+
+logger = logging.getLogger("app")
+
+T = TypeVar("T")
+PricePoint = Tuple[date, float]
+
+
+def _run_with_timeout(fn: Callable[[], T], timeout: Optional[float]) -> T:
+    """Run ``fn`` and raise :class:`TimeoutError` if it exceeds ``timeout``.
+
+    The call runs in a daemon thread which is abandoned on timeout; Python
+    threads cannot be interrupted, so the late result is simply discarded.
+    """
+    if timeout is None:
+        return fn()
+
+    outcome: Dict[str, Any] = {}
+
+    def target() -> None:
+        try:
+            outcome["value"] = fn()
+        except BaseException as exc:  # noqa: BLE001 - re-raised in caller
+            outcome["error"] = exc
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise TimeoutError(f"timed out after {timeout}s")
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["value"]  # type: ignore[no-any-return]
 
 
 class YFIngestor(Ingestor):
-    """yfinance-backed ingestor for EOD price and basic metrics."""
+    """yfinance-backed ingestor for EOD price and basic metrics.
+
+    By default symbols are fetched one at a time.  ``concurrency`` fans the
+    per-symbol work out over a bounded thread pool, ``timeout_seconds`` bounds
+    each attempt, failed attempts are retried ``max_retries`` times with
+    exponential backoff, and a positive ``batch_size`` downloads prices for
+    that many symbols per ``yf.download`` call instead of one
+    ``Ticker.history`` call per symbol.  ``ticker_factory``, ``download`` and
+    ``sleep`` can be replaced to run offline.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 1,
+        timeout_seconds: Optional[float] = None,
+        max_retries: int = 0,
+        backoff_seconds: float = 0.5,
+        batch_size: int = 0,
+        ticker_factory: Callable[[str], Any] = yf.Ticker,
+        download: Callable[..., Any] = yf.download,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.concurrency = max(1, concurrency)
+        self.timeout_seconds = timeout_seconds
+        self.max_retries = max(0, max_retries)
+        self.backoff_seconds = backoff_seconds
+        self.batch_size = batch_size
+        self._ticker_factory = ticker_factory
+        self._download = download
+        self._sleep = sleep
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "YFIngestor":
+        return cls(
+            concurrency=settings.INGEST_CONCURRENCY,
+            timeout_seconds=settings.INGEST_TIMEOUT_SECONDS,
+            max_retries=settings.INGEST_MAX_RETRIES,
+            backoff_seconds=settings.INGEST_BACKOFF_SECONDS,
+            batch_size=settings.INGEST_BATCH_SIZE,
+        )
 
     def fetch_metrics(self, symbols: List[str]) -> Dict[str, Dict[str, object]]:
-        results: Dict[str, Dict[str, object]] = {}
-        for symbol in symbols:
-            ticker = yf.Ticker(symbol)
+        return {r.symbol: r.metrics for r in self.fetch(symbols) if r.metrics}
+
+    def fetch(self, symbols: List[str]) -> List[FetchResult]:
+        prices = self._download_prices(symbols) if self.batch_size > 0 else {}
+        if self.concurrency == 1 or len(symbols) <= 1:
+            return [self._fetch_with_retries(s, prices.get(s)) for s in symbols]
+        with ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="yf-ingest"
+        ) as pool:
+            return list(
+                pool.map(lambda s: self._fetch_with_retries(s, prices.get(s)), symbols)
+            )
+
+    def _fetch_with_retries(
+        self, symbol: str, price: Optional[PricePoint]
+    ) -> FetchResult:
+        start = time.perf_counter()
+        error: Optional[str] = None
+        attempts = 0
+        for attempt in range(self.max_retries + 1):
+            attempts = attempt + 1
+            if attempt:
+                self._sleep(self.backoff_seconds * 2 ** (attempt - 1))
+            try:
+                metrics = _run_with_timeout(
+                    lambda: self._fetch_symbol(symbol, price), self.timeout_seconds
+                )
+            except Exception as exc:  # noqa: BLE001 - any provider failure
+                error = f"{type(exc).__name__}: {exc}"
+                logger.warning(
+                    "fetch failed for %s (attempt %d): %s", symbol, attempts, error
+                )
+                continue
+            if metrics is None:
+                # No price data is not transient; retrying will not help.
+                error = "no data"
+                break
+            return FetchResult(
+                symbol=symbol,
+                metrics=metrics,
+                duration_ms=(time.perf_counter() - start) * 1000,
+                attempts=attempts,
+            )
+        return FetchResult(
+            symbol=symbol,
+            metrics=None,
+            error=error,
+            duration_ms=(time.perf_counter() - start) * 1000,
+            attempts=attempts,
+        )
+
+    def _fetch_symbol(
+        self, symbol: str, price: Optional[PricePoint]
+    ) -> Optional[Dict[str, object]]:
+        ticker = self._ticker_factory(symbol)
+        if price is None:
             hist = ticker.history(period="1d")
             if hist.empty:
+                return None
+            price = (hist.index[-1].date(), float(hist["Close"].iloc[-1]))
+        as_of_date, close = price
+        info: Dict[str, Optional[float]] = getattr(ticker, "info", {}) or {}
+        pe = info.get("trailingPE")
+        div_yield = info.get("dividendYield")
+        return {
+            "as_of_date": as_of_date,
+            "price": close,
+            "pe": float(pe) if pe is not None else None,
+            "dividend_yield": float(div_yield) if div_yield is not None else None,
+        }
+
+    def _download_prices(self, symbols: List[str]) -> Dict[str, PricePoint]:
+        """Fetch the latest close for ``symbols`` with batched downloads.
+
+        Symbols missing from a batch (or every symbol of a failed batch) are
+        left out so they fall back to a per-symbol ``history`` call.
+        """
+        prices: Dict[str, PricePoint] = {}
+        for i in range(0, len(symbols), self.batch_size):
+            batch = symbols[i : i + self.batch_size]
+            try:
+                frame = self._download(
+                    batch,
+                    period="5d",
+                    group_by="ticker",
+                    threads=False,
+                    progress=False,
+                    auto_adjust=False,
+                )
+            except Exception:  # noqa: BLE001 - fall back to per-symbol calls
+                logger.warning("batch download failed for %d symbols", len(batch))
+                continue
+            if frame is None or frame.empty:
                 continue
-            price = float(hist["Close"].iloc[-1])
-            as_of_date = hist.index[-1].date()
-            info: Dict[str, Optional[float]] = getattr(ticker, "info", {}) or {}
-            pe = info.get("trailingPE")
-            div_yield = info.get("dividendYield")
-            results[symbol] = {
-                "as_of_date": as_of_date,
-                "price": price,
-                "pe": float(pe) if pe is not None else None,
-                "dividend_yield": float(div_yield) if div_yield is not None else None,
-            }
-        return results
+            for symbol in batch:
+                if symbol not in frame.columns.get_level_values(0):
+                    continue
+                closes = frame[symbol]["Close"].dropna()
+                if closes.empty:
+                    continue
+                prices[symbol] = (closes.index[-1].date(), float(closes.iloc[-1]))
+        return prices
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from app.core.cache import LRUCache
+from app.core.config import Settings, get_settings
+from app.services.nlp.base import Intent, IntentInterpreter
+from app.services.nlp.cache import CachingInterpreter, IntentStore
+from app.services.nlp.fallback import FallbackInterpreter
+from app.services.nlp.llm_interpreter import LLMInterpreter
+from app.services.nlp.mock_interpreter import MockInterpreter
+
+_settings = get_settings()
+interpret_cache: LRUCache[str, Intent] = LRUCache(
+    maxsize=_settings.INTERPRET_CACHE_SIZE,
+    ttl_seconds=_settings.INTERPRET_CACHE_TTL_SECONDS,
+)
+
+
+def build_interpreter(
+    settings: Settings, cache: LRUCache[str, Intent]
+) -> IntentInterpreter:
+    """Return the interpreter selected by ``settings.AI_PROVIDER``.
+
+    Provider answers are cached in ``cache``; when the provider is
+    unavailable the rule-based :class:`MockInterpreter` answers instead and
+    its result is not cached, so the next request retries the provider.
+    """
+    store = (
+        IntentStore(
+            settings.INTERPRET_CACHE_PATH,
+            ttl_seconds=settings.INTERPRET_CACHE_TTL_SECONDS,
+        )
+        if settings.INTERPRET_CACHE_PATH
+        else None
+    )
+    if settings.AI_PROVIDER == "mock":
+        return CachingInterpreter(MockInterpreter(), cache, store=store)
+    provider = LLMInterpreter.from_settings(settings)
+    return FallbackInterpreter(
+        CachingInterpreter(provider, cache, store=store), MockInterpreter()
+    )
+
+
+interpreter = build_interpreter(_settings, interpret_cache)
@@ -15,6 +15,10 @@ class Intent(TypedDict, total=False):
     goal: Goal
 
 
+class InterpreterUnavailable(Exception):
+    """Raised when an interpreter cannot produce an intent right now."""
+
+
 class IntentInterpreter(ABC):
     """Interpret natural language into a structured intent."""
 
@@ -25,3 +29,14 @@ class IntentInterpreter(ABC):
         Implementations must be deterministic and side-effect free.
         """
         raise NotImplementedError
+
+    async def interpret_async(self, text: str) -> Intent:
+        """:meth:`interpret` for callers on an event loop.
+
+        Interpreters doing I/O override it; the default runs ``interpret``
+        inline.
+        """
+        return self.interpret(text)
+
+    async def aclose(self) -> None:
+        """Release any connections held by the interpreter."""
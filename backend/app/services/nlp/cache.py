@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+from app.core.cache import LRUCache
+from app.domain.mapping import Goal, RiskProfile
+
+from .base import Intent, IntentInterpreter
+
+_DIGIT_GROUPING = re.compile(r"(?<=\d),(?=\d)")
+_DECIMAL = re.compile(r"\d+\.\d+")
+_NUMBER_UNIT = re.compile(r"(?<=\d)(?=[a-z])")
+
+
+def _trim_decimal(match: re.Match[str]) -> str:
+    return match.group(0).rstrip("0").rstrip(".")
+
+
+def normalize_prompt(text: str) -> str:
+    """Return the canonical form of ``text`` used as a cache key.
+
+    Text is lowercased, digit grouping commas are dropped (``"5,00,000"``),
+    redundant decimal zeros are trimmed (``"5.50"`` becomes ``"5.5"``), a
+    number is separated from a directly following unit (``"10k"`` becomes
+    ``"10 k"``) and runs of whitespace collapse to a single space.
+    """
+    text = _DIGIT_GROUPING.sub("", text.lower())
+    text = _DECIMAL.sub(_trim_decimal, text)
+    text = _NUMBER_UNIT.sub(" ", text)
+    return " ".join(text.split())
+
+
+def _dump_intent(intent: Intent) -> str:
+    return json.dumps({k: getattr(v, "value", v) for k, v in intent.items()})
+
+
+def _load_intent(payload: str) -> Intent:
+    intent: Intent = json.loads(payload)
+    if "risk_profile" in intent:
+        intent["risk_profile"] = RiskProfile(intent["risk_profile"])
+    if "goal" in intent:
+        intent["goal"] = Goal(intent["goal"])
+    return intent
+
+
+class IntentStore:
+    """SQLite file holding interpreted intents across restarts.
+
+    Rows older than ``ttl_seconds`` (measured with ``clock``, wall time by
+    default) are ignored on read and purged when the file is opened.  The
+    connection is created on first use and shared by all threads.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        ttl_seconds: float | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS intents (key TEXT PRIMARY KEY, "
+                "intent TEXT NOT NULL, stored_at REAL NOT NULL)"
+            )
+            if self.ttl_seconds is not None:
+                conn.execute(
+                    "DELETE FROM intents WHERE stored_at <= ?",
+                    (self._clock() - self.ttl_seconds,),
+                )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Intent | None:
+        """Return the stored intent for ``key`` unless missing or expired."""
+        with self._lock:
+            row = (
+                self._connection()
+                .execute("SELECT intent, stored_at FROM intents WHERE key = ?", (key,))
+                .fetchone()
+            )
+        if row is None:
+            return None
+        payload, stored_at = row
+        age = self._clock() - stored_at
+        if self.ttl_seconds is not None and age >= self.ttl_seconds:
+            return None
+        return _load_intent(payload)
+
+    def set(self, key: str, intent: Intent) -> None:
+        """Store ``intent`` under ``key``, replacing any previous row."""
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO intents (key, intent, stored_at) "
+                "VALUES (?, ?, ?)",
+                (key, _dump_intent(intent), self._clock()),
+            )
+            conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = None
+
+
+class CachingInterpreter(IntentInterpreter):
+    """Memoize another :class:`IntentInterpreter` on normalized prompts.
+
+    The wrapped interpreter receives the output of :func:`normalize_prompt`,
+    so prompts differing only in case, spacing or number formatting share
+    one cache entry and one result.  Results live in ``cache`` (bounded LRU
+    with TTL) and, when ``store`` is given, in an :class:`IntentStore` that
+    refills the memory cache after a restart.  Store keys are prefixed with
+    ``namespace`` (the wrapped class name by default) so interpreters
+    sharing a file do not see each other's results.
+
+    Callers receive their own copy of each intent and may modify it.  Errors
+    from the wrapped interpreter propagate and nothing is cached for them.
+    """
+
+    def __init__(
+        self,
+        interpreter: IntentInterpreter,
+        cache: LRUCache[str, Intent],
+        store: IntentStore | None = None,
+        namespace: str | None = None,
+    ) -> None:
+        self.interpreter = interpreter
+        self.cache = cache
+        self.store = store
+        self.namespace = namespace or type(interpreter).__name__
+
+    def interpret(self, text: str) -> Intent:
+        key = normalize_prompt(text)
+        intent = self._lookup(key)
+        if intent is None:
+            intent = self._remember(key, self.interpreter.interpret(key))
+        return Intent(**intent)
+
+    async def interpret_async(self, text: str) -> Intent:
+        key = normalize_prompt(text)
+        intent = self._lookup(key)
+        if intent is None:
+            intent = self._remember(key, await self.interpreter.interpret_async(key))
+        return Intent(**intent)
+
+    async def aclose(self) -> None:
+        await self.interpreter.aclose()
+
+    def _lookup(self, key: str) -> Intent | None:
+        intent = self.cache.get(key)
+        if intent is None and self.store is not None:
+            intent = self.store.get(f"{self.namespace}:{key}")
+            if intent is not None:
+                self.cache.set(key, intent)
+        return intent
+
+    def _remember(self, key: str, intent: Intent) -> Intent:
+        if self.store is not None:
+            self.store.set(f"{self.namespace}:{key}", intent)
+        self.cache.set(key, intent)
+        return intent
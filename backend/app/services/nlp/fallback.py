@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import logging
+
+from .base import Intent, IntentInterpreter, InterpreterUnavailable
+
+logger = logging.getLogger("app")
+
+
+class FallbackInterpreter(IntentInterpreter):
+    """Answer with ``fallback`` whenever ``primary`` is unavailable.
+
+    Only :class:`InterpreterUnavailable` triggers the fallback; other errors
+    propagate.  ``fallbacks`` counts how often it was used.
+    """
+
+    def __init__(self, primary: IntentInterpreter, fallback: IntentInterpreter) -> None:
+        self.primary = primary
+        self.fallback = fallback
+        self.fallbacks = 0
+
+    def interpret(self, text: str) -> Intent:
+        try:
+            return self.primary.interpret(text)
+        except InterpreterUnavailable as exc:
+            self._record(exc)
+            return self.fallback.interpret(text)
+
+    async def interpret_async(self, text: str) -> Intent:
+        try:
+            return await self.primary.interpret_async(text)
+        except InterpreterUnavailable as exc:
+            self._record(exc)
+            return await self.fallback.interpret_async(text)
+
+    async def aclose(self) -> None:
+        await self.primary.aclose()
+        await self.fallback.aclose()
+
+    def _record(self, exc: InterpreterUnavailable) -> None:
+        self.fallbacks += 1
+        logger.warning("interpreter unavailable, using fallback: %s", exc)
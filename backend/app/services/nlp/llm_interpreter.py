@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+
+import anyio.from_thread
+import httpx
+
+from app.core.config import Settings
+from app.domain.mapping import Goal, RiskProfile
+
+from .base import Intent, IntentInterpreter, InterpreterUnavailable
+
+SYSTEM_PROMPT = (
+    "Extract an investment intent from the user's message. Reply with a JSON "
+    "object with the keys budget_inr (number, rupees), horizon_years (integer), "
+    f"risk_profile (one of {', '.join(p.value for p in RiskProfile)}) and goal "
+    f"(one of {', '.join(g.value for g in Goal)}). Use null for anything the "
+    "message does not state."
+)
+
+
+def parse_completion(body: Any) -> Intent:
+    """Return the intent in a chat completions response ``body``.
+
+    Fields the model left ``null`` are omitted.  Raises
+    :class:`InterpreterUnavailable` when the response is not a valid intent.
+    """
+    try:
+        content = json.loads(body["choices"][0]["message"]["content"])
+        intent: Intent = {}
+        if content.get("budget_inr") is not None:
+            intent["budget_inr"] = float(content["budget_inr"])
+        if content.get("horizon_years") is not None:
+            intent["horizon_years"] = int(content["horizon_years"])
+        if content.get("risk_profile") is not None:
+            intent["risk_profile"] = RiskProfile(content["risk_profile"])
+        if content.get("goal") is not None:
+            intent["goal"] = Goal(content["goal"])
+    except (KeyError, IndexError, TypeError, ValueError, AttributeError) as exc:
+        raise InterpreterUnavailable(f"malformed provider response: {exc}") from exc
+    return intent
+
+
+class LLMInterpreter(IntentInterpreter):
+    """Interpret prompts through an OpenAI-compatible chat completions API.
+
+    Requests share one pooled :class:`httpx.AsyncClient`.  At most
+    ``max_concurrency`` calls are in flight; identical prompts arriving while
+    a call for them is pending wait for that call instead of issuing their
+    own.  ``timeout_seconds`` bounds the whole call including the wait for a
+    free slot.  Timeouts, HTTP errors and malformed replies raise
+    :class:`InterpreterUnavailable` (see
+    :class:`~app.services.nlp.fallback.FallbackInterpreter`).
+
+    The client, slots and pending calls belong to one event loop and are
+    recreated when used from another, like the universe store's async lock.
+    Synchronous :meth:`interpret` calls made from Starlette's threadpool run
+    on the application's loop; elsewhere they use a short-lived loop and
+    client.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str | None = None,
+        model: str = "gpt-4o-mini",
+        timeout_seconds: float = 3.0,
+        max_concurrency: int = 16,
+    ) -> None:
+        self.base_url = base_url
+        self.api_key = api_key
+        self.model = model
+        self.timeout_seconds = timeout_seconds
+        self.max_concurrency = max_concurrency
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._client: httpx.AsyncClient | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._pending: dict[str, asyncio.Future[Intent]] = {}
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "LLMInterpreter":
+        return cls(
+            base_url=settings.AI_BASE_URL,
+            api_key=settings.AI_API_KEY,
+            model=settings.AI_MODEL,
+            timeout_seconds=settings.AI_TIMEOUT_SECONDS,
+            max_concurrency=settings.AI_MAX_CONCURRENCY,
+        )
+
+    def interpret(self, text: str) -> Intent:
+        try:
+            # Raises RuntimeError unless called from an anyio worker thread,
+            # such as Starlette's threadpool, which can reach the app's loop.
+            anyio.from_thread.check_cancelled()
+        except RuntimeError:
+            return asyncio.run(self._interpret_once(text))
+        return anyio.from_thread.run(self.interpret_async, text)
+
+    async def interpret_async(self, text: str) -> Intent:
+        self._bind_loop()
+        pending = self._pending
+        call = pending.get(text)
+        if call is None:
+            call = pending[text] = asyncio.ensure_future(self._request(text))
+            call.add_done_callback(lambda _: pending.pop(text, None))
+        # Shielded so one cancelled caller does not cancel the shared call.
+        return Intent(**await asyncio.shield(call))
+
+    async def aclose(self) -> None:
+        if self._client is not None and self._loop is asyncio.get_running_loop():
+            await self._client.aclose()
+        self._loop = self._client = self._slots = None
+        self._pending = {}
+
+    async def _interpret_once(self, text: str) -> Intent:
+        try:
+            return await self.interpret_async(text)
+        finally:
+            await self.aclose()
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=headers,
+            timeout=self.timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency,
+            ),
+        )
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._pending = {}
+        self._loop = loop
+
+    async def _request(self, text: str) -> Intent:
+        assert self._client is not None and self._slots is not None
+        payload = {
+            "model": self.model,
+            "temperature": 0,
+            "response_format": {"type": "json_object"},
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": text},
+            ],
+        }
+        try:
+            async with asyncio.timeout(self.timeout_seconds):
+                async with self._slots:
+                    response = await self._client.post(
+                        "/chat/completions", json=payload
+                    )
+                    response.raise_for_status()
+        except TimeoutError as exc:
+            raise InterpreterUnavailable(
+                f"no reply within {self.timeout_seconds}s"
+            ) from exc
+        except httpx.HTTPError as exc:
+            raise InterpreterUnavailable(str(exc) or type(exc).__name__) from exc
+        try:
+            body = response.json()
+        except ValueError as exc:
+            raise InterpreterUnavailable("provider reply is not JSON") from exc
+        return parse_completion(body)
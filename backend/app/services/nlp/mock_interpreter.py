@@ -1,14 +1,35 @@
 from __future__ import annotations
 
 import re
+from typing import Iterable, List
 
 from app.domain.mapping import Goal, RiskProfile
 
 from .base import Intent, IntentInterpreter
 
+_HORIZON = re.compile(r"(\d+)\s*(?:years|year|yrs|yr)")
+_BUDGET = re.compile(
+    r"(?:invest|with|budget)\s*(\d+(?:\.\d+)?)\s*(k|lakh|lac|crore|cr)?"
+)
+_UNITS = {
+    None: 1.0,
+    "k": 1_000,
+    "lakh": 100_000,
+    "lac": 100_000,
+    "crore": 10_000_000,
+    "cr": 10_000_000,
+}
+
 
 class MockInterpreter(IntentInterpreter):
-    """Deterministic rule-based intent interpreter used for tests."""
+    """Deterministic rule-based intent interpreter used for tests.
+
+    Keywords are found with substring checks and the horizon and budget with
+    precompiled patterns.  A single combined pattern was measured slower:
+    CPython's ``re`` cannot beat its C substring search, and keeping
+    overlapping tokens such as ``"invest 5 years"`` exact needs a lookahead
+    at every position.
+    """
 
     def interpret(self, text: str) -> Intent:
         lowered = text.lower()
@@ -19,36 +40,86 @@ class MockInterpreter(IntentInterpreter):
             "goal": Goal.GROWTH,
         }
 
+        # "balanced"/"moderate" and "growth" select the defaults.
         if "safe" in lowered or "conservative" in lowered:
             intent["risk_profile"] = RiskProfile.SAFE
         elif "aggressive" in lowered or "high risk" in lowered:
             intent["risk_profile"] = RiskProfile.AGGRESSIVE
-        elif "balanced" in lowered or "moderate" in lowered:
-            intent["risk_profile"] = RiskProfile.BALANCED
-
         if "income" in lowered or "dividend" in lowered:
             intent["goal"] = Goal.INCOME
-        elif "growth" in lowered:
-            intent["goal"] = Goal.GROWTH
 
-        horizon_match = re.search(r"(\d+)\s*(?:years|year|yrs|yr)", lowered)
+        horizon_match = _HORIZON.search(lowered)
         if horizon_match:
             intent["horizon_years"] = int(horizon_match.group(1))
 
-        budget_match = re.search(
-            r"(?:invest|with|budget)\s*(\d+(?:\.\d+)?)\s*(k|lakh|lac|crore|cr)?",
-            lowered,
-        )
+        budget_match = _BUDGET.search(lowered)
         if budget_match:
-            num = float(budget_match.group(1))
-            unit = budget_match.group(2)
-            multiplier = 1.0
-            if unit == "k":
-                multiplier = 1_000
-            elif unit in {"lakh", "lac"}:
-                multiplier = 100_000
-            elif unit in {"crore", "cr"}:
-                multiplier = 10_000_000
-            intent["budget_inr"] = num * multiplier
+            amount = float(budget_match.group(1))
+            intent["budget_inr"] = amount * _UNITS[budget_match.group(2)]
 
         return intent
+
+    def interpret_many(self, texts: Iterable[str]) -> List[Intent]:
+        """Interpret ``texts`` in order, parsing each distinct text once.
+
+        Repeated texts receive separate copies of the same intent.
+        """
+        parsed: dict[str, Intent] = {}
+        results: List[Intent] = []
+        for text in texts:
+            intent = parsed.get(text)
+            if intent is None:
+                intent = parsed[text] = self.interpret(text)
+            results.append(Intent(**intent))
+        return results
+
+
+def interpret_reference(text: str) -> Intent:
+    """Original substring-and-regex rules behind :class:`MockInterpreter`.
+
+    Looks its patterns up by string on every call.
+    :meth:`MockInterpreter.interpret` and
+    :meth:`~MockInterpreter.interpret_many`, which use the precompiled
+    patterns, must return the same intents.
+    """
+    lowered = text.lower()
+    intent: Intent = {
+        "budget_inr": 0.0,
+        "horizon_years": 5,
+        "risk_profile": RiskProfile.BALANCED,
+        "goal": Goal.GROWTH,
+    }
+
+    if "safe" in lowered or "conservative" in lowered:
+        intent["risk_profile"] = RiskProfile.SAFE
+    elif "aggressive" in lowered or "high risk" in lowered:
+        intent["risk_profile"] = RiskProfile.AGGRESSIVE
+    elif "balanced" in lowered or "moderate" in lowered:
+        intent["risk_profile"] = RiskProfile.BALANCED
+
+    if "income" in lowered or "dividend" in lowered:
+        intent["goal"] = Goal.INCOME
+    elif "growth" in lowered:
+        intent["goal"] = Goal.GROWTH
+
+    horizon_match = re.search(r"(\d+)\s*(?:years|year|yrs|yr)", lowered)
+    if horizon_match:
+        intent["horizon_years"] = int(horizon_match.group(1))
+
+    budget_match = re.search(
+        r"(?:invest|with|budget)\s*(\d+(?:\.\d+)?)\s*(k|lakh|lac|crore|cr)?",
+        lowered,
+    )
+    if budget_match:
+        num = float(budget_match.group(1))
+        unit = budget_match.group(2)
+        multiplier = 1.0
+        if unit == "k":
+            multiplier = 1_000
+        elif unit in {"lakh", "lac"}:
+            multiplier = 100_000
+        elif unit in {"crore", "cr"}:
+            multiplier = 10_000_000
+        intent["budget_inr"] = num * multiplier
+
+    return intent
@@ -0,0 +1,135 @@
+"""Local stand-in for an OpenAI-compatible chat completions API.
+
+Usage: ``python -m app.services.nlp.stub_server [PORT [LATENCY_SECONDS]]``
+
+Replies are produced by :class:`MockInterpreter` after ``latency`` seconds,
+so ``AI_PROVIDER=openai`` can be exercised in tests, benchmarks and local
+development without network access or an API key.
+"""
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from .mock_interpreter import MockInterpreter
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        # Clients that time out hang up mid-reply; that is expected here.
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class StubProvider:
+    """Serve ``POST /v1/chat/completions`` on ``127.0.0.1`` in a thread.
+
+    ``latency`` may be changed while running.  ``requests`` counts handled
+    calls and ``max_in_flight`` records the highest number served at once.
+    """
+
+    def __init__(self, port: int = 0, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._interpreter = MockInterpreter()
+        self._server = _Server(("127.0.0.1", port), self._handler())
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}/v1"
+
+    def start(self) -> "StubProvider":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubProvider":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def completion(self, body: dict[str, Any]) -> dict[str, Any]:
+        """Return the chat completion answering request ``body``."""
+        prompt = body["messages"][-1]["content"]
+        intent = self._interpreter.interpret(prompt)
+        content = json.dumps({k: getattr(v, "value", v) for k, v in intent.items()})
+        return {
+            "object": "chat.completion",
+            "model": body.get("model"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+        }
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self) -> None:  # noqa: N802
+                length = int(self.headers.get("Content-Length", 0))
+                raw = self.rfile.read(length)
+                if not raw:  # the client hung up
+                    self.close_connection = True
+                    return
+                body = json.loads(raw)
+                with stub._lock:
+                    stub.requests += 1
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                try:
+                    time.sleep(stub.latency)
+                    if self.path != "/v1/chat/completions":
+                        self.send_error(404)
+                        return
+                    payload = json.dumps(stub.completion(body)).encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
+
+
+def main(argv: list[str] | None = None) -> None:
+    argv = argv or []
+    port = int(argv[0]) if argv else 8001
+    latency = float(argv[1]) if len(argv) > 1 else 0.2
+    stub = StubProvider(port, latency)
+    print(f"serving {stub.base_url} with {latency}s latency")
+    try:
+        stub._server.serve_forever()
+    except KeyboardInterrupt:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
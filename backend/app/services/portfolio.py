@@ -1,16 +1,148 @@
 from __future__ import annotations
 
-from typing import Dict, List
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterator, List, Sequence
 
+import numpy as np
+import numpy.typing as npt
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.cache import LRUCache
+from app.core.config import get_settings
 from app.domain.mapping import Goal, RiskProfile, map_intent_to_filters
-from app.domain.filtering import filter_candidates
-from app.domain.allocation import allocate
+from app.domain.filtering import screen_candidates, screen_candidates_async
+from app.domain.allocation import (
+    SharePlan,
+    TargetWeight,
+    allocate_shares,
+    apply_budget,
+    target_weights,
+)
 from app.domain.explain import explain_instrument, explain_portfolio
+from app.domain.types import FilterParams, WeightingScheme
+from app.domain.universe import Candidate, UniverseSnapshot
 from app.core.constants import DISCLAIMER
-from app.repositories.metrics import MetricRepository
-from app.repositories.instruments import InstrumentRepository
+from app.db.models import Instrument, Metric
+from app.repositories.ingestion_runs import (
+    AsyncIngestionRunRepository,
+    IngestionRunRepository,
+)
+
+FloatArray = npt.NDArray[np.float64]
+
+_settings = get_settings()
+recommendation_cache: LRUCache[Hashable, dict[str, Any]] = LRUCache(
+    maxsize=_settings.RECOMMEND_CACHE_SIZE,
+    ttl_seconds=_settings.RECOMMEND_CACHE_TTL_SECONDS,
+)
+
+
+@dataclass(frozen=True)
+class PortfolioSelection:
+    """Budget-independent part of a recommendation for one ``FilterParams``.
+
+    ``candidates`` holds the instrument and latest metric for each target, in
+    the same order as ``targets``.
+    """
+
+    targets: tuple[TargetWeight, ...]
+    candidates: tuple[Candidate, ...]
+
+
+@dataclass(frozen=True)
+class PortfolioIntent:
+    """The normalized inputs of one recommendation."""
+
+    budget_inr: float
+    horizon_years: int
+    risk_profile: RiskProfile
+    goal: Goal
+
+    @property
+    def filters(self) -> FilterParams:
+        return map_intent_to_filters(
+            self.risk_profile, self.goal, self.horizon_years
+        )
+
+
+selection_cache: LRUCache[Hashable, PortfolioSelection] = LRUCache(
+    maxsize=_settings.SELECTION_CACHE_SIZE,
+    ttl_seconds=_settings.RECOMMEND_CACHE_TTL_SECONDS,
+)
+
+
+def select_portfolio(
+    session: Session,
+    filters: FilterParams,
+    snapshot: UniverseSnapshot | None = None,
+) -> PortfolioSelection:
+    """Screen candidates and choose target weights for ``filters``.
+
+    :attr:`~app.domain.types.WeightingScheme.SCORE` weights by the composite
+    factor score under ``filters.factor_weights`` and needs ``snapshot``.
+    """
+    candidates = screen_candidates(session, filters, snapshot)
+    return _selection(candidates, filters, _scores(filters, snapshot))
+
+
+async def select_portfolio_async(
+    session: AsyncSession,
+    filters: FilterParams,
+    snapshot: UniverseSnapshot | None = None,
+) -> PortfolioSelection:
+    """:func:`select_portfolio` for an :class:`AsyncSession`."""
+    candidates = await screen_candidates_async(session, filters, snapshot)
+    return _selection(candidates, filters, _scores(filters, snapshot))
+
+
+def _scores(
+    filters: FilterParams, snapshot: UniverseSnapshot | None
+) -> FloatArray | None:
+    """Composite scores of the screened candidates when weighting by score."""
+    if filters.weighting is not WeightingScheme.SCORE:
+        return None
+    if filters.factor_weights is None or snapshot is None:
+        raise ValueError("score weighting needs factor_weights and a snapshot")
+    return snapshot.score(filters.factor_weights)[snapshot.select(filters)]
+
+
+def _selection(
+    candidates: List[Candidate],
+    filters: FilterParams,
+    score: FloatArray | None = None,
+) -> PortfolioSelection:
+    volatility = None
+    if filters.weighting is WeightingScheme.INVERSE_VOLATILITY:
+        volatility = [c.metric.volatility if c.metric else None for c in candidates]
+    targets = target_weights(
+        [c.instrument for c in candidates],
+        filters,
+        volatility=volatility,
+        score=None if score is None else score.tolist(),
+    )
+    by_symbol = {c.instrument.symbol: c for c in candidates}
+    return PortfolioSelection(
+        targets=tuple(targets),
+        candidates=tuple(by_symbol[t.symbol] for t in targets),
+    )
+
+
+def data_version(session: Session, snapshot: UniverseSnapshot | None) -> int | None:
+    """Return the ingestion run id the current data corresponds to."""
+    if snapshot is not None:
+        return snapshot.data_version
+    return IngestionRunRepository(session).latest_id()
+
+
+async def data_version_async(
+    session: AsyncSession, snapshot: UniverseSnapshot | None
+) -> int | None:
+    """:func:`data_version` for an :class:`AsyncSession`."""
+    if snapshot is not None:
+        return snapshot.data_version
+    return await AsyncIngestionRunRepository(session).latest_id()
 
 
 def recommend_portfolio(
@@ -19,61 +151,123 @@ def recommend_portfolio(
     horizon_years: int,
     risk_profile: RiskProfile,
     goal: Goal,
+    snapshot: UniverseSnapshot | None = None,
+    selection_cache: LRUCache[Hashable, PortfolioSelection] | None = None,
 ) -> dict:
     """Produce a mini-portfolio for the given parameters.
 
     The function orchestrates mapping of user intent to filter thresholds,
     candidate filtering, budget allocation, and generation of natural
     language explanations.  All database interactions are read-only via the
-    supplied ``session``.
+    supplied ``session``; candidates are screened against ``snapshot`` instead
+    of the database when one is given.  Instruments and metrics loaded during
+    screening are reused for the payload, so the number of queries does not
+    grow with the portfolio size.
+
+    Only the rupee amounts depend on ``budget_inr``; with a
+    ``selection_cache`` the screening and weighting are reused across budgets
+    for the same filters and data version.
     """
 
     filters = map_intent_to_filters(risk_profile, goal, horizon_years)
-    candidates = filter_candidates(session, filters)
-    allocations = allocate(candidates, budget_inr, filters)
+    selection = cached_selection(session, filters, snapshot, selection_cache)
+    return build_recommendation(
+        selection, budget_inr, horizon_years, risk_profile, goal
+    )
 
-    inst_repo = InstrumentRepository(session)
-    metric_repo = MetricRepository(session)
+
+async def recommend_portfolio_async(
+    session: AsyncSession,
+    budget_inr: float,
+    horizon_years: int,
+    risk_profile: RiskProfile,
+    goal: Goal,
+    snapshot: UniverseSnapshot | None = None,
+    selection_cache: LRUCache[Hashable, PortfolioSelection] | None = None,
+) -> dict[str, Any]:
+    """:func:`recommend_portfolio` for an :class:`AsyncSession`."""
+
+    filters = map_intent_to_filters(risk_profile, goal, horizon_years)
+    selection = await cached_selection_async(
+        session, filters, snapshot, selection_cache
+    )
+    return build_recommendation(
+        selection, budget_inr, horizon_years, risk_profile, goal
+    )
+
+
+def cached_selection(
+    session: Session,
+    filters: FilterParams,
+    snapshot: UniverseSnapshot | None = None,
+    selection_cache: LRUCache[Hashable, PortfolioSelection] | None = None,
+) -> PortfolioSelection:
+    """Return :func:`select_portfolio`, memoized per data version if cached."""
+    if selection_cache is None:
+        return select_portfolio(session, filters, snapshot)
+    return selection_cache.get_or_set(
+        (filters, data_version(session, snapshot)),
+        lambda: select_portfolio(session, filters, snapshot),
+    )
+
+
+async def cached_selection_async(
+    session: AsyncSession,
+    filters: FilterParams,
+    snapshot: UniverseSnapshot | None = None,
+    selection_cache: LRUCache[Hashable, PortfolioSelection] | None = None,
+) -> PortfolioSelection:
+    """:func:`cached_selection` for an :class:`AsyncSession`."""
+    if selection_cache is None:
+        return await select_portfolio_async(session, filters, snapshot)
+    key = (filters, await data_version_async(session, snapshot))
+    selection = selection_cache.get(key)
+    if selection is None:
+        selection = await select_portfolio_async(session, filters, snapshot)
+        selection_cache.set(key, selection)
+    return selection
+
+
+def build_recommendation(
+    selection: PortfolioSelection,
+    budget_inr: float,
+    horizon_years: int,
+    risk_profile: RiskProfile,
+    goal: Goal,
+) -> dict[str, Any]:
+    """Apply ``budget_inr`` to ``selection`` and render the response payload."""
+    rendered = render_selection(selection, horizon_years, risk_profile, goal)
+    return with_budget(rendered, selection, budget_inr)
+
+
+def render_selection(
+    selection: PortfolioSelection,
+    horizon_years: int,
+    risk_profile: RiskProfile,
+    goal: Goal,
+) -> dict[str, Any]:
+    """Render the budget-independent part of a recommendation payload.
+
+    Instrument records and explanations do not depend on the budget, so the
+    result can be shared by every budget applied via :func:`with_budget`.
+    """
 
     instruments_payload: List[Dict] = []
     instrument_explanations: Dict[str, str] = {}
 
-    for alloc in allocations:
-        inst = inst_repo.get_by_symbol(alloc.symbol)
-        if inst is None:
-            continue
+    for target, (inst, metric) in zip(selection.targets, selection.candidates):
 
-        metric = metric_repo.latest_by_instrument(alloc.symbol)
-
-        instruments_payload.append(
-            {
-                "symbol": inst.symbol,
-                "name": inst.name,
-                "instrument_type": inst.instrument_type.value,
-                "sector": inst.sector,
-                "metric": {
-                    "as_of_date": metric.as_of_date.isoformat() if metric else None,
-                    "price": metric.price if metric else None,
-                    "pe": metric.pe if metric else None,
-                    "roe": metric.roe if metric else None,
-                    "dividend_yield": metric.dividend_yield if metric else None,
-                    "debt_to_equity": metric.debt_to_equity if metric else None,
-                    "revenue_growth": metric.revenue_growth if metric else None,
-                    "earnings_growth": metric.earnings_growth if metric else None,
-                },
-            }
-        )
+        instruments_payload.append(instrument_record(inst, metric))
 
-        instrument_explanations[alloc.symbol] = explain_instrument(
+        instrument_explanations[target.symbol] = explain_instrument(
             inst, metric, risk_profile, goal
         )
 
     portfolio_text = explain_portfolio(
-        allocations, risk_profile, goal, horizon_years
+        selection.targets, risk_profile, goal, horizon_years
     )
 
     return {
-        "allocations": [a.__dict__ for a in allocations],
         "instruments": instruments_payload,
         "explanations": {
             "portfolio": portfolio_text,
@@ -82,3 +276,285 @@ def recommend_portfolio(
         "disclaimer": DISCLAIMER,
 
     }
+
+
+def instrument_record(inst: Instrument, metric: Metric | None) -> Dict[str, Any]:
+    """Return the response payload for one instrument and its latest metric."""
+    return {
+        "symbol": inst.symbol,
+        "name": inst.name,
+        "instrument_type": inst.instrument_type.value,
+        "sector": inst.sector,
+        "metric": {
+            "as_of_date": metric.as_of_date.isoformat() if metric else None,
+            "price": metric.price if metric else None,
+            "pe": metric.pe if metric else None,
+            "roe": metric.roe if metric else None,
+            "dividend_yield": metric.dividend_yield if metric else None,
+            "debt_to_equity": metric.debt_to_equity if metric else None,
+            "revenue_growth": metric.revenue_growth if metric else None,
+            "earnings_growth": metric.earnings_growth if metric else None,
+        },
+    }
+
+
+def with_budget(
+    rendered: dict[str, Any], selection: PortfolioSelection, budget_inr: float
+) -> dict[str, Any]:
+    """Combine a :func:`render_selection` payload with allocations for a budget."""
+    allocations, plan = budget_allocations(selection, budget_inr)
+    return {
+        "allocations": allocations,
+        "residual_cash_inr": plan.residual_cash_inr,
+        **rendered,
+    }
+
+
+def budget_allocations(
+    selection: PortfolioSelection, budget_inr: float
+) -> tuple[List[dict[str, Any]], SharePlan]:
+    """Return allocation records for ``budget_inr`` and the whole-share plan.
+
+    Each record has the target ``percent`` and ``amount_inr`` plus the
+    ``shares`` bought at the latest metric price and their ``cost_inr`` (see
+    :func:`~app.domain.allocation.allocate_shares`).
+    """
+    allocations = apply_budget(selection.targets, budget_inr)
+    prices = [m.price if m is not None else None for _, m in selection.candidates]
+    plan = allocate_shares(selection.targets, prices, budget_inr)
+    records = [
+        {**alloc.__dict__, "shares": item.shares, "cost_inr": item.cost_inr}
+        for alloc, item in zip(allocations, plan.items)
+    ]
+    return records, plan
+
+
+def cached_recommend_portfolio(
+    session: Session,
+    budget_inr: float,
+    horizon_years: int,
+    risk_profile: RiskProfile,
+    goal: Goal,
+    snapshot: UniverseSnapshot | None = None,
+    cache: LRUCache[Hashable, dict[str, Any]] = recommendation_cache,
+) -> dict[str, Any]:
+    """Return :func:`recommend_portfolio` results memoized in ``cache``.
+
+    Entries are keyed on the normalized intent plus the data version (the
+    latest ingestion run id, taken from ``snapshot`` when available), so a new
+    ingestion run invalidates earlier portfolios.  Cached results are shared
+    between callers and must not be mutated.  Misses still reuse the
+    budget-independent selection from :data:`selection_cache`.
+    """
+
+    def compute() -> dict[str, Any]:
+        return recommend_portfolio(
+            session,
+            budget_inr,
+            horizon_years,
+            risk_profile,
+            goal,
+            snapshot,
+            selection_cache=selection_cache,
+        )
+
+    if cache.maxsize <= 0:
+        return compute()
+
+    key = _recommendation_key(
+        budget_inr, horizon_years, risk_profile, goal, data_version(session, snapshot)
+    )
+    return cache.get_or_set(key, compute)
+
+
+async def cached_recommend_portfolio_async(
+    session: AsyncSession,
+    budget_inr: float,
+    horizon_years: int,
+    risk_profile: RiskProfile,
+    goal: Goal,
+    snapshot: UniverseSnapshot | None = None,
+    cache: LRUCache[Hashable, dict[str, Any]] = recommendation_cache,
+) -> dict[str, Any]:
+    """:func:`cached_recommend_portfolio` for an :class:`AsyncSession`."""
+
+    async def compute() -> dict[str, Any]:
+        return await recommend_portfolio_async(
+            session,
+            budget_inr,
+            horizon_years,
+            risk_profile,
+            goal,
+            snapshot,
+            selection_cache=selection_cache,
+        )
+
+    if cache.maxsize <= 0:
+        return await compute()
+
+    key = _recommendation_key(
+        budget_inr,
+        horizon_years,
+        risk_profile,
+        goal,
+        await data_version_async(session, snapshot),
+    )
+    result = cache.get(key)
+    if result is None:
+        result = await compute()
+        cache.set(key, result)
+    return result
+
+
+def recommend_portfolios(
+    session: Session,
+    intents: Sequence[PortfolioIntent],
+    snapshot: UniverseSnapshot | None = None,
+    selection_cache: LRUCache[Hashable, PortfolioSelection] | None = None,
+) -> List[dict[str, Any]]:
+    """Return one :func:`recommend_portfolio` payload per intent, in order.
+
+    Intents mapping to the same ``FilterParams`` share a single screening
+    pass against ``snapshot`` (or the database), and identical intents share
+    one payload, so the cost grows with the number of distinct profiles
+    rather than the number of intents.  Payloads may therefore be shared
+    between positions and must not be mutated.
+    """
+
+    selections = {
+        filters: cached_selection(session, filters, snapshot, selection_cache)
+        for filters in dict.fromkeys(intent.filters for intent in intents)
+    }
+    return _render_batch(intents, selections)
+
+
+async def recommend_portfolios_async(
+    session: AsyncSession,
+    intents: Sequence[PortfolioIntent],
+    snapshot: UniverseSnapshot | None = None,
+    selection_cache: LRUCache[Hashable, PortfolioSelection] | None = None,
+) -> List[dict[str, Any]]:
+    """:func:`recommend_portfolios` for an :class:`AsyncSession`."""
+
+    selections = {
+        filters: await cached_selection_async(
+            session, filters, snapshot, selection_cache
+        )
+        for filters in dict.fromkeys(intent.filters for intent in intents)
+    }
+    return _render_batch(intents, selections)
+
+
+def stream_recommendation(
+    session: Session,
+    budget_inr: float,
+    horizon_years: int,
+    risk_profile: RiskProfile,
+    goal: Goal,
+    snapshot: UniverseSnapshot | None = None,
+    selection_cache: LRUCache[Hashable, PortfolioSelection] | None = None,
+) -> Iterator[str]:
+    """Return :func:`recommend_portfolio` as lazily rendered NDJSON lines.
+
+    Screening runs before this function returns, so database errors surface
+    before the first line is sent; see :func:`ndjson_recommendation` for the
+    line format.
+    """
+    filters = map_intent_to_filters(risk_profile, goal, horizon_years)
+    selection = cached_selection(session, filters, snapshot, selection_cache)
+    return ndjson_recommendation(
+        selection, budget_inr, horizon_years, risk_profile, goal
+    )
+
+
+async def stream_recommendation_async(
+    session: AsyncSession,
+    budget_inr: float,
+    horizon_years: int,
+    risk_profile: RiskProfile,
+    goal: Goal,
+    snapshot: UniverseSnapshot | None = None,
+    selection_cache: LRUCache[Hashable, PortfolioSelection] | None = None,
+) -> Iterator[str]:
+    """:func:`stream_recommendation` for an :class:`AsyncSession`."""
+    filters = map_intent_to_filters(risk_profile, goal, horizon_years)
+    selection = await cached_selection_async(
+        session, filters, snapshot, selection_cache
+    )
+    return ndjson_recommendation(
+        selection, budget_inr, horizon_years, risk_profile, goal
+    )
+
+
+def ndjson_recommendation(
+    selection: PortfolioSelection,
+    budget_inr: float,
+    horizon_years: int,
+    risk_profile: RiskProfile,
+    goal: Goal,
+) -> Iterator[str]:
+    """Yield a recommendation as newline-delimited JSON records.
+
+    Each line is an object with a ``type`` of ``allocation``, ``instrument``,
+    ``explanation`` (one per instrument), ``portfolio`` or ``disclaimer``, in
+    that order; the ``portfolio`` record also carries ``residual_cash_inr``.
+    Records are rendered one at a time, so memory use does not grow with the
+    number of instruments.
+    """
+    allocations, plan = budget_allocations(selection, budget_inr)
+    for alloc in allocations:
+        yield _ndjson({"type": "allocation", **alloc})
+    for inst, metric in selection.candidates:
+        yield _ndjson({"type": "instrument", **instrument_record(inst, metric)})
+    for target, (inst, metric) in zip(selection.targets, selection.candidates):
+        text = explain_instrument(inst, metric, risk_profile, goal)
+        yield _ndjson({"type": "explanation", "symbol": target.symbol, "text": text})
+    text = explain_portfolio(selection.targets, risk_profile, goal, horizon_years)
+    yield _ndjson(
+        {"type": "portfolio", "text": text, "residual_cash_inr": plan.residual_cash_inr}
+    )
+    yield _ndjson({"type": "disclaimer", "text": DISCLAIMER})
+
+
+def _ndjson(record: Dict[str, Any]) -> str:
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def _render_batch(
+    intents: Sequence[PortfolioIntent],
+    selections: Dict[FilterParams, PortfolioSelection],
+) -> List[dict[str, Any]]:
+    rendered: Dict[Hashable, dict[str, Any]] = {}
+    payloads: Dict[PortfolioIntent, dict[str, Any]] = {}
+    for intent in intents:
+        if intent in payloads:
+            continue
+        filters = intent.filters
+        key = (filters, intent.horizon_years, intent.risk_profile, intent.goal)
+        if key not in rendered:
+            rendered[key] = render_selection(
+                selections[filters],
+                intent.horizon_years,
+                intent.risk_profile,
+                intent.goal,
+            )
+        payloads[intent] = with_budget(
+            rendered[key], selections[filters], intent.budget_inr
+        )
+    return [payloads[intent] for intent in intents]
+
+
+def _recommendation_key(
+    budget_inr: float,
+    horizon_years: int,
+    risk_profile: RiskProfile,
+    goal: Goal,
+    version: int | None,
+) -> Hashable:
+    return (
+        round(float(budget_inr), 2),
+        int(horizon_years),
+        RiskProfile(risk_profile),
+        Goal(goal),
+        version,
+    )
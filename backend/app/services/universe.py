@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+
+from sqlalchemy import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.domain.universe import UniverseSnapshot, build_universe_snapshot
+from app.repositories.ingestion_runs import (
+    AsyncIngestionRunRepository,
+    IngestionRunRepository,
+)
+
+logger = logging.getLogger("app")
+
+
+class UniverseStore:
+    """Hold the current :class:`UniverseSnapshot` and swap it when data changes.
+
+    The latest ingestion run id is re-checked at most every
+    ``refresh_seconds``; a new id (or a session bound to a different engine)
+    triggers a rebuild.  Readers always see either the old or the new snapshot
+    since the swap is a single attribute assignment.
+    """
+
+    def __init__(self, refresh_seconds: float = 30.0) -> None:
+        self.refresh_seconds = refresh_seconds
+        self._snapshot: UniverseSnapshot | None = None
+        self._engine: Engine | None = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._async_lock: asyncio.Lock | None = None
+        self._async_lock_loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def snapshot(self) -> UniverseSnapshot | None:
+        return self._snapshot
+
+    def get(self, session: Session) -> UniverseSnapshot:
+        """Return a snapshot that is current for ``session``'s database."""
+        snapshot = self._snapshot
+        if snapshot is not None and session.get_bind() is self._engine:
+            if time.monotonic() - self._checked_at < self.refresh_seconds:
+                return snapshot
+            version = IngestionRunRepository(session).latest_id()
+            self._checked_at = time.monotonic()
+            if version == snapshot.data_version:
+                return snapshot
+        with self._lock:
+            # Another thread may have rebuilt while we waited for the lock.
+            current = self._snapshot
+            if (
+                current is not None
+                and current is not snapshot
+                and session.get_bind() is self._engine
+            ):
+                return current
+            return self._rebuild(session)
+
+    def refresh(self, session: Session) -> UniverseSnapshot:
+        """Rebuild the snapshot from ``session`` and swap it in."""
+        with self._lock:
+            return self._rebuild(session)
+
+    async def get_async(self, session: AsyncSession) -> UniverseSnapshot:
+        """:meth:`get` for an :class:`AsyncSession`.
+
+        Rebuilds are serialized with an :class:`asyncio.Lock`; the thread lock
+        cannot be used because coroutines sharing the event loop thread would
+        deadlock on it while a rebuild awaits the database.
+        """
+        engine = session.get_bind()
+        snapshot = self._snapshot
+        if snapshot is not None and engine is self._engine:
+            if time.monotonic() - self._checked_at < self.refresh_seconds:
+                return snapshot
+            version = await AsyncIngestionRunRepository(session).latest_id()
+            self._checked_at = time.monotonic()
+            if version == snapshot.data_version:
+                return snapshot
+        async with self._loop_lock():
+            current = self._snapshot
+            if (
+                current is not None
+                and current is not snapshot
+                and engine is self._engine
+            ):
+                return current
+            return await session.run_sync(self._rebuild)
+
+    async def refresh_async(self, session: AsyncSession) -> UniverseSnapshot:
+        """:meth:`refresh` for an :class:`AsyncSession`."""
+        async with self._loop_lock():
+            return await session.run_sync(self._rebuild)
+
+    def _loop_lock(self) -> asyncio.Lock:
+        # asyncio locks are bound to one event loop; tests and CLI helpers
+        # may run several loops over the process lifetime.
+        loop = asyncio.get_running_loop()
+        if self._async_lock is None or self._async_lock_loop is not loop:
+            self._async_lock = asyncio.Lock()
+            self._async_lock_loop = loop
+        return self._async_lock
+
+    def _rebuild(self, session: Session) -> UniverseSnapshot:
+        version = IngestionRunRepository(session).latest_id()
+        started = time.perf_counter()
+        snapshot = build_universe_snapshot(session, data_version=version)
+        self._engine = session.get_bind()  # type: ignore[assignment]
+        self._checked_at = time.monotonic()
+        self._snapshot = snapshot
+        logger.info(
+            "universe snapshot built",
+            extra={
+                "instruments": len(snapshot),
+                "data_version": version,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+            },
+        )
+        return snapshot
+
+    def invalidate(self) -> None:
+        """Drop the current snapshot so the next read rebuilds it."""
+        self._snapshot = None
+
+
+universe_store = UniverseStore()
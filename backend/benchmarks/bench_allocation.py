@@ -0,0 +1,74 @@
+"""Target weights for large candidate sets: reference loop vs NumPy engine.
+
+Usage: ``python -m benchmarks.bench_allocation [SIZE ...]``
+
+Every candidate is kept (``max_instruments`` equals the candidate count),
+which is where the reference's list-membership checks turn quadratic.  The
+reference runs up to 10k candidates; beyond that it takes minutes.  The
+engine is timed with equal weights and with each other scheme under a 2%
+instrument cap and a 15% sector cap.
+"""
+from __future__ import annotations
+
+import random
+import sys
+from dataclasses import replace
+
+from app.db.models import Instrument, InstrumentType
+from app.domain.allocation import target_weights, target_weights_reference
+from app.domain.mapping import Goal, RiskProfile, map_intent_to_filters
+from app.domain.types import WeightingScheme
+
+from .common import SECTORS, sizes, timeit
+
+REFERENCE_LIMIT = 10_000
+
+
+def candidates(count: int, seed: int = 42) -> list[Instrument]:
+    rng = random.Random(seed)
+    return [
+        Instrument(
+            symbol=f"SYM{i}.NS",
+            name=f"Company {i}",
+            instrument_type=InstrumentType.ETF if i % 10 == 0 else InstrumentType.STOCK,
+            sector=rng.choice(SECTORS),
+            market_cap=rng.uniform(1e9, 2e12),
+        )
+        for i in range(count)
+    ]
+
+
+def main(argv: list[str] | None = None) -> None:
+    base = map_intent_to_filters(RiskProfile.BALANCED, Goal.GROWTH, 5)
+    schemes = list(WeightingScheme)
+    header = " ".join(f"{s.value + ' ms':>22}" for s in schemes[1:])
+    print(f"{'candidates':>10} {'reference ms':>13} {'equal ms':>10} {header}")
+    for count in sizes((10, 1_000, 50_000), argv):
+        pool = candidates(count)
+        rng = random.Random(count)
+        volatility = [rng.uniform(0.1, 0.6) for _ in pool]
+        score = [rng.gauss(0, 1) for _ in pool]
+        equal = replace(base, max_instruments=count)
+        capped = replace(equal, max_weight=0.02, max_sector_weight=0.15)
+
+        repeat = 3 if count <= REFERENCE_LIMIT else 1
+        if count <= REFERENCE_LIMIT:
+            seconds = timeit(lambda: target_weights_reference(pool, equal), repeat)
+            reference = f"{seconds * 1e3:13.2f}"
+            assert target_weights(pool, equal) == target_weights_reference(pool, equal)
+        else:
+            reference = f"{'-':>13}"
+        timings = [timeit(lambda: target_weights(pool, equal), repeat)]
+        for scheme in schemes[1:]:
+            filters = replace(capped, weighting=scheme)
+            timings.append(
+                timeit(
+                    lambda: target_weights(pool, filters, volatility, score), repeat
+                )
+            )
+        columns = " ".join(f"{t * 1e3:22.2f}" for t in timings[1:])
+        print(f"{count:>10} {reference} {timings[0] * 1e3:10.2f} {columns}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
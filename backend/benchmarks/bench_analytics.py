@@ -0,0 +1,63 @@
+"""Rolling analytics: full backfill vs an incremental daily update.
+
+Usage: ``python -m benchmarks.bench_analytics [DAYS ...]``
+
+Seeds 2,000 instruments with ``DAYS`` daily rows each (2.5M rows by
+default) in a temporary SQLite file, computes the statistics of every day
+with ``update_analytics`` and then appends one and five new days per
+instrument, updating only those.  Times include reading prices and writing
+the statistics back.
+"""
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from app.db.session import get_engine, get_session
+from app.repositories.metrics import MetricRepository
+from app.services.analytics import update_analytics
+
+from .common import seed_universe, sizes
+
+INSTRUMENTS = 2_000
+# seed_universe's last day.
+LAST_DAY = date(2024, 1, 1)
+
+
+def main(argv: list[str] | None = None) -> None:
+    print(f"{'days':>6}  {'update':<22} {'metrics':>10} {'seconds':>8}")
+    for days in sizes((1_250,), argv):
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = get_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+            seed_universe(engine, INSTRUMENTS, days)
+            session = get_session(engine)
+            repo = MetricRepository(session)
+
+            def timed(label: str, since: date | None) -> None:
+                start = time.perf_counter()
+                written = update_analytics(session, since=since)
+                session.commit()
+                seconds = time.perf_counter() - start
+                print(f"{days:>6}  {label:<22} {written:>10} {seconds:8.2f}")
+
+            timed("full backfill", None)
+            since = LAST_DAY
+            for added in (1, 5):
+                new_days = [since + timedelta(days=d + 1) for d in range(added)]
+                repo.bulk_upsert(
+                    [
+                        {"instrument_id": i + 1, "as_of_date": day, "price": 100.0}
+                        for day in new_days
+                        for i in range(INSTRUMENTS)
+                    ]
+                )
+                session.commit()
+                timed(f"incremental, {added} day(s)", new_days[0])
+                since = new_days[-1]
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,110 @@
+"""/screen throughput and latency with sync vs async database handlers.
+
+Usage: ``python -m benchmarks.bench_async [CLIENTS [INSTRUMENTS]]``
+
+``CLIENTS`` concurrent clients (default 500) each issue one /screen request
+against a temporary SQLite file.  The universe snapshot and result caches are
+disabled so every request screens in SQL.  Sync handlers run in Starlette's
+threadpool; async handlers run on the event loop using aiosqlite.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+os.environ["UNIVERSE_SNAPSHOT_ENABLED"] = "false"
+os.environ["RECOMMEND_CACHE_SIZE"] = "0"
+os.environ["SELECTION_CACHE_SIZE"] = "0"
+
+from fastapi import FastAPI  # noqa: E402
+
+from app.api import routes  # noqa: E402
+from app.core.config import Settings  # noqa: E402
+from app.core.rate_limit import limiter  # noqa: E402
+from app.domain.mapping import Goal, RiskProfile  # noqa: E402
+from app.db.session import (  # noqa: E402
+    dispose_async_engine,
+    dispose_engine,
+    get_engine,
+    init_async_engine,
+    init_engine,
+)
+
+from .common import seed_universe  # noqa: E402
+
+PROFILES = [p.value for p in RiskProfile]
+GOALS = [g.value for g in Goal]
+
+
+def _app(settings: Settings) -> FastAPI:
+    app = FastAPI()
+    app.state.limiter = limiter
+    app.include_router(routes.screen_router(settings))
+    return app
+
+
+async def _run(app: FastAPI, clients: int) -> tuple[float, np.ndarray]:
+    rng = random.Random(7)
+    payloads = [
+        {
+            "budget_inr": rng.randint(10_000, 1_000_000),
+            "horizon_years": rng.randint(1, 15),
+            "risk_profile": rng.choice(PROFILES),
+            "goal": rng.choice(GOALS),
+        }
+        for _ in range(clients)
+    ]
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def one(payload: dict[str, object]) -> float:
+            start = time.perf_counter()
+            response = await client.post("/screen", json=payload)
+            assert response.status_code == 200, response.text
+            return time.perf_counter() - start
+
+        started = time.perf_counter()
+        latencies = await asyncio.gather(*(one(p) for p in payloads))
+        elapsed = time.perf_counter() - started
+    return clients / elapsed, np.array(latencies) * 1000
+
+
+def main(argv: list[str] | None = None) -> None:
+    argv = argv or []
+    clients = int(argv[0]) if argv else 500
+    instruments = int(argv[1]) if len(argv) > 1 else 2_000
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        seed_universe(get_engine(url), instruments, days=5)
+        # Sync sessions are closed from the threadpool too, so finished
+        # requests can hold connections while new ones queue; size the pool
+        # for every client to compare handler throughput, not pool waits.
+        settings = Settings(DATABASE_URL=url, DB_POOL_SIZE=clients, DB_MAX_OVERFLOW=0)
+        print(f"{clients} concurrent clients, {instruments} instruments")
+        print(f"{'mode':>6} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8}")
+        for async_mode in (False, True):
+            mode = settings.model_copy(update={"DB_ASYNC": async_mode})
+            if async_mode:
+                init_async_engine(mode)
+            else:
+                init_engine(mode)
+            rate, latencies = asyncio.run(_run(_app(mode), clients))
+            if async_mode:
+                asyncio.run(dispose_async_engine())
+            else:
+                dispose_engine()
+            p50, p99 = np.percentile(latencies, [50, 99])
+            name = "async" if async_mode else "sync"
+            print(f"{name:>6} {rate:8.1f} {p50:8.1f} {p99:8.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,54 @@
+"""Backtesting all six profiles: per-date queries vs incremental universes.
+
+Usage: ``python -m benchmarks.bench_backtest [DAYS ...]``
+
+Seeds 2,000 instruments with ``DAYS`` daily rows each (2.5M rows by
+default) in a temporary SQLite file and backtests monthly rebalances over
+the whole history.  The reference queries each period's start and end
+universes from scratch in one process; the engine updates each universe
+with the metrics since the previous date and evaluates the dates in this
+process or in a process pool.  Reported as wall time per simulated year.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+from app.db.session import get_engine, get_session
+from app.domain.backtest import PROFILES
+from app.services.backtest import run_backtest, run_backtest_reference
+
+from .common import seed_universe, sizes
+
+INSTRUMENTS = 2_000
+
+
+def main(argv: list[str] | None = None) -> None:
+    workers = os.cpu_count() or 1
+    print(
+        f"{'days':>6} {'rebalances':>10} {'years':>6} {'reference s/yr':>15}"
+        f" {'in-process s/yr':>16} {f'{workers} workers s/yr':>16}"
+    )
+    for days in sizes((1_250,), argv):
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = get_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+            seed_universe(engine, INSTRUMENTS, days)
+            session = get_session(engine)
+            reference = run_backtest_reference(session)
+            inline = run_backtest(session, workers=0)
+            pooled = run_backtest(session, workers=workers)
+            assert [p.weights for p in pooled.periods] == [
+                p.weights for p in reference.periods
+            ]
+            rebalances = len(reference.periods) // len(PROFILES) + 1
+            print(
+                f"{days:>6} {rebalances:>10} {reference.years:6.2f}"
+                f" {reference.seconds_per_year:15.2f}"
+                f" {inline.seconds_per_year:16.2f} {pooled.seconds_per_year:16.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,61 @@
+"""One /screen call per card vs a single deduplicated batch.
+
+Usage: ``python -m benchmarks.bench_batch [BATCH ...]``
+
+Each batch mixes random budgets and horizons over the six risk profile /
+goal combinations and is screened against a 2,000 instrument snapshot.
+"""
+from __future__ import annotations
+
+import random
+import sys
+
+from app.domain.mapping import Goal, RiskProfile
+from app.domain.universe import build_universe_snapshot
+from app.services.portfolio import (
+    PortfolioIntent,
+    recommend_portfolio,
+    recommend_portfolios,
+)
+
+from .common import seeded_session, sizes, timeit
+
+PROFILES = [(risk, goal) for risk in RiskProfile for goal in Goal]
+
+
+def main(argv: list[str] | None = None) -> None:
+    session = seeded_session(2_000)
+    snapshot = build_universe_snapshot(session)
+    rng = random.Random(0)
+    print(f"{'batch':>6} {'per-request ms':>15} {'batch ms':>9} {'speedup':>8}")
+    for size in sizes((10, 50, 200), argv):
+        intents = [
+            PortfolioIntent(
+                round(rng.uniform(1_000, 5_000_000), 2),
+                rng.randint(1, 15),
+                *rng.choice(PROFILES),
+            )
+            for _ in range(size)
+        ]
+
+        def one_by_one() -> None:
+            for i in intents:
+                recommend_portfolio(
+                    session,
+                    i.budget_inr,
+                    i.horizon_years,
+                    i.risk_profile,
+                    i.goal,
+                    snapshot=snapshot,
+                )
+
+        single = timeit(one_by_one, repeat=3)
+        batch = timeit(lambda: recommend_portfolios(session, intents, snapshot), 3)
+        print(
+            f"{size:>6} {single * 1000:>15.2f} {batch * 1000:>9.2f} "
+            f"{single / batch:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,48 @@
+"""Threshold calibration: screening each grid point vs a vectorized sweep.
+
+Usage: ``python -m benchmarks.bench_calibration [SIZE ...]``
+
+Seeds ``SIZE`` instruments and sweeps the 10,000-point
+:data:`~app.domain.calibration.DEFAULT_GRID` around the balanced income
+profile: one snapshot screen per point, the broadcast sweep in this
+process, and the sweep over shared memory in a pool with one worker per
+CPU.
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+from app.domain.calibration import DEFAULT_GRID, evaluate_grid_reference
+from app.domain.mapping import Goal, RiskProfile, map_intent_to_filters
+from app.domain.universe import build_universe_snapshot
+from app.services.calibration import sweep
+
+from .common import seeded_session, sizes, timeit
+
+
+def main(argv: list[str] | None = None) -> None:
+    base = map_intent_to_filters(RiskProfile.BALANCED, Goal.INCOME, 5)
+    points = DEFAULT_GRID.points()
+    workers = os.cpu_count() or 1
+    print(
+        f"{'instruments':>11} {'points':>7} {'each point s':>12}"
+        f" {'sweep s':>8} {f'{workers} workers s':>12}"
+    )
+    for count in sizes((2_000, 10_000), argv):
+        snapshot = build_universe_snapshot(seeded_session(count))
+        reference = timeit(
+            lambda: evaluate_grid_reference(snapshot, base, points), repeat=1
+        )
+        inline = timeit(lambda: sweep(snapshot, base, points, workers=0), repeat=3)
+        pooled = timeit(
+            lambda: sweep(snapshot, base, points, workers=workers), repeat=3
+        )
+        print(
+            f"{count:>11} {len(points):>7} {reference:12.2f}"
+            f" {inline:8.2f} {pooled:12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
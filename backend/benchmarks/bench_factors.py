@@ -0,0 +1,79 @@
+"""Factor scoring: precomputation, composite scores and top-k selection.
+
+Usage: ``python -m benchmarks.bench_factors [SIZE ...]``
+
+Seeds ``SIZE`` instruments, builds a universe snapshot and times the
+factor scores computed with it (once per ingestion run), a composite score
+for one set of weights, picking the best 10 stocks with a full sort and
+with :func:`top_k`, and whole screens ordered by market cap and by a
+precomputed composite.
+"""
+from __future__ import annotations
+
+import sys
+from dataclasses import replace
+
+import numpy as np
+
+from app.domain.factors import factor_scores, factor_values, top_k
+from app.domain.mapping import Goal, RiskProfile, map_intent_to_filters
+from app.domain.types import FactorWeights
+from app.domain.universe import build_universe_snapshot
+
+from .common import seeded_session, sizes, timeit
+
+WEIGHTS = FactorWeights(roe=2.0, debt_to_equity=1.0, growth=1.0, pe=1.0)
+
+
+def main(argv: list[str] | None = None) -> None:
+    base = map_intent_to_filters(RiskProfile.AGGRESSIVE, Goal.GROWTH, 5)
+    ranked = replace(base, factor_weights=WEIGHTS)
+    print(
+        f"{'instruments':>11} {'precompute ms':>14} {'composite ms':>13}"
+        f" {'sort top 10 ms':>15} {'top_k 10 ms':>12}"
+        f" {'screen cap ms':>14} {'screen ranked ms':>17}"
+    )
+    for count in sizes((1_000, 10_000, 100_000), argv):
+        snapshot = build_universe_snapshot(seeded_session(count))
+        columns = {
+            name: getattr(snapshot, name)
+            for name in (
+                "roe",
+                "debt_to_equity",
+                "dividend_yield",
+                "revenue_growth",
+                "earnings_growth",
+            )
+        }
+        columns["pe"] = np.array(
+            [m.pe if m is not None else None for m in snapshot.metrics],
+            dtype=np.float64,
+        )
+        values = factor_values(columns)
+        codes: dict[str | None, int] = {}
+        sectors = np.array(
+            [codes.setdefault(i.sector, len(codes)) for i in snapshot.instruments],
+            dtype=np.intp,
+        )
+        precompute = timeit(
+            lambda: factor_scores(values, sectors, snapshot.is_stock), 3
+        )
+        composite = timeit(lambda: snapshot.factors.composite(WEIGHTS))
+        scores = snapshot.factors.composite(WEIGHTS)
+        keys = np.where(np.isnan(scores), -np.inf, scores)
+        full_sort = timeit(lambda: np.argsort(-keys, kind="stable")[:10])
+        partial = timeit(lambda: top_k(scores, 10))
+        expected = np.argsort(-keys, kind="stable")[:10]
+        assert top_k(scores, 10).tolist() == expected.tolist()
+        by_cap = timeit(lambda: snapshot.select(base))
+        snapshot.select(ranked)  # computes and caches the composite
+        by_score = timeit(lambda: snapshot.select(ranked))
+        print(
+            f"{count:>11} {precompute * 1e3:14.2f} {composite * 1e3:13.2f}"
+            f" {full_sort * 1e3:15.3f} {partial * 1e3:12.3f}"
+            f" {by_cap * 1e3:14.3f} {by_score * 1e3:17.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,67 @@
+"""Re-running ingestion after a partial failure: full vs incremental.
+
+Usage: ``python -m benchmarks.bench_incremental [SIZE ...]``
+
+Seeds ``SIZE`` instruments with a year of history and ingests the next
+day from a stub provider taking 2 ms per symbol, where 5% of the symbols
+fail.  Once the provider recovers, the re-run either fetches the whole
+universe again or, incrementally, only the symbols still missing the day.
+"""
+from __future__ import annotations
+
+import sys
+import time
+from datetime import date
+from typing import Dict, List
+
+from app.cli.ingest import ingest
+from app.services.ingestion.base import Ingestor
+
+from .common import seeded_session, sizes
+
+DAY = date(2024, 1, 2)
+LATENCY = 0.002
+
+
+class StubIngestor(Ingestor):
+    """Returns a close for ``DAY`` per symbol, except the ``failing`` ones."""
+
+    def __init__(self, failing: set[str]) -> None:
+        self.failing = failing
+        self.fetched = 0
+
+    def fetch_metrics(self, symbols: List[str]) -> Dict[str, Dict[str, object]]:
+        time.sleep(LATENCY * len(symbols))
+        self.fetched += len(symbols)
+        return {
+            s: {"as_of_date": DAY, "price": 100.0, "pe": 20.0}
+            for s in symbols
+            if s not in self.failing
+        }
+
+
+def main(argv: list[str] | None = None) -> None:
+    print(
+        f"{'instruments':>11} {'failed':>6} {'full re-run s':>14} {'fetched':>8}"
+        f" {'incremental s':>14} {'fetched':>8}"
+    )
+    for count in sizes((2_000,), argv):
+        timings = []
+        for incremental in (False, True):
+            session = seeded_session(count, days=260)
+            failing = {f"SYM{i}.NS" for i in range(0, count, 20)}
+            ingest(session, StubIngestor(failing), incremental=True, as_of=DAY)
+            recovered = StubIngestor(set())
+            start = time.perf_counter()
+            ingest(session, recovered, incremental=incremental, as_of=DAY)
+            timings.append((time.perf_counter() - start, recovered.fetched))
+            session.close()
+        (full, full_fetched), (partial, partial_fetched) = timings
+        print(
+            f"{count:>11} {len(failing):>6} {full:14.2f} {full_fetched:>8}"
+            f" {partial:14.2f} {partial_fetched:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
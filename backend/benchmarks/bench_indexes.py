@@ -0,0 +1,69 @@
+"""Latest-metric lookup latency as history grows, with and without indexes.
+
+Usage: ``python -m benchmarks.bench_indexes [DAYS ...]``
+
+Seeds 2,000 instruments with ``DAYS`` daily rows each (the largest default
+is 2.5M rows), then compares ``MetricRepository.latest_by_instrument``
+against the same query on an unindexed copy of the table.
+"""
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import text
+
+from app.db.session import get_engine, get_session
+from app.repositories.metrics import MetricRepository
+
+from .common import seed_universe, sizes
+
+INSTRUMENTS = 2_000
+LOOKUPS = 200
+
+UNINDEXED = text(
+    "SELECT * FROM metrics_unindexed WHERE instrument_id = :id "
+    "ORDER BY as_of_date DESC LIMIT 1"
+)
+
+
+def main(argv: list[str] | None = None) -> None:
+    print(f"{'rows':>10} {'indexed us':>11} {'unindexed us':>13}  plan")
+    for days in sizes((5, 50, 1_250), argv):
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = get_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+            seed_universe(engine, INSTRUMENTS, days)
+            session = get_session(engine)
+            session.execute(
+                text("CREATE TABLE metrics_unindexed AS SELECT * FROM metrics")
+            )
+            repo = MetricRepository(session)
+            symbols = [f"SYM{i}.NS" for i in range(0, INSTRUMENTS, INSTRUMENTS // LOOKUPS)]
+
+            start = time.perf_counter()
+            for symbol in symbols:
+                repo.latest_by_instrument(symbol)
+            indexed = (time.perf_counter() - start) / len(symbols)
+
+            start = time.perf_counter()
+            for i in range(min(len(symbols), 20)):
+                session.execute(UNINDEXED, {"id": i + 1}).first()
+            unindexed = (time.perf_counter() - start) / min(len(symbols), 20)
+
+            plan = session.execute(
+                text(
+                    "EXPLAIN QUERY PLAN SELECT * FROM metrics WHERE instrument_id = 1 "
+                    "ORDER BY as_of_date DESC LIMIT 1"
+                )
+            ).all()
+            session.close()
+            print(
+                f"{INSTRUMENTS * days:>10} {indexed * 1e6:>11.0f} "
+                f"{unindexed * 1e6:>13.0f}  {plan[-1][-1]}"
+            )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,87 @@
+"""Write N metric rows one commit at a time vs a single bulk upsert.
+
+Usage: ``python -m benchmarks.bench_ingest [ROWS] [DATABASE_URL]``
+
+Defaults to 10k rows on a temporary SQLite file; pass a PostgreSQL URL to
+measure there (its tables are created and dropped by the script).
+"""
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+from sqlalchemy import delete, insert
+
+from app.db.base import Base
+from app.db.models import Instrument, InstrumentType, Metric
+from app.db.session import get_engine, get_session
+from app.repositories.metrics import MetricRepository
+
+
+def _rows(count: int, day: date) -> list[dict[str, object]]:
+    return [
+        {"instrument_id": i + 1, "as_of_date": day, "price": 100.0 + i, "pe": 20.0}
+        for i in range(count)
+    ]
+
+
+def run(url: str, count: int) -> None:
+    engine = get_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Instrument),
+            [
+                {
+                    "symbol": f"SYM{i}",
+                    "name": f"Company {i}",
+                    "instrument_type": InstrumentType.STOCK,
+                    "exchange": "NSE",
+                }
+                for i in range(count)
+            ],
+        )
+    session = get_session(engine)
+    repo = MetricRepository(session)
+
+    start = time.perf_counter()
+    for row in _rows(count, date(2024, 1, 1)):
+        repo.create(Metric(**row))
+    per_row = time.perf_counter() - start
+
+    session.execute(delete(Metric))
+    session.commit()
+    start = time.perf_counter()
+    repo.bulk_upsert(_rows(count, date(2024, 1, 1)))
+    session.commit()
+    bulk = time.perf_counter() - start
+
+    start = time.perf_counter()
+    repo.bulk_upsert(_rows(count, date(2024, 1, 1)))
+    session.commit()
+    rerun = time.perf_counter() - start
+
+    session.close()
+    Base.metadata.drop_all(engine)
+    print(f"{engine.dialect.name}: {count} rows")
+    print(f"  commit per row: {per_row:8.2f} s")
+    print(f"  bulk upsert:    {bulk:8.2f} s ({per_row / bulk:.0f}x)")
+    print(f"  re-run upsert:  {rerun:8.2f} s")
+
+
+def main(argv: list[str] | None = None) -> None:
+    argv = argv or []
+    count = int(argv[0]) if argv else 10_000
+    if len(argv) > 1:
+        run(argv[1], count)
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        run(f"sqlite:///{Path(tmp) / 'bench.db'}", count)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
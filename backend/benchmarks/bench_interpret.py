@@ -0,0 +1,89 @@
+"""Intent interpretation throughput on a corpus of realistic prompts.
+
+Usage: ``python -m benchmarks.bench_interpret [PROMPTS]``
+
+Compares the original rules, ``MockInterpreter.interpret``,
+``MockInterpreter.interpret_many`` (which parses repeated prompts once) and,
+for reference, a single combined lookahead pattern that extracts every
+field in one ``finditer`` pass.
+"""
+from __future__ import annotations
+
+import random
+import re
+import sys
+
+from app.services.nlp.mock_interpreter import MockInterpreter, interpret_reference
+
+from .common import timeit
+
+TEMPLATES = (
+    "I want {risk} {goal} for {years} years with {amount}",
+    "invest {amount} for {years} yrs, {risk} profile, {goal} please",
+    "{Risk} investor here. Budget {amount}. Looking for {goal} over {years} years.",
+    "Can you suggest something {risk} for {goal}? I can invest {amount}",
+    "Planning for my daughter's education in {years} years, {risk}, {amount}",
+    "help me grow my savings",
+)
+RISKS = ("safe", "conservative", "balanced", "moderate", "aggressive", "high risk")
+GOALS = ("income", "dividend", "growth", "long term growth")
+AMOUNTS = ("50k", "2 lakh", "5 lac", "1.5 crore", "10000", "3 cr")
+
+COMBINED = re.compile(
+    r"(?=(?P<safe>safe|conservative)"
+    r"|(?P<aggressive>aggressive|high risk)"
+    r"|(?P<balanced>balanced|moderate)"
+    r"|(?P<income>income|dividend)"
+    r"|(?P<growth>growth)"
+    r"|(?P<horizon>\d+)\s*(?:years|year|yrs|yr)"
+    r"|(?:invest|with|budget)\s*(?P<amount>\d+(?:\.\d+)?)\s*"
+    r"(?P<unit>k|lakh|lac|crore|cr)?)"
+)
+
+
+def corpus(count: int, seed: int = 0) -> list[str]:
+    """Return ``count`` prompts; about a third repeat earlier ones."""
+    rng = random.Random(seed)
+    prompts: list[str] = []
+    for _ in range(count):
+        if prompts and rng.random() < 0.35:
+            prompts.append(rng.choice(prompts))
+            continue
+        risk = rng.choice(RISKS)
+        prompts.append(
+            rng.choice(TEMPLATES).format(
+                risk=risk,
+                Risk=risk.capitalize(),
+                goal=rng.choice(GOALS),
+                years=rng.randint(1, 30),
+                amount=rng.choice(AMOUNTS),
+            )
+        )
+    return prompts
+
+
+def combined_tokens(text: str) -> list[str | None]:
+    return [m.lastgroup for m in COMBINED.finditer(text.lower())]
+
+
+def main(argv: list[str] | None = None) -> None:
+    count = int(argv[0]) if argv else 20_000
+    prompts = corpus(count)
+    interpreter = MockInterpreter()
+    for prompt in prompts:
+        assert interpreter.interpret(prompt) == interpret_reference(prompt)
+
+    runs = {
+        "reference rules": lambda: [interpret_reference(p) for p in prompts],
+        "interpret": lambda: [interpreter.interpret(p) for p in prompts],
+        "interpret_many": lambda: interpreter.interpret_many(prompts),
+        "combined pattern": lambda: [combined_tokens(p) for p in prompts],
+    }
+    print(f"{count} prompts, {len(set(prompts))} distinct")
+    for name, run in runs.items():
+        seconds = timeit(run, repeat=3)
+        print(f"{name:>17}: {count / seconds:>10,.0f} prompts/s")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
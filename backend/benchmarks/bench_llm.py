@@ -0,0 +1,158 @@
+"""/recommend latency with a provider-backed interpreter under concurrency.
+
+Usage: ``python -m benchmarks.bench_llm [CLIENTS [LATENCY_MS]]``
+
+``CLIENTS`` concurrent /recommend calls (default 200) hit the async handlers
+while intents come from a local stub provider answering after
+``LATENCY_MS`` (default 50).  Each scenario starts with an empty interpret
+cache:
+
+* ``per-call client`` opens a new HTTP client for every prompt and neither
+  caps nor coalesces calls (the straightforward implementation);
+* ``pooled, distinct`` uses :class:`LLMInterpreter` with every prompt unique;
+* ``pooled, repeated`` draws the prompts from 20 phrasings, so concurrent
+  duplicates share one upstream call;
+* ``provider too slow`` sets the timeout below the stub latency, so every
+  call falls back to the rule-based interpreter.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+os.environ["RECOMMEND_CACHE_SIZE"] = "0"
+
+from fastapi import FastAPI  # noqa: E402
+
+from app.api import routes  # noqa: E402
+from app.core.cache import LRUCache  # noqa: E402
+from app.core.config import Settings  # noqa: E402
+from app.core.rate_limit import limiter  # noqa: E402
+from app.db.session import (  # noqa: E402
+    dispose_async_engine,
+    get_engine,
+    init_async_engine,
+)
+from app.services.interpretation import build_interpreter  # noqa: E402
+from app.services.nlp.base import Intent, IntentInterpreter  # noqa: E402
+from app.services.nlp.fallback import FallbackInterpreter  # noqa: E402
+from app.services.nlp.llm_interpreter import (  # noqa: E402
+    LLMInterpreter,
+    parse_completion,
+)
+from app.services.nlp.mock_interpreter import MockInterpreter  # noqa: E402
+from app.services.nlp.stub_server import StubProvider  # noqa: E402
+
+from .common import seed_universe  # noqa: E402
+
+
+class PerCallInterpreter(LLMInterpreter):
+    """Baseline: a fresh client per prompt, no cap and no coalescing."""
+
+    async def interpret_async(self, text: str) -> Intent:
+        async with httpx.AsyncClient(
+            base_url=self.base_url, timeout=self.timeout_seconds
+        ) as client:
+            messages = [{"role": "user", "content": text}]
+            response = await client.post(
+                "/chat/completions", json={"model": self.model, "messages": messages}
+            )
+        return parse_completion(response.json())
+
+
+def _prompt(n: int) -> str:
+    return f"invest {n + 1} lakh, balanced growth for {n % 15 + 1} years"
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+    app.state.limiter = limiter
+    app.include_router(routes.async_router)
+    return app
+
+
+async def _run(
+    interpreter: IntentInterpreter, prompts: list[str]
+) -> tuple[float, np.ndarray]:
+    routes._interpreter = interpreter
+    transport = httpx.ASGITransport(app=_app())
+    client = httpx.AsyncClient(transport=transport, base_url="http://bench")
+    async with client:
+
+        async def one(prompt: str) -> float:
+            start = time.perf_counter()
+            response = await client.post("/recommend", json={"text": prompt})
+            assert response.status_code == 200, response.text
+            return time.perf_counter() - start
+
+        started = time.perf_counter()
+        latencies = await asyncio.gather(*(one(p) for p in prompts))
+        elapsed = time.perf_counter() - started
+    await interpreter.aclose()
+    return len(prompts) / elapsed, np.array(latencies) * 1000
+
+
+def main(argv: list[str] | None = None) -> None:
+    argv = argv or []
+    clients = int(argv[0]) if argv else 200
+    latency = (float(argv[1]) if len(argv) > 1 else 50.0) / 1000
+    logging.disable(logging.WARNING)
+    limiter.enabled = False
+    with tempfile.TemporaryDirectory() as tmp, StubProvider(latency=latency) as stub:
+        url = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        seed_universe(get_engine(url), 500)
+        settings = Settings(
+            DATABASE_URL=url,
+            DB_ASYNC=True,
+            AI_PROVIDER="openai",
+            AI_BASE_URL=stub.base_url,
+            AI_TIMEOUT_SECONDS=5.0,
+        )
+        init_async_engine(settings)
+
+        def cached(settings: Settings) -> IntentInterpreter:
+            return build_interpreter(settings, LRUCache(maxsize=4096))
+
+        distinct = [_prompt(n) for n in range(clients)]
+        repeated = [_prompt(n % 20) for n in range(clients)]
+        scenarios = [
+            (
+                "per-call client",
+                FallbackInterpreter(
+                    PerCallInterpreter.from_settings(settings), MockInterpreter()
+                ),
+                distinct,
+            ),
+            ("pooled, distinct", cached(settings), distinct),
+            ("pooled, repeated", cached(settings), repeated),
+            (
+                "provider too slow",
+                cached(settings.model_copy(update={"AI_TIMEOUT_SECONDS": latency / 2})),
+                distinct,
+            ),
+        ]
+        print(
+            f"{clients} concurrent /recommend, provider latency"
+            f" {latency * 1000:.0f} ms,"
+            f" AI_MAX_CONCURRENCY={settings.AI_MAX_CONCURRENCY}"
+        )
+        print(f"{'scenario':>18} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'calls':>6}")
+        for name, interpreter, prompts in scenarios:
+            before = stub.requests
+            rate, latencies = asyncio.run(_run(interpreter, prompts))
+            p50, p99 = np.percentile(latencies, [50, 99])
+            calls = stub.requests - before
+            print(f"{name:>18} {rate:8.1f} {p50:8.1f} {p99:8.1f} {calls:6d}")
+        asyncio.run(dispose_async_engine())
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
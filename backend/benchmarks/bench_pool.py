@@ -0,0 +1,68 @@
+"""Requests/sec for /screen with a per-request engine vs the shared pool.
+
+Usage: ``python -m benchmarks.bench_pool [REQUESTS]``
+
+Runs against a temporary SQLite file so both modes pay real connection
+setup costs.
+"""
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Generator
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.api import routes
+from app.core.config import Settings
+from app.db.session import dispose_engine, get_engine, get_session, init_engine
+from app.main import app
+
+from .common import seed_universe
+
+PAYLOAD = {
+    "budget_inr": 100000,
+    "horizon_years": 5,
+    "risk_profile": "balanced",
+    "goal": "growth",
+}
+
+
+def _run(client: TestClient, requests: int) -> float:
+    start = time.perf_counter()
+    for _ in range(requests):
+        assert client.post("/screen", json=PAYLOAD).status_code == 200
+    return requests / (time.perf_counter() - start)
+
+
+def main(argv: list[str] | None = None) -> None:
+    requests = int(argv[0]) if argv else 500
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        seed_universe(get_engine(url), 200)
+        client = TestClient(app)
+
+        def per_request_engine() -> Generator[Session, None, None]:
+            session = get_session(get_engine(url))
+            try:
+                yield session
+            finally:
+                session.close()
+
+        app.dependency_overrides[routes.get_db] = per_request_engine
+        before = _run(client, requests)
+        app.dependency_overrides.clear()
+
+        init_engine(Settings(DATABASE_URL=url))
+        after = _run(client, requests)
+        dispose_engine()
+
+    print(f"per-request engine: {before:8.1f} req/s")
+    print(f"shared pool:        {after:8.1f} req/s")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,52 @@
+"""Recommendations for random budgets with and without the selection cache.
+
+Usage: ``python -m benchmarks.bench_recommend [REQUESTS] [INSTRUMENTS]``
+
+Sends ``REQUESTS`` recommendations with random budgets spread over the six
+risk profile / goal combinations through the SQL screening path.
+"""
+from __future__ import annotations
+
+import random
+import sys
+import time
+
+from app.core.cache import LRUCache
+from app.domain.mapping import Goal, RiskProfile
+from app.services.portfolio import recommend_portfolio
+
+from .common import seeded_session
+
+PROFILES = [(risk, goal) for risk in RiskProfile for goal in Goal]
+
+
+def main(argv: list[str] | None = None) -> None:
+    argv = argv or []
+    requests = int(argv[0]) if argv else 10_000
+    count = int(argv[1]) if len(argv) > 1 else 2_000
+    session = seeded_session(count)
+    rng = random.Random(0)
+    workload = [
+        (rng.uniform(1_000, 5_000_000), *rng.choice(PROFILES)) for _ in range(requests)
+    ]
+
+    def run(workload: list, cache: LRUCache | None) -> float:  # type: ignore[type-arg]
+        start = time.perf_counter()
+        for budget, risk, goal in workload:
+            recommend_portfolio(session, budget, 5, risk, goal, selection_cache=cache)
+        return time.perf_counter() - start
+
+    # The uncached baseline screens on every request, so it is sampled and
+    # extrapolated to keep the run short.
+    sample = max(1, requests // 20)
+    uncached = run(workload[:sample], None) * requests / sample
+    cached = run(workload, LRUCache(maxsize=64))
+
+    print(f"{requests} requests over {count} instruments")
+    print(f"screen per request:   {uncached:8.2f} s (extrapolated from {sample})")
+    print(f"selection cache:      {cached:8.2f} s")
+    print(f"speedup:              {uncached / cached:8.1f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,64 @@
+"""Per-request CPU time of /screen with validated vs pre-encoded responses.
+
+Usage: ``python -m benchmarks.bench_response [REQUESTS]``
+
+Requests repeat one intent so the recommendation is served from the cache
+and response construction dominates.  CPU time is ``time.process_time``
+around each request, covering the client, the app thread and serialization.
+"""
+from __future__ import annotations
+
+import logging
+import sys
+import time
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.core.config import get_settings
+from app.main import app
+
+from .common import seeded_session
+
+PAYLOAD = {
+    "budget_inr": 100000,
+    "horizon_years": 5,
+    "risk_profile": "balanced",
+    "goal": "growth",
+}
+
+
+def _cpu_times(client: TestClient, requests: int) -> np.ndarray:
+    times = np.empty(requests)
+    for i in range(requests):
+        start = time.process_time()
+        assert client.post("/screen", json=PAYLOAD).status_code == 200
+        times[i] = time.process_time() - start
+    return times * 1e6
+
+
+def main(argv: list[str] | None = None) -> None:
+    requests = int(argv[0]) if argv else 2_000
+    logging.disable(logging.INFO)
+    session = seeded_session(2_000)
+    app.dependency_overrides[routes.get_db] = lambda: session
+    settings = get_settings()
+    client = TestClient(app)
+    client.post("/screen", json=PAYLOAD)  # warm the caches
+
+    print(f"{'mode':>9} {'p50 us':>8} {'p99 us':>8}")
+    results = {}
+    for strict in (True, False):
+        settings.STRICT_RESPONSE_VALIDATION = strict
+        _cpu_times(client, requests // 10)
+        results[strict] = np.percentile(_cpu_times(client, requests), [50, 99])
+        name = "validated" if strict else "orjson"
+        print(f"{name:>9} {results[strict][0]:8.0f} {results[strict][1]:8.0f}")
+    saved = results[True] - results[False]
+    print(f"{'saved':>9} {saved[0]:8.0f} {saved[1]:8.0f}")
+    app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,37 @@
+"""Compare the screening paths: per-instrument loop, single SQL, snapshot.
+
+Usage: ``python -m benchmarks.bench_screening [SIZE ...]``
+"""
+from __future__ import annotations
+
+import sys
+
+from app.domain.filtering import filter_candidates, filter_candidates_iterative
+from app.domain.mapping import Goal, RiskProfile, map_intent_to_filters
+from app.domain.universe import build_universe_snapshot
+
+from .common import seeded_session, sizes, timeit
+
+
+def main(argv: list[str] | None = None) -> None:
+    filters = map_intent_to_filters(RiskProfile.AGGRESSIVE, Goal.GROWTH, 5)
+    print(
+        f"{'instruments':>12} {'loop ms':>10} {'set ms':>10} "
+        f"{'build ms':>10} {'snapshot ms':>12}"
+    )
+    for count in sizes((100, 1_000, 10_000), argv):
+        session = seeded_session(count, days=3)
+        loop = timeit(lambda: filter_candidates_iterative(session, filters), 3)
+        single = timeit(lambda: filter_candidates(session, filters), 3)
+        build = timeit(lambda: build_universe_snapshot(session), 1)
+        snapshot = build_universe_snapshot(session)
+        masked = timeit(lambda: filter_candidates(session, filters, snapshot), 50)
+        print(
+            f"{count:>12} {loop * 1e3:>10.1f} {single * 1e3:>10.1f} "
+            f"{build * 1e3:>10.1f} {masked * 1e3:>12.3f}"
+        )
+        session.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
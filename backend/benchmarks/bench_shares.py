@@ -0,0 +1,77 @@
+"""Whole-share allocation: per-lot heap reference vs allocate_shares.
+
+Usage: ``python -m benchmarks.bench_shares [INSTRUMENTS ...]``
+
+Prices span ₹1 to ₹50,000 and a tenth of the instruments trade in lots of
+25.  In the ``unpriced`` rows the first instrument, holding a tenth of the
+portfolio, has no price (an ETF without metrics), so its target amount is
+left over after the first pass and is spent lot by lot on the others.  The
+reference buys one lot per heap step and is run only up to a ₹1 crore
+budget; allocate_shares is timed up to ₹1,000 crore.
+"""
+from __future__ import annotations
+
+import itertools
+import math
+import random
+import sys
+
+import numpy as np
+
+from app.domain.allocation import (
+    TargetWeight,
+    allocate_shares,
+    allocate_shares_reference,
+    integer_percents,
+)
+
+from .common import sizes, timeit
+
+BUDGETS = (1e5, 1e7, 1e10)
+REFERENCE_LIMIT = 1e7
+
+
+def universe(
+    count: int, unpriced: bool, seed: int = 42
+) -> tuple[list[TargetWeight], list[float | None], list[int]]:
+    rng = random.Random(seed)
+    weights = [rng.uniform(0.5, 2.0) for _ in range(count)]
+    if unpriced:
+        weights[0] = sum(weights[1:]) / 9
+    total = sum(weights)
+    percents = integer_percents(np.array(weights) / total)
+    targets = [TargetWeight(f"SYM{i}.NS", int(p)) for i, p in enumerate(percents)]
+    prices: list[float | None] = [
+        round(math.exp(rng.uniform(0, math.log(50_000))), 2) for _ in targets
+    ]
+    if unpriced:
+        prices[0] = None
+    lots = [25 if i % 10 == 5 else 1 for i in range(count)]
+    return targets, prices, lots
+
+
+def main(argv: list[str] | None = None) -> None:
+    print(
+        f"{'instruments':>11} {'unpriced':>8} {'budget':>14} {'reference ms':>13} "
+        f"{'engine ms':>14} {'residual':>10}"
+    )
+    for count in sizes((50, 500), argv):
+        for unpriced, budget in itertools.product((False, True), BUDGETS):
+            targets, prices, lots = universe(count, unpriced)
+            plan = allocate_shares(targets, prices, budget, lots)
+            if budget <= REFERENCE_LIMIT:
+                seconds = timeit(
+                    lambda: allocate_shares_reference(targets, prices, budget, lots), 3
+                )
+                reference = f"{seconds * 1e3:13.2f}"
+            else:
+                reference = f"{'-':>13}"
+            seconds = timeit(lambda: allocate_shares(targets, prices, budget, lots), 3)
+            print(
+                f"{count:>11} {unpriced!s:>8} {budget:>14,.0f} {reference} "
+                f"{seconds * 1e3:14.2f} {plan.residual_cash_inr:>10,.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,90 @@
+"""First-byte latency and peak memory of JSON vs NDJSON /screen payloads.
+
+Usage: ``python -m benchmarks.bench_stream [ROWS ...]``
+
+Builds a selection of ``ROWS`` instruments from a synthetic universe and
+renders it as one JSON document (dict payload, ``ScreenResponse``
+validation, serialization) and as streamed NDJSON lines.  Peak memory is
+measured with ``tracemalloc`` while the output is consumed and discarded.
+"""
+from __future__ import annotations
+
+import sys
+import time
+import tracemalloc
+from typing import Callable, Iterator
+
+from app.api.schemas import ScreenResponse
+from app.domain.allocation import TargetWeight
+from app.domain.mapping import Goal, RiskProfile
+from app.domain.universe import Candidate, UniverseSnapshot, build_universe_snapshot
+from app.services.portfolio import (
+    PortfolioSelection,
+    build_recommendation,
+    ndjson_recommendation,
+)
+
+from .common import seeded_session, sizes
+
+ARGS = (1_000_000.0, 5, RiskProfile.BALANCED, Goal.GROWTH)
+
+
+def _selection(snapshot: UniverseSnapshot, rows: int) -> PortfolioSelection:
+    """Equal-weight the first ``rows`` instruments, percents summing to 100."""
+    candidates = tuple(
+        Candidate(snapshot.instruments[i], snapshot.metrics[i]) for i in range(rows)
+    )
+    percents = [100 // rows] * rows
+    for i in range(100 - sum(percents)):
+        percents[i] += 1
+    targets = tuple(
+        TargetWeight(c.instrument.symbol, pct) for c, pct in zip(candidates, percents)
+    )
+    return PortfolioSelection(targets=targets, candidates=candidates)
+
+
+def _measure(render: Callable[[], Iterator[str]]) -> tuple[float, float, float]:
+    """Return (first chunk ms, total ms, peak MiB) for consuming ``render``.
+
+    Timings come from a separate pass since tracing slows allocation-heavy
+    code disproportionately.
+    """
+    start = time.perf_counter()
+    first = None
+    for _ in render():
+        if first is None:
+            first = time.perf_counter() - start
+    total = time.perf_counter() - start
+
+    tracemalloc.start()
+    for _ in render():
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (first or total) * 1000, total * 1000, peak / 2**20
+
+
+def main(argv: list[str] | None = None) -> None:
+    counts = list(sizes((10, 1_000, 10_000), argv))
+    session = seeded_session(max(counts))
+    snapshot = build_universe_snapshot(session)
+    print(
+        f"{'rows':>6} {'mode':>7} {'first ms':>9} {'total ms':>9} {'peak MiB':>9}"
+    )
+    for rows in counts:
+        selection = _selection(snapshot, rows)
+
+        def whole() -> Iterator[str]:
+            payload = build_recommendation(selection, *ARGS)
+            yield ScreenResponse(**payload).model_dump_json()
+
+        def streamed() -> Iterator[str]:
+            return ndjson_recommendation(selection, *ARGS)
+
+        for mode, render in (("json", whole), ("ndjson", streamed)):
+            first, total, peak = _measure(render)
+            print(f"{rows:>6} {mode:>7} {first:>9.2f} {total:>9.2f} {peak:>9.2f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
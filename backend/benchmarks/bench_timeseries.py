@@ -0,0 +1,75 @@
+"""Reading metric history: ORM objects vs column arrays vs memory maps.
+
+Usage: ``python -m benchmarks.bench_timeseries [DAYS ...]``
+
+Seeds 2,000 instruments with ``DAYS`` daily rows each (2.5M rows by
+default) in a temporary SQLite file and reads every symbol's full history
+with ``MetricRepository.list_by_instrument`` and with
+``MetricHistoryRepository`` (price only, all columns, and a one-year range).
+The cached rows first fill a ``SeriesCache`` and then read its memory maps.
+"""
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+from typing import Callable, Sized
+
+from app.db.models import IngestionRun
+from app.db.session import get_engine, get_session
+from app.repositories.metrics import METRIC_VALUE_COLUMNS, MetricRepository
+from app.repositories.timeseries import MetricHistoryRepository, SeriesCache
+
+from .common import seed_universe, sizes
+
+INSTRUMENTS = 2_000
+SYMBOLS = [f"SYM{i}.NS" for i in range(INSTRUMENTS)]
+LAST_YEAR = (date(2023, 1, 2), date(2024, 1, 1))
+
+
+def read_all(read: Callable[[str], Sized]) -> tuple[float, int]:
+    start = time.perf_counter()
+    rows = sum(len(read(symbol)) for symbol in SYMBOLS)
+    return time.perf_counter() - start, rows
+
+
+def main(argv: list[str] | None = None) -> None:
+    print(f"{'rows':>10}  {'read':<28} {'seconds':>8} {'rows/s':>12}")
+    for days in sizes((1_250,), argv):
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = get_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+            seed_universe(engine, INSTRUMENTS, days)
+            session = get_session(engine)
+            session.add(IngestionRun())
+            session.commit()
+
+            orm = MetricRepository(session)
+            arrays = MetricHistoryRepository(session)
+            cache = SeriesCache(Path(tmp) / "cache", maxsize=INSTRUMENTS)
+            cached = MetricHistoryRepository(session, cache)
+            def last_year(repo: MetricHistoryRepository) -> Callable[[str], Sized]:
+                return lambda symbol: repo.history(symbol, ("price",), *LAST_YEAR)
+
+            reads: list[tuple[str, Callable[[str], Sized]]] = [
+                ("ORM list_by_instrument", orm.list_by_instrument),
+                ("arrays, price", arrays.history),
+                (
+                    "arrays, all columns",
+                    lambda symbol: arrays.history(symbol, METRIC_VALUE_COLUMNS),
+                ),
+                ("arrays, price, last year", last_year(arrays)),
+                ("mmap cache, cold", cached.history),
+                ("mmap cache, warm", cached.history),
+                ("mmap cache, last year", last_year(cached)),
+            ]
+            for label, read in reads:
+                seconds, rows = read_all(read)
+                session.expunge_all()
+                rate = rows / seconds
+                print(f"{rows:>10}  {label:<28} {seconds:8.2f} {rate:12,.0f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
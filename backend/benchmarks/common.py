@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import random
+import time
+from datetime import date, timedelta
+from typing import Callable, Iterator
+
+from sqlalchemy import Engine, insert
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.db.latest_metrics import refresh_latest_metrics
+from app.db.models import Instrument, InstrumentType, Metric
+from app.db.session import get_engine, get_session
+
+SECTORS = (
+    "Energy",
+    "Financial Services",
+    "Information Technology",
+    "Healthcare",
+    "Consumer Goods",
+    "Industrials",
+    "Materials",
+    "Utilities",
+)
+
+
+def seed_universe(
+    engine: Engine, count: int, days: int = 1, seed: int = 42
+) -> None:
+    """Populate ``engine`` with ``count`` synthetic instruments.
+
+    Every tenth instrument is an ETF.  Each instrument receives ``days`` daily
+    metric rows ending on 2024-01-01.
+    """
+
+    rng = random.Random(seed)
+    Base.metadata.create_all(engine)
+    start = date(2024, 1, 1) - timedelta(days=days - 1)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Instrument),
+            [
+                {
+                    "id": i + 1,
+                    "symbol": f"SYM{i}.NS",
+                    "name": f"Company {i}",
+                    "instrument_type": (
+                        InstrumentType.ETF if i % 10 == 0 else InstrumentType.STOCK
+                    ),
+                    "sector": rng.choice(SECTORS),
+                    "market_cap": rng.uniform(1e9, 2e12),
+                    "exchange": "NSE",
+                }
+                for i in range(count)
+            ],
+        )
+        for day in range(days):
+            conn.execute(
+                insert(Metric),
+                [
+                    {
+                        "instrument_id": i + 1,
+                        "as_of_date": start + timedelta(days=day),
+                        "price": rng.uniform(10, 3000),
+                        "pe": rng.uniform(5, 60),
+                        "roe": rng.uniform(-0.1, 0.4),
+                        "debt_to_equity": rng.uniform(0, 2.5),
+                        "dividend_yield": rng.uniform(0, 0.06),
+                        "revenue_growth": rng.uniform(-0.2, 0.3),
+                        "earnings_growth": rng.uniform(-0.2, 0.3),
+                    }
+                    for i in range(count)
+                ],
+            )
+        refresh_latest_metrics(conn)
+
+
+def seeded_session(count: int, days: int = 1, url: str = "sqlite://") -> Session:
+    """Return a session on a freshly seeded database."""
+    engine = get_engine(url)
+    seed_universe(engine, count, days)
+    return get_session(engine)
+
+
+def timeit(fn: Callable[[], object], repeat: int = 5) -> float:
+    """Return the best wall time in seconds of ``repeat`` calls to ``fn``."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def sizes(default: tuple[int, ...], argv: list[str] | None) -> Iterator[int]:
+    """Yield universe sizes from ``argv`` or fall back to ``default``."""
+    yield from (int(a) for a in argv) if argv else default
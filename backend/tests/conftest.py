@@ -0,0 +1,72 @@
+import random
+from datetime import date
+from typing import Callable
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.db.models import Instrument, InstrumentType, Metric
+from app.db.session import get_engine, get_session
+
+
+def _random_universe(
+    count: int, seed: int = 7, etf_every: int = 10, max_days: int = 3
+) -> Session:
+    """Seed an in-memory database with ``count`` random instruments.
+
+    Every ``etf_every``-th instrument is an ETF.  Each has up to
+    ``max_days`` daily metrics, and market caps, sectors and about a tenth
+    of the metric values are missing at random.
+    """
+    rng = random.Random(seed)
+    engine = get_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = get_session(engine)
+
+    instruments = [
+        Instrument(
+            symbol=f"SYM{i}",
+            name=f"Company {i}",
+            instrument_type=(
+                InstrumentType.ETF if i % etf_every == 0 else InstrumentType.STOCK
+            ),
+            sector=rng.choice(["Energy", "Finance", "Tech", None]),
+            market_cap=rng.choice([None, rng.uniform(1e9, 2e12)]),
+        )
+        for i in range(count)
+    ]
+    session.add_all(instruments)
+    session.flush()
+
+    def maybe(value: float) -> float | None:
+        return None if rng.random() < 0.1 else value
+
+    for inst in instruments:
+        for day in range(rng.randint(0, max_days)):
+            price = rng.uniform(10, 3000)
+            session.add(
+                Metric(
+                    instrument_id=inst.id,
+                    as_of_date=date(2023, 1, 1 + day),
+                    price=price,
+                    pe=maybe(rng.uniform(-10, 60)),
+                    roe=maybe(rng.uniform(-0.1, 0.4)),
+                    debt_to_equity=maybe(rng.uniform(0, 2.5)),
+                    dividend_yield=maybe(rng.uniform(0, 0.06)),
+                    revenue_growth=maybe(rng.uniform(-0.2, 0.3)),
+                    earnings_growth=maybe(rng.uniform(-0.2, 0.3)),
+                    volatility=maybe(rng.uniform(0.1, 0.6)),
+                    drawdown=maybe(rng.uniform(-0.5, 0.0)),
+                    sma_200=maybe(price * rng.uniform(0.8, 1.2)),
+                    momentum=maybe(rng.uniform(-0.3, 0.5)),
+                )
+            )
+    session.commit()
+    return session
+
+
+@pytest.fixture
+def random_universe() -> Callable[..., Session]:
+    """Return a factory seeding a random universe, see ``_random_universe``."""
+    return _random_universe
@@ -1,8 +1,26 @@
 from __future__ import annotations
 
+from dataclasses import replace
+
+import numpy as np
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
 from app.db.models import Instrument, InstrumentType
-from app.domain.allocation import allocate
+from app.domain.allocation import (
+    TargetWeight,
+    allocate,
+    allocate_shares,
+    allocate_shares_reference,
+    apply_budget,
+    cap_weights,
+    integer_percents,
+    target_weights,
+    target_weights_reference,
+)
 from app.domain.mapping import Goal, RiskProfile, map_intent_to_filters
+from app.domain.types import WeightingScheme
 
 
 def _candidates():
@@ -55,3 +73,242 @@ def test_aggressive_profile_excludes_etf():
     assert abs(total - 15000) <= 1
     symbols = {a.symbol for a in allocations}
     assert "NIFTYBEES" not in symbols
+
+
+def test_target_weights_rescale_to_any_budget():
+    from app.domain.allocation import apply_budget, target_weights
+
+    filters = map_intent_to_filters(RiskProfile.BALANCED, Goal.GROWTH, 5)
+    targets = target_weights(_candidates(), filters)
+    for budget in (999, 10000, 123456.7):
+        allocations = apply_budget(targets, budget)
+        assert allocations == allocate(_candidates(), budget, filters)
+        assert sum(a.amount_inr for a in allocations) == round(budget)
+    assert apply_budget([], 1000) == []
+
+
+def _instrument(i: int, etf: bool, sector: str | None, cap: float | None) -> Instrument:
+    return Instrument(
+        symbol=f"SYM{i}",
+        name=f"Company {i}",
+        instrument_type=InstrumentType.ETF if etf else InstrumentType.STOCK,
+        sector=sector,
+        market_cap=cap,
+    )
+
+
+_maybe_float = st.one_of(st.none(), st.just(float("nan")), st.floats(-1.0, 1e12))
+_universes = st.lists(
+    st.tuples(
+        st.booleans(),
+        st.sampled_from([None, "Energy", "Finance", "Technology", "Healthcare"]),
+        _maybe_float,
+        _maybe_float,
+        _maybe_float,
+    ),
+    max_size=40,
+).map(
+    lambda rows: (
+        [_instrument(i, *row[:2], row[2]) for i, row in enumerate(rows)],
+        [row[3] for row in rows],
+        [row[4] for row in rows],
+    )
+)
+_caps = st.one_of(st.none(), st.floats(0.01, 1.0))
+
+
+@settings(deadline=None)
+@given(_universes, st.integers(0, 50), st.booleans())
+def test_target_weights_match_reference(universe, max_instruments, include_etfs):
+    candidates, _, _ = universe
+    filters = replace(
+        map_intent_to_filters(RiskProfile.BALANCED, Goal.GROWTH, 5),
+        max_instruments=max_instruments,
+        include_etfs=include_etfs,
+    )
+    assert target_weights(candidates, filters) == target_weights_reference(
+        candidates, filters
+    )
+
+
+@settings(deadline=None)
+@given(
+    _universes,
+    st.integers(1, 50),
+    st.sampled_from(list(WeightingScheme)),
+    _caps,
+    _caps,
+    st.floats(0, 1e9),
+)
+def test_allocation_invariants(
+    universe, max_instruments, scheme, max_weight, max_sector_weight, budget
+):
+    candidates, volatility, score = universe
+    filters = replace(
+        map_intent_to_filters(RiskProfile.BALANCED, Goal.GROWTH, 5),
+        max_instruments=max_instruments,
+        weighting=scheme,
+        max_weight=max_weight,
+        max_sector_weight=max_sector_weight,
+    )
+    targets = target_weights(candidates, filters, volatility=volatility, score=score)
+
+    assert len(targets) == min(max_instruments, len(candidates))
+    assert len({t.symbol for t in targets}) == len(targets)
+    if targets:
+        assert sum(t.percent for t in targets) == 100
+        assert all(t.percent >= 0 for t in targets)
+        if max_weight is not None:
+            cap = max(max_weight, 1 / len(targets))
+            assert all(t.percent <= cap * 100 + 1 for t in targets)
+    allocations = apply_budget(targets, budget)
+    assert sum(a.amount_inr for a in allocations) == (round(budget) if targets else 0)
+
+
+_weights = st.lists(st.floats(0.001, 1000), min_size=1, max_size=60).map(
+    lambda w: np.array(w) / sum(w)
+)
+
+
+@settings(deadline=None)
+@given(_weights, _caps, _caps, st.data())
+def test_cap_weights_respect_feasible_caps(
+    weights, max_weight, max_sector_weight, data
+):
+    n = len(weights)
+    codes = st.lists(st.integers(0, 5), min_size=n, max_size=n)
+    sectors = np.array(data.draw(codes))
+    capped = cap_weights(weights, max_weight, sectors, max_sector_weight)
+
+    assert capped.sum() == pytest.approx(1.0)
+    assert (capped >= 0).all()
+    instrument_cap = 1.0 if max_weight is None else max(max_weight, 1 / n)
+    _, codes, counts = np.unique(sectors, return_inverse=True, return_counts=True)
+    sector_cap = (
+        1.0 if max_sector_weight is None else max(max_sector_weight, 1 / len(counts))
+    )
+    assert (capped <= instrument_cap + 1e-9).all()
+    if np.minimum(sector_cap, counts * instrument_cap).sum() >= 1 + 1e-9:
+        assert (np.bincount(codes, weights=capped) <= sector_cap + 1e-9).all()
+
+
+@given(_weights)
+def test_integer_percents_round_to_100(weights):
+    percents = integer_percents(weights)
+    assert percents.sum() == 100
+    assert (np.abs(percents - weights * 100) < 1 + 1e-9).all()
+
+
+def test_weighting_schemes() -> None:
+    candidates = [
+        _instrument(0, False, "Energy", 3e12),
+        _instrument(1, False, "Finance", 1e12),
+        _instrument(2, False, "Technology", None),
+    ]
+    base = replace(
+        map_intent_to_filters(RiskProfile.BALANCED, Goal.GROWTH, 5),
+        max_instruments=3,
+    )
+
+    def percents(**changes) -> list[int]:
+        filters = replace(base, **changes)
+        targets = target_weights(
+            candidates, filters, volatility=[0.1, 0.2, 0.4], score=[3.0, 1.0, -2.0]
+        )
+        return [t.percent for t in targets]
+
+    assert percents() == [34, 33, 33]
+    # The missing market cap is treated as the average of the others.
+    assert percents(weighting=WeightingScheme.MARKET_CAP) == [50, 17, 33]
+    assert percents(weighting=WeightingScheme.INVERSE_VOLATILITY) == [57, 29, 14]
+    assert percents(weighting=WeightingScheme.SCORE) == [75, 25, 0]
+    assert percents(weighting=WeightingScheme.SCORE, max_weight=0.5) == [50, 50, 0]
+    with pytest.raises(ValueError):
+        target_weights(candidates, replace(base, weighting=WeightingScheme.SCORE))
+
+
+def test_allocate_shares_spends_leftover_on_largest_shortfall() -> None:
+    targets = [TargetWeight("A", 50), TargetWeight("B", 30), TargetWeight("C", 20)]
+
+    plan = allocate_shares(targets, [100.0, 333.3, 7.5], 10000, lot_sizes=[1, 1, 10])
+    assert [(i.shares, i.cost_inr) for i in plan.items] == [
+        (50, 5000.0),
+        (9, 2999.7),
+        (260, 1950.0),
+    ]
+    # Neither a 75 rupee lot of C nor a share of A fits in what is left.
+    assert plan.residual_cash_inr == 50.3
+
+    # C has no price, so its target is spent on the most underweight others.
+    plan = allocate_shares(targets, [100.0, 333.3, None], 10000)
+    assert [(i.shares, i.cost_inr) for i in plan.items] == [
+        (60, 6000.0),
+        (12, 3999.6),
+        (None, None),
+    ]
+    assert plan.residual_cash_inr == 0.4
+
+    with pytest.raises(ValueError):
+        allocate_shares(targets, [1.0, 2.0], 100)
+    with pytest.raises(ValueError):
+        allocate_shares(targets, [1.0, 2.0, 3.0], 100, lot_sizes=[1, 0, 1])
+
+
+_share_rows = st.lists(
+    st.tuples(
+        st.integers(0, 100),
+        st.one_of(st.none(), st.integers(1, 5000)),
+        st.sampled_from([1, 1, 5, 25, 500]),
+    ),
+    min_size=1,
+    max_size=30,
+)
+
+
+@settings(deadline=None)
+@given(_share_rows, st.integers(1, 2000))
+def test_allocate_shares_matches_reference(rows, hundreds):
+    # Whole-rupee prices and budgets keep the arithmetic exact, so ties are
+    # broken the same way by both implementations.
+    targets = [TargetWeight(str(i), percent) for i, (percent, _, _) in enumerate(rows)]
+    prices = [None if price is None else float(price) for _, price, _ in rows]
+    lots = [lot for _, _, lot in rows]
+    budget = 100.0 * hundreds
+    assert allocate_shares(targets, prices, budget, lots) == allocate_shares_reference(
+        targets, prices, budget, lots
+    )
+
+
+@settings(deadline=None)
+@given(
+    st.lists(
+        st.tuples(
+            st.integers(0, 100),
+            st.one_of(st.none(), st.floats(0.05, 1e5)),
+            st.integers(1, 500),
+        ),
+        min_size=1,
+        max_size=60,
+    ),
+    st.floats(1, 1e12),
+)
+def test_allocate_shares_invariants(rows, budget):
+    raw = np.array([weight for weight, _, _ in rows], dtype=float) + 1
+    percents = integer_percents(raw / raw.sum())
+    targets = [TargetWeight(str(i), int(p)) for i, p in enumerate(percents)]
+    prices = [price for _, price, _ in rows]
+    lots = [lot for _, _, lot in rows]
+    plan = allocate_shares(targets, prices, budget, lot_sizes=lots)
+
+    spent = sum(i.cost_inr for i in plan.items if i.cost_inr is not None)
+    assert spent <= budget * (1 + 1e-9) + 0.01 * len(rows)
+    for item, target, price, lot in zip(plan.items, targets, prices, lots):
+        if price is None:
+            assert item.shares is None and item.cost_inr is None
+            continue
+        assert item.shares % lot == 0
+        # Every holding gets at least the lots that fit in its target amount,
+        # and no tradable lot still fits in the leftover cash.
+        unit = price * lot
+        assert item.shares // lot >= int(budget * target.percent / 100 / unit) - 1
+        assert plan.residual_cash_inr < unit + 0.01
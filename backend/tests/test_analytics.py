@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from app.db.base import Base
+from app.db.models import Instrument, InstrumentType, Metric
+from app.db.session import get_engine, get_session
+from app.domain.analytics import ANALYTICS_COLUMNS, LOOKBACK, rolling_analytics
+from app.repositories.metrics import MetricRepository
+from app.services.analytics import update_analytics
+
+START = date(2022, 1, 3)
+
+
+def _prices(days: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, days)))
+
+
+def test_rolling_analytics_matches_naive_windows() -> None:
+    prices = _prices(400, seed=1)
+    stats = rolling_analytics(prices)
+
+    returns = np.diff(np.log(prices))
+    volatility = sliding_window_view(returns, 63).std(axis=1, ddof=1) * np.sqrt(252)
+    np.testing.assert_allclose(stats["volatility"][63:], volatility, rtol=1e-9)
+    assert np.isnan(stats["volatility"][:63]).all()
+
+    high = sliding_window_view(prices, 252).max(axis=1)
+    np.testing.assert_allclose(stats["drawdown"][251:], prices[251:] / high - 1)
+    assert (stats["drawdown"][251:] <= 0).all()
+    for window in (50, 200):
+        mean = sliding_window_view(prices, window).mean(axis=1)
+        np.testing.assert_allclose(stats[f"sma_{window}"][window - 1 :], mean)
+        assert np.isnan(stats[f"sma_{window}"][: window - 1]).all()
+    momentum = prices[126:] / prices[:-126] - 1
+    np.testing.assert_allclose(stats["momentum"][126:], momentum)
+
+    # Each day only depends on the last LOOKBACK prices.
+    tail = rolling_analytics(prices[-LOOKBACK:])
+    for column in ANALYTICS_COLUMNS:
+        np.testing.assert_allclose(tail[column][-1], stats[column][-1], rtol=1e-9)
+
+
+def _session_with_history(days: int):
+    engine = get_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = get_session(engine)
+    instruments = [
+        Instrument(symbol=s, name=s, instrument_type=InstrumentType.STOCK)
+        for s in ("TCS", "INFY", "NEW")
+    ]
+    session.add_all(instruments)
+    session.flush()
+    prices = {inst.id: _prices(days, seed=inst.id) for inst in instruments}
+    MetricRepository(session).bulk_upsert(
+        [
+            {
+                "instrument_id": inst.id,
+                "as_of_date": START + timedelta(days=day),
+                "price": float(prices[inst.id][day]),
+            }
+            for inst in instruments
+            # NEW only has its last 30 days.
+            for day in range(days - 30 if inst.symbol == "NEW" else 0, days)
+        ]
+    )
+    session.commit()
+    return session
+
+
+def _stored(session) -> dict[int, dict[str, np.ndarray]]:
+    result = {}
+    for inst in session.query(Instrument).order_by(Instrument.id):
+        metrics = session.query(Metric).filter_by(instrument_id=inst.id)
+        rows = metrics.order_by(Metric.as_of_date).all()
+        result[inst.id] = {
+            c: np.array([getattr(m, c) for m in rows], dtype=np.float64)
+            for c in ("price", *ANALYTICS_COLUMNS)
+        }
+    return result
+
+
+def test_incremental_update_matches_full_backfill() -> None:
+    session = _session_with_history(320)
+    assert update_analytics(session) == 2 * 320 + 30
+    session.commit()
+    for values in _stored(session).values():
+        expected = rolling_analytics(values["price"])
+        for column in ANALYTICS_COLUMNS:
+            np.testing.assert_allclose(values[column], expected[column], rtol=1e-9)
+
+    # Five more days, also rewriting the last stored one.
+    since = START + timedelta(days=319)
+    repo = MetricRepository(session)
+    repo.bulk_upsert(
+        [
+            {
+                "instrument_id": instrument_id,
+                "as_of_date": since + timedelta(days=day),
+                "price": 100.0 + day,
+            }
+            for instrument_id in (1, 3)
+            for day in range(6)
+        ]
+    )
+    # Only the days each new one depends on are read back.
+    window = repo.price_windows(since, [1, 3], LOOKBACK)
+    assert [sum(1 for row in window if row[1] == i) for i in (1, 3)] == [
+        LOOKBACK - 1 + 6,
+        29 + 6,
+    ]
+    assert update_analytics(session, since=since, instrument_ids=[1, 3]) == 12
+    session.commit()
+    stored = _stored(session)
+    assert len(stored[1]["price"]) == 325 and len(stored[2]["price"]) == 320
+    for values in stored.values():
+        expected = rolling_analytics(values["price"])
+        for column in ANALYTICS_COLUMNS:
+            np.testing.assert_allclose(values[column], expected[column], rtol=1e-9)
+    # Instruments with too little history keep NULL statistics.
+    assert session.query(Metric).filter_by(instrument_id=3).first().sma_200 is None
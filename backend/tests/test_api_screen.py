@@ -104,6 +104,12 @@ def test_screen_endpoint_returns_portfolio():
     data = response.json()
     assert len(data["allocations"]) == 3
     assert sum(a["percent"] for a in data["allocations"]) == 100
+    prices = {i["symbol"]: i["metric"]["price"] for i in data["instruments"]}
+    for a in data["allocations"]:
+        assert a["cost_inr"] == a["shares"] * prices[a["symbol"]]
+    spent = sum(a["cost_inr"] for a in data["allocations"])
+    assert data["residual_cash_inr"] == 10000 - spent
+    assert 0 <= data["residual_cash_inr"] < min(prices.values())
     assert "portfolio" in data["explanations"]
     assert data["disclaimer"]
 
@@ -122,3 +128,96 @@ def test_screen_endpoint_validation():
         },
     )
     assert response.status_code == 422
+
+
+def test_screen_batch_returns_results_in_request_order():
+    session = _seed_session()
+    app.dependency_overrides[routes.get_db] = lambda: session
+    requests = [
+        {
+            "budget_inr": budget,
+            "horizon_years": 5,
+            "risk_profile": risk.value,
+            "goal": Goal.GROWTH.value,
+        }
+        for budget, risk in (
+            (10000, RiskProfile.BALANCED),
+            (5000, RiskProfile.SAFE),
+            (20000, RiskProfile.BALANCED),
+        )
+    ]
+
+    client = TestClient(app)
+    response = client.post("/screen/batch", json={"requests": requests})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert len(results) == 3
+    for request, result in zip(requests, results):
+        single = client.post("/screen", json=request).json()
+        assert result == single
+        amounts = [a["amount_inr"] for a in result["allocations"]]
+        assert sum(amounts) == request["budget_inr"]
+
+    assert client.post("/screen/batch", json={"requests": []}).status_code == 422
+    app.dependency_overrides.clear()
+
+
+def test_screen_stream_emits_ndjson_records():
+    import json
+
+    session = _seed_session()
+    app.dependency_overrides[routes.get_db] = lambda: session
+    body = {
+        "budget_inr": 10000,
+        "horizon_years": 5,
+        "risk_profile": RiskProfile.BALANCED.value,
+        "goal": Goal.GROWTH.value,
+    }
+
+    client = TestClient(app)
+    expected = client.post("/screen", json=body).json()
+    response = client.post("/screen", params={"stream": "true"}, json=body)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [r.pop("type") for r in records] == (
+        ["allocation"] * 3
+        + ["instrument"] * 3
+        + ["explanation"] * 3
+        + ["portfolio", "disclaimer"]
+    )
+    assert records[:3] == expected["allocations"]
+    assert records[3:6] == expected["instruments"]
+    assert {r["symbol"]: r["text"] for r in records[6:9]} == expected["explanations"][
+        "instruments"
+    ]
+    assert records[9]["text"] == expected["explanations"]["portfolio"]
+    assert records[10]["text"] == expected["disclaimer"]
+    app.dependency_overrides.clear()
+
+
+def test_fast_path_matches_validated_response(monkeypatch):
+    from app.core.config import get_settings
+
+    session = _seed_session()
+    app.dependency_overrides[routes.get_db] = lambda: session
+    body = {
+        "budget_inr": 12345,
+        "horizon_years": 5,
+        "risk_profile": RiskProfile.BALANCED.value,
+        "goal": Goal.GROWTH.value,
+    }
+    client = TestClient(app)
+    settings = get_settings()
+    monkeypatch.setattr(settings, "STRICT_RESPONSE_VALIDATION", True)
+
+    validated = client.post("/screen", json=body).json()
+    batch_validated = client.post("/screen/batch", json={"requests": [body]}).json()
+    monkeypatch.setattr(settings, "STRICT_RESPONSE_VALIDATION", False)
+    fast = client.post("/screen", json=body)
+    batch_fast = client.post("/screen/batch", json={"requests": [body]})
+
+    assert fast.headers["content-type"] == "application/json"
+    assert fast.json() == validated
+    assert batch_fast.json() == batch_validated
+    app.dependency_overrides.clear()
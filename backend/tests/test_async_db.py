@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import date
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.core.config import Settings
+from app.db.base import Base
+from app.db.models import Instrument, InstrumentType, Metric
+from app.db.session import (
+    async_database_url,
+    dispose_async_engine,
+    get_async_session_factory,
+    get_engine,
+    get_session,
+)
+from app.domain.filtering import screen_candidates, screen_candidates_async
+from app.domain.mapping import Goal, RiskProfile, map_intent_to_filters
+from app.repositories.instruments import AsyncInstrumentRepository
+from app.repositories.metrics import AsyncMetricRepository
+from app.services.portfolio import recommendation_cache, selection_cache
+
+
+def _seed(url: str) -> None:
+    engine = get_engine(url)
+    Base.metadata.create_all(engine)
+    session = get_session(engine)
+    reliance = Instrument(
+        symbol="RELIANCE",
+        name="Reliance Industries",
+        instrument_type=InstrumentType.STOCK,
+        sector="Energy",
+        market_cap=1.5e12,
+    )
+    etf = Instrument(
+        symbol="NIFTYBEES", name="Nifty ETF", instrument_type=InstrumentType.ETF
+    )
+    session.add_all([reliance, etf])
+    session.flush()
+    for day, roe in ((1, 0.05), (2, 0.2)):
+        session.add(
+            Metric(
+                instrument_id=reliance.id,
+                as_of_date=date(2023, 1, day),
+                price=100.0 + day,
+                roe=roe,
+                debt_to_equity=0.3,
+                dividend_yield=0.02,
+                revenue_growth=0.1,
+                earnings_growth=0.1,
+            )
+        )
+    session.add(Metric(instrument_id=etf.id, as_of_date=date(2023, 1, 2), price=50.0))
+    session.commit()
+    session.close()
+    engine.dispose()
+
+
+def test_async_database_url_swaps_sync_drivers() -> None:
+    assert async_database_url("sqlite:///:memory:") == "sqlite+aiosqlite:///:memory:"
+    assert async_database_url("sqlite:///app.db") == "sqlite+aiosqlite:///app.db"
+    assert (
+        async_database_url("postgresql+psycopg2://u:p@db/app")
+        == "postgresql+psycopg://u:p@db/app"
+    )
+    assert (
+        async_database_url("postgresql+asyncpg://u:p@db/app")
+        == "postgresql+asyncpg://u:p@db/app"
+    )
+
+
+def test_async_repositories_and_screening_match_sync(tmp_path) -> None:
+    url = f"sqlite:///{tmp_path / 'app.db'}"
+    _seed(url)
+    settings = Settings(DATABASE_URL=url)
+    filters = map_intent_to_filters(RiskProfile.BALANCED, Goal.GROWTH, 5)
+    session = get_session(get_engine(url))
+    expected = [
+        (c.instrument.symbol, c.metric and c.metric.id)
+        for c in screen_candidates(session, filters)
+    ]
+    session.close()
+
+    async def run() -> None:
+        try:
+            async with get_async_session_factory(settings)() as db:
+                candidates = await screen_candidates_async(db, filters)
+                assert [
+                    (c.instrument.symbol, c.metric and c.metric.id) for c in candidates
+                ] == expected
+
+                instruments = AsyncInstrumentRepository(db)
+                reliance = await instruments.get_by_symbol("RELIANCE")
+                assert reliance is not None
+                metrics = AsyncMetricRepository(db)
+                latest = await metrics.latest_by_instrument("RELIANCE")
+                assert latest is not None and latest.as_of_date == date(2023, 1, 2)
+                assert len(await metrics.list_by_instrument("RELIANCE")) == 2
+        finally:
+            await dispose_async_engine()
+
+    asyncio.run(run())
+
+
+def test_async_screen_endpoint_matches_sync(tmp_path) -> None:
+    url = f"sqlite:///{tmp_path / 'app.db'}"
+    _seed(url)
+    settings = Settings(DATABASE_URL=url, DB_ASYNC=True)
+    body = {
+        "budget_inr": 10000,
+        "horizon_years": 5,
+        "risk_profile": RiskProfile.BALANCED.value,
+        "goal": Goal.GROWTH.value,
+    }
+
+    def make_app(async_mode: bool) -> FastAPI:
+        app = FastAPI()
+        app.state.limiter = routes.limiter
+        app.include_router(routes.router)
+        app.include_router(
+            routes.screen_router(settings.model_copy(update={"DB_ASYNC": async_mode}))
+        )
+        return app
+
+    async def async_db():
+        async with get_async_session_factory(settings)() as session:
+            yield session
+
+    sync_app = make_app(False)
+    sync_session = get_session(get_engine(url))
+    sync_app.dependency_overrides[routes.get_db] = lambda: sync_session
+    async_app = make_app(True)
+    async_app.dependency_overrides[routes.get_async_db] = async_db
+
+    responses = []
+    for app in (sync_app, async_app):
+        recommendation_cache.clear()
+        selection_cache.clear()
+        with TestClient(app) as client:
+            response = client.post("/screen", json=body)
+            assert response.status_code == 200
+            responses.append(response.json())
+            recommend = client.post(
+                "/recommend", json={"text": "invest for growth", **body}
+            )
+            assert recommend.status_code == 200
+            batch = client.post("/screen/batch", json={"requests": [body, body]})
+            assert batch.json()["results"] == [response.json()] * 2
+    sync_session.close()
+    assert responses[0] == responses[1]
+    symbols = [a["symbol"] for a in responses[1]["allocations"]]
+    assert symbols == ["NIFTYBEES", "RELIANCE"]
+
+    asyncio.run(dispose_async_engine())
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import random
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy import func
+
+from app.db.base import Base
+from app.db.models import Instrument, InstrumentType, Metric
+from app.db.session import get_engine, get_session
+from app.domain.backtest import PROFILES, historical_snapshot, rebalance_dates
+from app.domain.universe import SNAPSHOT_COLUMNS
+from app.repositories.metrics import MetricRepository
+from app.cli.backtest import report
+from app.services.backtest import (
+    BacktestConfig,
+    point_in_time_values,
+    point_in_time_values_reference,
+    run_backtest,
+    run_backtest_reference,
+)
+
+START = date(2022, 1, 1)
+
+
+def _seed_session(count: int = 40, days: int = 400, seed: int = 11):
+    """Random-walk prices with fundamentals that drift, some days missing."""
+    rng = random.Random(seed)
+    engine = get_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = get_session(engine)
+    instruments = [
+        Instrument(
+            symbol=f"SYM{i}",
+            name=f"Company {i}",
+            instrument_type=InstrumentType.ETF if i % 8 == 0 else InstrumentType.STOCK,
+            sector=rng.choice(["Energy", "Finance", "Tech", "Health"]),
+            market_cap=rng.uniform(5e10, 2e12),
+        )
+        for i in range(count)
+    ]
+    session.add_all(instruments)
+    session.flush()
+    rows = []
+    for inst in instruments:
+        price = rng.uniform(100, 2000)
+        roe, de = rng.uniform(0.05, 0.35), rng.uniform(0.1, 1.5)
+        listed = rng.randint(0, days // 2)
+        for day in range(listed, days):
+            price *= 1 + rng.gauss(0.0005, 0.02)
+            roe += rng.gauss(0, 0.01)
+            de = max(de + rng.gauss(0, 0.02), 0.0)
+            if rng.random() < 0.1:
+                continue
+            rows.append(
+                {
+                    "instrument_id": inst.id,
+                    "as_of_date": START + timedelta(days=day),
+                    "price": price,
+                    "roe": roe,
+                    "debt_to_equity": de,
+                    "dividend_yield": rng.uniform(0, 0.05),
+                    "revenue_growth": rng.uniform(-0.1, 0.3),
+                    "earnings_growth": rng.uniform(-0.1, 0.3),
+                }
+            )
+    MetricRepository(session).bulk_upsert(rows)
+    session.commit()
+    return session
+
+
+def test_rebalance_dates_are_month_ends() -> None:
+    assert rebalance_dates(date(2023, 1, 15), date(2023, 5, 31)) == [
+        date(2023, 1, 31),
+        date(2023, 2, 28),
+        date(2023, 3, 31),
+        date(2023, 4, 30),
+        date(2023, 5, 31),
+    ]
+    assert rebalance_dates(date(2023, 1, 1), date(2023, 12, 1), months=4) == [
+        date(2023, 1, 31),
+        date(2023, 5, 31),
+        date(2023, 9, 30),
+    ]
+    with pytest.raises(ValueError):
+        rebalance_dates(date(2023, 1, 1), date(2023, 2, 1), months=0)
+
+
+def test_incremental_point_in_time_values_match_per_date_queries() -> None:
+    session = _seed_session()
+    dates = rebalance_dates(START, START + timedelta(days=399))
+    # Instruments missing a day, or not yet listed, carry values forward.
+    for ids in (np.arange(1, 41), np.arange(1, 41, 3)):
+        states = list(point_in_time_values(session, ids, dates))
+        assert len(states) == len(dates)
+        for as_of, state in zip(dates, states):
+            expected = point_in_time_values_reference(session, ids, as_of)
+            np.testing.assert_array_equal(state, expected)
+
+
+def test_parallel_backtest_matches_sequential_reference() -> None:
+    session = _seed_session()
+    config = BacktestConfig(start=date(2022, 3, 1))
+    expected = run_backtest_reference(session, config)
+    dates = rebalance_dates(config.start, START + timedelta(days=399))
+    assert len(expected.periods) == (len(dates) - 1) * len(PROFILES)
+    assert any(p.weights for p in expected.periods)
+
+    for workers in (0, 2):
+        result = run_backtest(session, config, workers=workers)
+        assert [
+            (p.risk_profile, p.goal, p.start, p.weights) for p in result.periods
+        ] == [(p.risk_profile, p.goal, p.start, p.weights) for p in expected.periods]
+        np.testing.assert_allclose(
+            [p.period_return for p in result.periods],
+            [p.period_return for p in expected.periods],
+        )
+        assert result.years == pytest.approx(expected.years)
+
+    # Nothing is held before it has a price, ETFs included.
+    listed = dict(
+        session.query(Instrument.symbol, func.min(Metric.as_of_date))
+        .join(Metric)
+        .group_by(Instrument.symbol)
+        .all()
+    )
+    held = {(p.start, s) for p in result.periods for s, _ in p.weights}
+    assert all(listed[symbol] <= start for start, symbol in held)
+    assert any(listed[symbol] > date(2022, 3, 31) for _, symbol in held)
+
+    summaries = result.summaries()
+    assert [(s.risk_profile, s.goal) for s in summaries] == list(PROFILES)
+    for summary in summaries:
+        own = [
+            p.period_return
+            for p in result.periods
+            if (p.risk_profile, p.goal) == (summary.risk_profile, summary.goal)
+        ]
+        assert summary.periods == len(own)
+        assert summary.total_return == pytest.approx(np.prod(np.add(own, 1)) - 1)
+        assert 0 <= summary.max_drawdown < 1
+    assert "per year" in report(result).splitlines()[-1]
+
+
+def test_historical_snapshot_uses_prices_of_the_time() -> None:
+    etf, stock = InstrumentType.ETF, InstrumentType.STOCK
+    instruments = [
+        Instrument(id=i + 1, symbol=f"SYM{i}", name=f"Company {i}", instrument_type=t)
+        for i, t in enumerate([etf, etf, stock, stock])
+    ]
+    values = np.full((len(SNAPSHOT_COLUMNS), 4), np.nan)
+    price = SNAPSHOT_COLUMNS.index("price")
+    # The second ETF has not listed yet; the small stock was worth more then.
+    values[price] = [10.0, np.nan, 100.0, 50.0]
+    shares = np.array([1e6, 1e6, 1e8, 1e9])
+    snapshot = historical_snapshot(instruments, shares, values)
+    assert [i.symbol for i in snapshot.instruments] == ["SYM0", "SYM3", "SYM2"]
+    np.testing.assert_array_equal(snapshot.market_cap[1:], [5e10, 1e10])
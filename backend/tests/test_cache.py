@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from app.core.cache import LRUCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_lru_evicts_least_recently_used() -> None:
+    cache: LRUCache[str, int] = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now the oldest entry
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions) == (3, 1, 1)
+    assert stats.size == 2
+    assert stats.hit_ratio == 0.75
+
+
+def test_entries_expire_after_ttl() -> None:
+    clock = FakeClock()
+    cache: LRUCache[str, int] = LRUCache(maxsize=10, ttl_seconds=5, clock=clock)
+    cache.set("a", 1)
+    clock.now = 4.9
+    assert cache.get("a") == 1
+    clock.now = 5.0
+    assert cache.get("a") is None
+    assert cache.stats().expirations == 1
+    assert len(cache) == 0
+
+
+def test_get_or_set_computes_once_and_zero_size_disables() -> None:
+    calls: list[int] = []
+
+    def factory() -> int:
+        calls.append(1)
+        return 42
+
+    cache: LRUCache[str, int] = LRUCache(maxsize=1)
+    assert cache.get_or_set("k", factory) == 42
+    assert cache.get_or_set("k", factory) == 42
+    assert len(calls) == 1
+
+    disabled: LRUCache[str, int] = LRUCache(maxsize=0)
+    disabled.get_or_set("k", factory)
+    disabled.get_or_set("k", factory)
+    assert len(calls) == 3
+    assert len(disabled) == 0
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import numpy as np
+
+from app.db.models import Instrument, InstrumentType
+from app.domain.calibration import (
+    SWEPT_FIELDS,
+    CalibrationArrays,
+    ParameterGrid,
+    evaluate_grid,
+    evaluate_grid_reference,
+)
+from app.domain.mapping import Goal, RiskProfile, map_intent_to_filters
+from app.domain.universe import SNAPSHOT_COLUMNS, UniverseSnapshot
+from app.services.calibration import sweep
+
+GRID = ParameterGrid(
+    min_market_cap=(1e10, 2e11, 1e12),
+    max_de_ratio=(0.5, 1.5),
+    min_roe=(0.0, 0.15, 0.3),
+    # Yields tie at 0.02, and 0.06 leaves no candidates.
+    min_div_yield=(0.0, 0.02, 0.06),
+)
+
+
+def _snapshot(count: int = 300, seed: int = 3) -> UniverseSnapshot:
+    rng = np.random.default_rng(seed)
+    instruments = [
+        Instrument(
+            id=i + 1,
+            symbol=f"SYM{i}",
+            name=f"Company {i}",
+            instrument_type=InstrumentType.ETF if i % 10 == 0 else InstrumentType.STOCK,
+            sector=[None, "Energy", "Finance", "Tech", "Health"][i % 5],
+            market_cap=float(rng.uniform(1e9, 2e12)),
+        )
+        for i in range(count)
+    ]
+    columns = {
+        "price": rng.uniform(10, 3000, count),
+        "roe": rng.uniform(-0.1, 0.4, count),
+        "debt_to_equity": rng.uniform(0, 2.0, count),
+        "dividend_yield": rng.choice([0.0, 0.01, 0.02, 0.035, 0.05], count),
+        "revenue_growth": rng.uniform(-0.2, 0.3, count),
+        "earnings_growth": rng.uniform(-0.2, 0.3, count),
+    }
+    values = np.array(
+        [columns.get(name, np.full(count, np.nan)) for name in SNAPSHOT_COLUMNS]
+    )
+    values[1:5, rng.random(count) < 0.1] = np.nan
+    return UniverseSnapshot.from_columns(instruments, values)
+
+
+def test_vectorized_sweep_matches_screening_each_point() -> None:
+    snapshot = _snapshot()
+    points = GRID.points()
+    assert points.shape == (len(GRID), len(SWEPT_FIELDS)) == (54, 4)
+    profiles = ((RiskProfile.BALANCED, Goal.INCOME), (RiskProfile.SAFE, Goal.GROWTH))
+    for risk, goal in profiles:
+        base = map_intent_to_filters(risk, goal, 5)
+        expected = evaluate_grid_reference(snapshot, base, points)
+        assert (expected.candidates == 0).any() and expected.candidates.max() > 20
+        arrays = CalibrationArrays.from_snapshot(snapshot, base)
+        for chunk_size in (5, 1000):
+            stats = evaluate_grid(arrays, points, chunk_size)
+            np.testing.assert_array_equal(stats.candidates, expected.candidates)
+            np.testing.assert_array_equal(stats.sectors, expected.sectors)
+            for field in ("concentration", "mean_yield", "median_yield"):
+                np.testing.assert_allclose(
+                    getattr(stats, field), getattr(expected, field), rtol=1e-12
+                )
+
+        best = stats.best(min_candidates=10, k=5)
+        assert (stats.candidates[best] >= 10).all()
+        assert list(stats.sectors[best]) == sorted(stats.sectors[best], reverse=True)
+        assert stats.sectors[best[0]] == stats.sectors[stats.candidates >= 10].max()
+
+
+def test_pool_sweep_over_shared_arrays_matches_inline() -> None:
+    snapshot = _snapshot(count=500)
+    base = map_intent_to_filters(RiskProfile.AGGRESSIVE, Goal.GROWTH, 5)
+    points = GRID.points()
+    inline = sweep(snapshot, base, points, workers=0)
+    pooled = sweep(snapshot, base, points, workers=2)
+    np.testing.assert_array_equal(pooled.points, points)
+    np.testing.assert_array_equal(pooled.candidates, inline.candidates)
+    np.testing.assert_allclose(pooled.median_yield, inline.median_yield, rtol=1e-12)
+    # Growth bias stays applied: only stocks growing on both counts are swept.
+    arrays = CalibrationArrays.from_snapshot(snapshot, base)
+    growing = (snapshot.revenue_growth > 0) & (snapshot.earnings_growth > 0)
+    assert 0 < len(arrays) <= (snapshot.is_stock & growing).sum()
+    assert inline.candidates.max() <= len(arrays)
@@ -33,3 +33,16 @@ def test_settings_env_overrides(monkeypatch) -> None:
     assert settings.DATABASE_URL == "postgresql://db"
     assert settings.AI_PROVIDER == "openai"
     assert settings.AI_API_KEY == "token"
+
+
+def test_pool_settings(monkeypatch) -> None:
+    monkeypatch.setenv("DB_POOL_SIZE", "20")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "0")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+    monkeypatch.setenv("DB_POOL_RECYCLE", "60")
+    _clear_cache()
+    settings = get_settings()
+    assert settings.DB_POOL_SIZE == 20
+    assert settings.DB_MAX_OVERFLOW == 0
+    assert settings.DB_POOL_PRE_PING is False
+    assert settings.DB_POOL_RECYCLE == 60
@@ -26,3 +26,68 @@ def test_insert_instrument_and_metric() -> None:
     result = session.query(Metric).filter_by(instrument_id=instrument.id).one()
     assert result.price == 100.0
     assert result.instrument_id == instrument.id
+
+
+def _query_plan(session, call) -> str:
+    """Run ``call`` and return SQLite's query plan for the last statement."""
+    from sqlalchemy import event
+
+    captured: list[tuple[str, object]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        call()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    statement, parameters = captured[-1]
+    cursor = session.connection().connection.cursor()
+    rows = cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+    return "\n".join(row[-1] for row in rows)
+
+
+def test_latest_metric_lookup_uses_primary_keys() -> None:
+    from datetime import timedelta
+
+    from app.repositories.metrics import MetricRepository
+
+    engine = get_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = get_session(engine)
+    instruments = [
+        Instrument(symbol=f"S{i}", name=f"S{i}", instrument_type=InstrumentType.STOCK)
+        for i in range(20)
+    ]
+    session.add_all(instruments)
+    session.flush()
+    session.add_all(
+        Metric(
+            instrument_id=inst.id,
+            as_of_date=date(2020, 1, 1) + timedelta(days=d),
+            price=100.0,
+        )
+        for inst in instruments
+        for d in range(50)
+    )
+    session.commit()
+
+    repo = MetricRepository(session)
+    plan = _query_plan(session, lambda: repo.latest_by_instrument("S3"))
+    assert "SEARCH metrics USING INTEGER PRIMARY KEY" in plan
+    assert "SCAN metrics" not in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_instrument_type_lookup_uses_index() -> None:
+    from app.domain.filtering import filter_candidates_iterative
+    from app.domain.mapping import Goal, RiskProfile, map_intent_to_filters
+
+    engine = get_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = get_session(engine)
+    filters = map_intent_to_filters(RiskProfile.AGGRESSIVE, Goal.GROWTH, 5)
+    plan = _query_plan(session, lambda: filter_candidates_iterative(session, filters))
+    assert "ix_instruments_type_market_cap" in plan
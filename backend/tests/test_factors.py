@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+import numpy as np
+import pytest
+from hypothesis import given, strategies as st
+
+from app.domain.factors import FACTORS, percentile_ranks, top_k, zscores
+from app.domain.filtering import filter_candidates
+from app.domain.mapping import Goal, RiskProfile, map_intent_to_filters
+from app.domain.types import FactorWeights, ScoreMethod
+from app.domain.universe import build_universe_snapshot
+
+maybe_nan = st.one_of(st.integers(-5, 5).map(float), st.just(np.nan))
+values_and_groups = st.integers(0, 40).flatmap(
+    lambda n: st.tuples(
+        st.lists(maybe_nan, min_size=n, max_size=n),
+        st.lists(st.integers(0, 3), min_size=n, max_size=n),
+    )
+)
+
+
+def _naive_percentile(values: list[float], groups: list[int]) -> list[float]:
+    result = []
+    for v, g in zip(values, groups):
+        if np.isnan(v):
+            result.append(np.nan)
+            continue
+        peers = [p for p, h in zip(values, groups) if h == g and not np.isnan(p)]
+        if len(peers) == 1:
+            result.append(0.5)
+            continue
+        below = sum(p < v for p in peers)
+        equal = sum(p == v for p in peers)
+        result.append((below + (equal - 1) / 2) / (len(peers) - 1))
+    return result
+
+
+@given(values_and_groups)
+def test_percentile_ranks_and_zscores_match_per_group_definitions(data) -> None:
+    values, groups = data
+    v, g = np.array(values, dtype=np.float64), np.array(groups, dtype=np.intp)
+    np.testing.assert_allclose(
+        percentile_ranks(v, g), _naive_percentile(values, groups), atol=1e-12
+    )
+
+    z = zscores(v, g)
+    for group in set(groups):
+        members = (g == group) & ~np.isnan(v)
+        if members.any():
+            peers = v[members]
+            std = peers.std()
+            expected = (peers - peers.mean()) / std if std > 0 else 0 * peers
+            np.testing.assert_allclose(z[members], expected, atol=1e-9)
+    assert np.isnan(z[np.isnan(v)]).all()
+
+
+@given(
+    st.lists(st.one_of(st.integers(0, 6).map(float), st.just(np.nan)), max_size=60),
+    st.integers(0, 70),
+)
+def test_top_k_matches_a_full_sort(scores: list[float], k: int) -> None:
+    keys = np.array(scores, dtype=np.float64)
+    full = sorted(
+        range(len(scores)),
+        key=lambda i: (np.isnan(keys[i]), -np.nan_to_num(keys[i]), i),
+    )
+    assert top_k(keys, k).tolist() == full[:k]
+
+
+def test_snapshot_ranks_stocks_by_composite_score(random_universe) -> None:
+    session = random_universe(200, seed=5, etf_every=9)
+    snapshot = build_universe_snapshot(session)
+    base = map_intent_to_filters(RiskProfile.AGGRESSIVE, Goal.GROWTH, 5)
+    weights = FactorWeights(roe=2.0, debt_to_equity=1.0, growth=1.0)
+
+    for factor_weights in (
+        weights,
+        replace(weights, sector_relative=True),
+        replace(weights, method=ScoreMethod.ZSCORE),
+    ):
+        for cap in (2, 1000):
+            filters = replace(
+                base,
+                factor_weights=factor_weights,
+                max_instruments=cap,
+                include_etfs=True,
+            )
+            ranked = filter_candidates(session, filters, snapshot)
+            symbols = [i.symbol for i in ranked]
+            # Scores are precomputed per snapshot; there is no SQL fallback.
+            with pytest.raises(ValueError):
+                filter_candidates(session, filters)
+
+            plain = filter_candidates(session, replace(filters, factor_weights=None))
+            etfs = [i.symbol for i in plain if i.instrument_type.value == "etf"]
+            assert symbols[: len(etfs)] == etfs[: cap * 2]
+            rows = {inst.symbol: row for row, inst in enumerate(snapshot.instruments)}
+            composite = snapshot.score(factor_weights)
+            scores = [composite[rows[s]] for s in symbols[len(etfs) :]]
+            assert scores == sorted(scores, reverse=True)
+            if cap == 1000:
+                assert sorted(symbols) == sorted(i.symbol for i in plain)
+
+
+def test_lower_leverage_and_valuation_score_higher(random_universe) -> None:
+    snapshot = build_universe_snapshot(random_universe(200, seed=5, etf_every=9))
+    stocks = snapshot.is_stock & ~np.isnan(snapshot.debt_to_equity)
+    de_score = snapshot.factors.percentile[FACTORS.index("debt_to_equity")]
+    lowest = np.nanargmin(np.where(stocks, snapshot.debt_to_equity, np.nan))
+    assert de_score[lowest] == 1.0
+
+    pe = np.array(
+        [np.nan if m is None or m.pe is None else m.pe for m in snapshot.metrics]
+    )
+    pe[~snapshot.is_stock] = np.nan
+    pe_score = snapshot.factors.percentile[FACTORS.index("pe")]
+    assert pe_score[np.nanargmax(np.where(pe > 0, pe, np.nan))] == 0.0
+    assert np.isnan(pe_score[pe <= 0]).all()
+    assert np.isnan(snapshot.factors.percentile[:, snapshot.is_etf]).all()
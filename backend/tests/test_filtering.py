@@ -1,14 +1,21 @@
 from __future__ import annotations
 
+from dataclasses import replace
 from datetime import date
 
 from app.db.base import Base
 from app.db.models import Instrument, InstrumentType, Metric
 from app.db.session import get_engine, get_session
-from app.domain.filtering import filter_candidates
+from app.domain.filtering import filter_candidates, filter_candidates_iterative
 from app.domain.mapping import Goal, RiskProfile, map_intent_to_filters
 
 
+# Rolling-analytics thresholds, each checked on top of every mapped profile.
+PRICE_THRESHOLDS = dict(
+    max_volatility=0.45, max_drawdown=0.3, min_momentum=-0.1, above_sma_200=True
+)
+
+
 def _setup_db():
     engine = get_engine("sqlite:///:memory:")
     Base.metadata.create_all(engine)
@@ -140,3 +147,21 @@ def test_aggressive_growth_focuses_on_high_growth_stocks():
     symbols = {inst.symbol for inst in result}
     # ETF excluded and only TINY passes aggressive thresholds using latest metric
     assert symbols == {"TINY"}
+
+
+def test_set_based_query_matches_iterative_reference(random_universe):
+    session = random_universe(300)
+    for risk in RiskProfile:
+        for goal in Goal:
+            mapped = map_intent_to_filters(risk, goal, 5)
+            # Also compare with the cap lifted so the full ordering is checked.
+            lifted = replace(mapped, max_instruments=1000)
+            thresholds = [
+                replace(lifted, **{name: value})
+                for name, value in PRICE_THRESHOLDS.items()
+            ]
+            for filters in (mapped, lifted, *thresholds):
+                expected = filter_candidates_iterative(session, filters)
+                assert [i.symbol for i in filter_candidates(session, filters)] == [
+                    i.symbol for i in expected
+                ]
@@ -1,16 +1,33 @@
 from __future__ import annotations
 
 import pathlib
+import sys
+import time
+from datetime import date, datetime, timedelta
 
+import pandas as pd
 import pytest
 import vcr
+from sqlalchemy import event
+from sqlalchemy.orm import Session
 
-from app.cli.seed import SEED_INSTRUMENTS
+from app.cli import ingest as cli
+from app.cli.ingest import ingest, last_weekday
+from app.cli.seed import SEED_INSTRUMENTS, seed
 from app.db.base import Base
-from app.db.models import Instrument, InstrumentType, Metric
+from app.db.models import (
+    IngestionRun,
+    IngestionRunSymbol,
+    IngestionStatus,
+    Instrument,
+    InstrumentType,
+    LatestMetric,
+    Metric,
+)
 from app.db.session import get_engine, get_session
 from app.repositories.instruments import InstrumentRepository
 from app.repositories.metrics import MetricRepository
+from app.services.ingestion.base import Ingestor
 from app.services.ingestion.yf_ingestor import YFIngestor
 
 
@@ -52,3 +69,233 @@ def test_ingestion_persists_latest_metrics(inst_index: int, cassette_name: str)
         assert latest.pe is None
     else:
         assert latest.pe == metrics["pe"]
+
+
+class StubTicker:
+    """Offline stand-in for ``yf.Ticker`` with injectable latency and failures."""
+
+    def __init__(self, symbol: str, latency: float = 0.0, failures: int = 0) -> None:
+        self.symbol = symbol
+        self.latency = latency
+        self.failures = failures
+        self.info = {"trailingPE": 20.0, "dividendYield": 0.01}
+
+    def history(self, period: str) -> pd.DataFrame:
+        time.sleep(self.latency)
+        if self.failures > 0:
+            self.failures -= 1
+            raise ConnectionError("flaky upstream")
+        index = pd.DatetimeIndex([pd.Timestamp("2024-01-02")])
+        return pd.DataFrame({"Close": [100.0 + len(self.symbol)]}, index=index)
+
+
+def _factory(**kwargs):
+    tickers: dict[str, StubTicker] = {}
+
+    def make(symbol: str) -> StubTicker:
+        if symbol not in tickers:
+            tickers[symbol] = StubTicker(symbol, **kwargs)
+        return tickers[symbol]
+
+    return make
+
+
+def test_concurrent_fetch_is_bounded_and_ordered() -> None:
+    symbols = [f"SYM{i}.NS" for i in range(8)]
+    serial = YFIngestor(ticker_factory=_factory(latency=0.05))
+    concurrent = YFIngestor(concurrency=8, ticker_factory=_factory(latency=0.05))
+
+    start = time.perf_counter()
+    expected = serial.fetch_metrics(symbols)
+    serial_time = time.perf_counter() - start
+    start = time.perf_counter()
+    results = concurrent.fetch(symbols)
+    concurrent_time = time.perf_counter() - start
+
+    assert [r.symbol for r in results] == symbols
+    assert {r.symbol: r.metrics for r in results} == expected
+    assert expected["SYM0.NS"] == {
+        "as_of_date": date(2024, 1, 2),
+        "price": 107.0,
+        "pe": 20.0,
+        "dividend_yield": 0.01,
+    }
+    assert concurrent_time < serial_time / 2
+
+
+def test_fetch_retries_with_backoff_then_reports_failure() -> None:
+    sleeps: list[float] = []
+    flaky = YFIngestor(
+        max_retries=2,
+        backoff_seconds=0.5,
+        ticker_factory=_factory(failures=2),
+        sleep=sleeps.append,
+    )
+    [result] = flaky.fetch(["INFY.NS"])
+    assert result.ok and result.attempts == 3
+    assert sleeps == [0.5, 1.0]
+
+    broken = YFIngestor(
+        max_retries=1, ticker_factory=_factory(failures=5), sleep=lambda _: None
+    )
+    [result] = broken.fetch(["INFY.NS"])
+    assert not result.ok
+    assert result.attempts == 2
+    assert "ConnectionError" in (result.error or "")
+
+
+def test_fetch_times_out_slow_symbols() -> None:
+    ingestor = YFIngestor(timeout_seconds=0.05, ticker_factory=_factory(latency=0.5))
+    [result] = ingestor.fetch(["SLOW.NS"])
+    assert not result.ok
+    assert "TimeoutError" in (result.error or "")
+
+
+def test_batched_download_skips_per_symbol_history() -> None:
+    calls: list[list[str]] = []
+
+    def download(symbols: list[str], **_: object) -> pd.DataFrame:
+        calls.append(list(symbols))
+        index = pd.DatetimeIndex(["2024-01-01", "2024-01-02"])
+        columns = pd.MultiIndex.from_product([symbols, ["Close"]])
+        rows = [[1.0] * len(symbols), [2.0] * len(symbols)]
+        return pd.DataFrame(rows, index=index, columns=columns)
+
+    class NoHistory(StubTicker):
+        def history(self, period: str) -> pd.DataFrame:
+            raise AssertionError("history should not be called")
+
+    symbols = ["A.NS", "B.NS", "C.NS"]
+    ingestor = YFIngestor(
+        concurrency=2, batch_size=2, ticker_factory=NoHistory, download=download
+    )
+    data = ingestor.fetch_metrics(symbols)
+    assert calls == [["A.NS", "B.NS"], ["C.NS"]]
+    assert {m["price"] for m in data.values()} == {2.0}
+    assert data["C.NS"]["as_of_date"] == date(2024, 1, 2)
+
+
+class FakeIngestor(Ingestor):
+    def __init__(self, data: dict[str, dict[str, object]]) -> None:
+        self.data = data
+
+    def fetch_metrics(self, symbols: list[str]) -> dict[str, dict[str, object]]:
+        return {s: self.data[s] for s in symbols if s in self.data}
+
+
+def test_ingest_upserts_metrics_in_one_transaction() -> None:
+    engine = get_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = get_session(engine)
+    seed(session)
+    day = date(2024, 1, 2)
+    ingestor = FakeIngestor(
+        {
+            "RELIANCE.NS": {"as_of_date": day, "price": 2500.0, "pe": 25.0},
+            "NIFTYBEES.NS": {"as_of_date": day, "price": 230.0, "pe": 21.0},
+        }
+    )
+
+    commits: list[int] = []
+    event.listen(session, "after_commit", lambda _: commits.append(1))
+    ingest(session, ingestor)
+    assert len(commits) == 1
+
+    ingestor.data["RELIANCE.NS"]["price"] = 2600.0
+    ingest(session, ingestor)
+
+    metrics = session.query(Metric).all()
+    assert len(metrics) == 2
+    repo = MetricRepository(session)
+    latest = repo.latest_by_instrument("RELIANCE.NS")
+    assert latest is not None and latest.price == 2600.0
+    etf = repo.latest_by_instrument("NIFTYBEES.NS")
+    assert etf is not None and etf.pe is None
+    assert session.query(IngestionRun).count() == 2
+
+    ingestor.data["RELIANCE.NS"] = {"as_of_date": date(2024, 1, 3), "price": 2700.0}
+    ingest(session, ingestor)
+    latest = repo.latest_by_instrument("RELIANCE.NS")
+    assert latest is not None and latest.as_of_date == date(2024, 1, 3)
+    assert session.query(LatestMetric).count() == 2
+    session.close()
+
+
+class RecordingIngestor(FakeIngestor):
+    def __init__(self, data: dict[str, dict[str, object]]) -> None:
+        super().__init__(data)
+        self.requested: list[list[str]] = []
+
+    def fetch_metrics(self, symbols: list[str]) -> dict[str, dict[str, object]]:
+        self.requested.append(sorted(symbols))
+        return super().fetch_metrics(symbols)
+
+
+def test_incremental_ingest_fetches_only_stale_or_failed_symbols() -> None:
+    assert last_weekday(date(2024, 1, 6)) == date(2024, 1, 5)
+    assert last_weekday(date(2024, 1, 8)) == date(2024, 1, 8)
+    engine = get_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = get_session(engine)
+    seed(session)
+    today = datetime.utcnow().date()
+    ingestor = RecordingIngestor(
+        {
+            "RELIANCE.NS": {"as_of_date": today, "price": 2500.0},
+            # A run before today's close only gets yesterday's close.
+            "NIFTYBEES.NS": {"as_of_date": today - timedelta(days=1), "price": 230.0},
+        }
+    )
+    everything = sorted(s["symbol"] for s in SEED_INSTRUMENTS)
+
+    run = ingest(session, ingestor, incremental=True, as_of=today)
+    assert run is not None and ingestor.requested == [everything]
+    statuses = {o.instrument_id: (o.status, o.error, o.attempts) for o in run.symbols}
+    by_symbol = {i.symbol: i.id for i in session.query(Instrument)}
+    assert statuses[by_symbol["RELIANCE.NS"]] == (IngestionStatus.OK, None, 1)
+    assert statuses[by_symbol["INFY.NS"]] == (IngestionStatus.FAILED, "no data", 1)
+    assert len(statuses) == session.query(IngestionRunSymbol).count() == 4
+
+    # Only the failed symbols and those still lacking today's close are
+    # fetched again.
+    ingestor.data["INFY.NS"] = {"as_of_date": today, "price": 1500.0}
+    ingest(session, ingestor, incremental=True, as_of=today)
+    assert ingestor.requested[-1] == ["HDFCBANK.NS", "INFY.NS", "NIFTYBEES.NS"]
+    ingest(session, ingestor, incremental=True, as_of=today)
+    assert ingestor.requested[-1] == ["HDFCBANK.NS", "NIFTYBEES.NS"]
+    latest = MetricRepository(session).latest_by_instrument("INFY.NS")
+    assert latest is not None and latest.price == 1500.0
+
+    # A run after the close gets today's data.
+    ingestor.data["HDFCBANK.NS"] = {"as_of_date": today, "price": 1600.0}
+    ingestor.data["NIFTYBEES.NS"] = {"as_of_date": today, "price": 231.0}
+    ingest(session, ingestor, incremental=True, as_of=today)
+    runs = session.query(IngestionRun).count()
+    assert ingest(session, ingestor, incremental=True, as_of=today) is None
+    assert session.query(IngestionRun).count() == runs == 4
+    assert session.query(LatestMetric).count() == len(everything)
+    # A new trading day makes every instrument stale again.
+    ingest(session, ingestor, incremental=True, as_of=today + timedelta(days=1))
+    assert ingestor.requested[-1] == everything
+    session.close()
+
+
+def test_main_reads_the_process_arguments(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[tuple[bool, date | None]] = []
+
+    def record(
+        session: Session, incremental: bool = False, as_of: date | None = None
+    ) -> None:
+        calls.append((incremental, as_of))
+
+    monkeypatch.setattr(cli, "ingest", record)
+    monkeypatch.setattr(sys, "argv", ["ingest-metrics", "--incremental", "2024-05-01"])
+    cli.main()
+    monkeypatch.setattr(sys, "argv", ["ingest-metrics"])
+    cli.main()
+    assert calls == [(True, date(2024, 5, 1)), (False, None)]
+
+    for argv in (["--full"], ["--incremental", "May 1"], ["2024-05-01"]):
+        with pytest.raises(SystemExit):
+            cli.main(argv)
+    assert len(calls) == 2
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.api import routes
+from app.core.cache import LRUCache
+from app.core.config import Settings
+from app.domain.mapping import Goal, RiskProfile
+from app.main import app
+from app.services.interpretation import build_interpreter
+from app.services.nlp.base import Intent, InterpreterUnavailable
+from app.services.nlp.cache import CachingInterpreter
+from app.services.nlp.fallback import FallbackInterpreter
+from app.services.nlp.llm_interpreter import LLMInterpreter, parse_completion
+from app.services.nlp.mock_interpreter import MockInterpreter
+from app.services.nlp.stub_server import StubProvider
+
+PROMPT = "invest 5 lakh safe income 10 years"
+
+
+@pytest.fixture
+def stub():
+    with StubProvider() as provider:
+        yield provider
+
+
+def test_provider_reply_becomes_intent(stub: StubProvider) -> None:
+    intent = LLMInterpreter(stub.base_url).interpret(PROMPT)
+    assert intent == MockInterpreter().interpret(PROMPT)
+    assert intent["risk_profile"] is RiskProfile.SAFE
+    assert intent["goal"] is Goal.INCOME
+
+
+def test_identical_concurrent_prompts_share_one_call(stub: StubProvider) -> None:
+    stub.latency = 0.1
+    interpreter = LLMInterpreter(stub.base_url)
+
+    async def run() -> list[Intent]:
+        try:
+            return await asyncio.gather(
+                *(interpreter.interpret_async(PROMPT) for _ in range(20))
+            )
+        finally:
+            await interpreter.aclose()
+
+    intents = asyncio.run(run())
+    assert stub.requests == 1
+    assert all(i == intents[0] for i in intents)
+    assert intents[0] is not intents[1]
+
+
+def test_concurrency_is_capped(stub: StubProvider) -> None:
+    stub.latency = 0.05
+    interpreter = LLMInterpreter(stub.base_url, max_concurrency=3)
+
+    async def run() -> None:
+        try:
+            await asyncio.gather(
+                *(interpreter.interpret_async(f"invest {n} lakh") for n in range(12))
+            )
+        finally:
+            await interpreter.aclose()
+
+    asyncio.run(run())
+    assert stub.requests == 12
+    assert stub.max_in_flight == 3
+
+
+def test_timeout_falls_back_without_caching(stub: StubProvider) -> None:
+    stub.latency = 0.5
+    cache: LRUCache[str, Intent] = LRUCache(maxsize=8)
+    interpreter = FallbackInterpreter(
+        CachingInterpreter(LLMInterpreter(stub.base_url, timeout_seconds=0.1), cache),
+        MockInterpreter(),
+    )
+    assert interpreter.interpret(PROMPT) == MockInterpreter().interpret(PROMPT)
+    assert interpreter.fallbacks == 1
+    assert len(cache) == 0
+
+
+def _reply(content: str) -> dict:
+    return {"choices": [{"message": {"content": content}}]}
+
+
+def test_malformed_reply_is_unavailable() -> None:
+    with pytest.raises(InterpreterUnavailable):
+        parse_completion(_reply("not json"))
+    with pytest.raises(InterpreterUnavailable):
+        parse_completion(_reply('{"risk_profile": "reckless"}'))
+    assert parse_completion(_reply('{"goal": "income", "budget_inr": null}')) == {
+        "goal": Goal.INCOME
+    }
+
+
+def test_interpret_route_uses_configured_provider(
+    stub: StubProvider, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    settings = Settings(AI_PROVIDER="openai", AI_BASE_URL=stub.base_url)
+    interpreter = build_interpreter(settings, LRUCache(maxsize=8))
+    monkeypatch.setattr(routes, "_interpreter", interpreter)
+    monkeypatch.setattr(main, "interpreter", interpreter)  # closed at shutdown
+    with TestClient(app) as client:
+        response = client.post("/interpret", json={"text": PROMPT})
+    assert response.status_code == 200
+    assert response.json()["risk_profile"] == RiskProfile.SAFE.value
+    assert stub.requests == 1
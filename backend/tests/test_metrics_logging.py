@@ -11,6 +11,7 @@ def test_metrics_returns_uptime() -> None:
     assert response.status_code == 200
     data = response.json()
     assert data["uptime_seconds"] > 0
+    assert set(data["recommendation_cache"]) >= {"hits", "misses", "evictions"}
 
 
 def test_request_logging_includes_request_id(caplog) -> None:
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from app.core.cache import LRUCache
+from app.domain.mapping import Goal, RiskProfile
+from app.main import app
+from app.services.nlp.base import Intent, IntentInterpreter
+from app.services.nlp.cache import CachingInterpreter, IntentStore, normalize_prompt
+from app.services.nlp.mock_interpreter import MockInterpreter
+
+
+class CountingInterpreter(IntentInterpreter):
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+        self._inner = MockInterpreter()
+
+    def interpret(self, text: str) -> Intent:
+        self.calls.append(text)
+        return self._inner.interpret(text)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_normalize_prompt_canonicalizes_case_spacing_and_numbers() -> None:
+    assert normalize_prompt("  Invest 5,00,000\tSAFE  income 10yrs ") == (
+        "invest 500000 safe income 10 yrs"
+    )
+    assert normalize_prompt("invest 2.50 Lakh") == "invest 2.5 lakh"
+    assert normalize_prompt("with 5.0L for 3 years") == "with 5 l for 3 years"
+    assert normalize_prompt("budget 10k") == normalize_prompt("Budget  10 K")
+
+
+def test_near_identical_prompts_share_one_interpretation() -> None:
+    inner = CountingInterpreter()
+    cached = CachingInterpreter(inner, LRUCache(maxsize=16))
+
+    first = cached.interpret("Invest 5 lakh safe income 10 years")
+    second = cached.interpret("invest   5 LAKH safe income 10 years ")
+    assert first == second == {
+        "budget_inr": 500_000,
+        "horizon_years": 10,
+        "risk_profile": RiskProfile.SAFE,
+        "goal": Goal.INCOME,
+    }
+    assert inner.calls == ["invest 5 lakh safe income 10 years"]
+    assert cached.cache.stats().hit_ratio == 0.5
+
+    first["budget_inr"] = 1.0  # callers get their own copy
+    again = cached.interpret("invest 5 lakh safe income 10 years")
+    assert again["budget_inr"] == 500_000
+
+
+def test_entries_expire_after_ttl() -> None:
+    clock = FakeClock()
+    inner = CountingInterpreter()
+    cache: LRUCache[str, Intent] = LRUCache(maxsize=16, ttl_seconds=60, clock=clock)
+    cached = CachingInterpreter(inner, cache)
+    cached.interpret("safe income")
+    clock.now += 60
+    cached.interpret("safe income")
+    assert len(inner.calls) == 2
+
+
+def test_store_survives_restart(tmp_path: Path) -> None:
+    path = tmp_path / "intents.sqlite3"
+    clock = FakeClock()
+    store = IntentStore(path, ttl_seconds=3600, clock=clock)
+    CachingInterpreter(CountingInterpreter(), LRUCache(maxsize=16), store).interpret(
+        "aggressive growth 3 years invest 2 lakh"
+    )
+    store.close()
+
+    inner = CountingInterpreter()
+    restarted = CachingInterpreter(
+        inner,
+        LRUCache(maxsize=16),
+        IntentStore(path, ttl_seconds=3600, clock=clock),
+    )
+    intent = restarted.interpret("Aggressive growth 3 years  invest 2 Lakh")
+    assert inner.calls == []
+    assert intent["risk_profile"] is RiskProfile.AGGRESSIVE
+    assert intent["goal"] is Goal.GROWTH
+    assert intent["budget_inr"] == 200_000
+
+    clock.now += 3600
+    restarted.cache.clear()
+    restarted.interpret("aggressive growth 3 years invest 2 lakh")
+    assert len(inner.calls) == 1
+
+
+def test_store_is_namespaced_per_interpreter(tmp_path: Path) -> None:
+    store = IntentStore(tmp_path / "intents.sqlite3")
+    CachingInterpreter(MockInterpreter(), LRUCache(maxsize=4), store).interpret("safe")
+    inner = CountingInterpreter()
+    CachingInterpreter(inner, LRUCache(maxsize=4), store).interpret("safe")
+    assert inner.calls == ["safe"]
+
+
+def test_metrics_reports_interpret_cache() -> None:
+    with TestClient(app) as client:
+        client.post("/interpret", json={"text": "Safe income, invest 1 lakh"})
+        client.post("/interpret", json={"text": "safe income,  invest 1 LAKH"})
+        stats = client.get("/metrics").json()["interpret_cache"]
+    assert stats["hits"] >= 1
+    assert 0 < stats["hit_ratio"] <= 1
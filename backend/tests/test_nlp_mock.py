@@ -31,3 +31,39 @@ def test_interpret_defaults() -> None:
         "horizon_years": 5,
         "budget_inr": 0.0,
     }
+
+
+def _random_prompts(count: int, seed: int = 0) -> list[str]:
+    import random
+
+    fragments = [
+        "safe", "unsafe", "Conservative", "aggressive", "high risk", "balanced",
+        "moderate", "income", "dividend", "growth", "invest", "with", "budget",
+        "withdraw", "5 years", "12yrs", "3 yr", "10 YEAR", "invest 5k",
+        "with 2 lakh", "budget 1.5 crore", "invest5cr", "2 lac", "for my kids",
+        "retire", "SIP", "INVEST 3 LAKH", "7", "k", "1.", "invest 12years",
+    ]
+    rng = random.Random(seed)
+    prompts = []
+    for _ in range(count):
+        prompt = " ".join(rng.choice(fragments) for _ in range(rng.randint(0, 8)))
+        prompts.append(prompt.replace(" ", "") if rng.random() < 0.2 else prompt)
+    return prompts
+
+
+def test_interpret_matches_reference_rules() -> None:
+    from app.services.nlp.mock_interpreter import interpret_reference
+
+    interp = MockInterpreter()
+    for prompt in _random_prompts(5_000):
+        assert interp.interpret(prompt) == interpret_reference(prompt), prompt
+
+
+def test_interpret_many_preserves_order_and_copies() -> None:
+    interp = MockInterpreter()
+    prompts = _random_prompts(50, seed=1) * 2
+    results = interp.interpret_many(prompts)
+    assert results == [interp.interpret(p) for p in prompts]
+    results[0]["budget_inr"] = -1.0
+    assert results[50]["budget_inr"] != -1.0
+    assert interp.interpret_many([]) == []
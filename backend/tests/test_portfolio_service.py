@@ -101,3 +101,183 @@ def test_recommend_portfolio_balanced_growth():
     assert explanations["portfolio"]
     assert len(explanations["instruments"]) == 3
     assert result["disclaimer"]
+
+
+def test_recommend_portfolio_query_count_is_constant():
+    from sqlalchemy import event
+
+    from app.domain.universe import build_universe_snapshot
+
+    session = _seed_session()
+    for i in range(10):
+        inst = Instrument(
+            symbol=f"EXTRA{i}",
+            name=f"Extra {i}",
+            instrument_type=InstrumentType.STOCK,
+            sector=f"Sector {i}",
+            market_cap=2e11,
+        )
+        session.add(inst)
+        session.flush()
+        session.add(
+            Metric(
+                instrument_id=inst.id,
+                as_of_date=date(2023, 1, 1),
+                price=10.0,
+                roe=0.2,
+                debt_to_equity=0.2,
+                dividend_yield=0.04,
+                revenue_growth=0.1,
+                earnings_growth=0.1,
+            )
+        )
+    session.commit()
+
+    statements: list[str] = []
+    event.listen(
+        session.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    def count_queries(risk_profile, snapshot=None):
+        statements.clear()
+        result = recommend_portfolio(
+            session,
+            budget_inr=10000,
+            horizon_years=5,
+            risk_profile=risk_profile,
+            goal=Goal.GROWTH,
+            snapshot=snapshot,
+        )
+        return len(statements), len(result["instruments"])
+
+    # SAFE, BALANCED and AGGRESSIVE allocate 3, 4 and 5 instruments.
+    sql_counts = {count_queries(risk) for risk in RiskProfile}
+    assert {size for _, size in sql_counts} == {3, 4, 5}
+    assert {queries for queries, _ in sql_counts} == {1}
+
+    snapshot = build_universe_snapshot(session)
+    for risk in RiskProfile:
+        assert count_queries(risk, snapshot)[0] == 0
+    session.close()
+
+
+def test_cached_recommendation_is_invalidated_by_new_ingestion_run():
+    from app.core.cache import LRUCache
+    from app.db.models import IngestionRun
+    from app.services.portfolio import cached_recommend_portfolio
+
+    session = _seed_session()
+    cache = LRUCache(maxsize=8)
+
+    def recommend():
+        return cached_recommend_portfolio(
+            session,
+            budget_inr=10000,
+            horizon_years=5,
+            risk_profile=RiskProfile.BALANCED,
+            goal=Goal.GROWTH,
+            cache=cache,
+        )
+
+    first = recommend()
+    assert recommend() is first
+    assert (cache.stats().hits, cache.stats().misses) == (1, 1)
+
+    session.add(IngestionRun())
+    session.commit()
+    assert recommend() is not first
+    assert cache.stats().misses == 2
+    session.close()
+
+
+def test_selection_cache_is_shared_across_budgets():
+    from app.core.cache import LRUCache
+
+    session = _seed_session()
+    cache = LRUCache(maxsize=8)
+    results = [
+        recommend_portfolio(
+            session,
+            budget_inr=budget,
+            horizon_years=5,
+            risk_profile=RiskProfile.BALANCED,
+            goal=Goal.GROWTH,
+            selection_cache=cache,
+        )
+        for budget in (10000, 25000, 777)
+    ]
+    assert (cache.stats().misses, cache.stats().hits) == (1, 2)
+    for budget, result in zip((10000, 25000, 777), results):
+        assert sum(a["amount_inr"] for a in result["allocations"]) == budget
+        assert [a["percent"] for a in result["allocations"]] == [
+            a["percent"] for a in results[0]["allocations"]
+        ]
+    session.close()
+
+
+def test_recommend_portfolios_screens_each_distinct_filter_once():
+    from sqlalchemy import event
+
+    from app.services.portfolio import PortfolioIntent, recommend_portfolios
+
+    session = _seed_session()
+    intents = [
+        PortfolioIntent(budget, years, risk, goal)
+        for budget in (10000, 25000)
+        for years in (3, 10)
+        for risk in (RiskProfile.SAFE, RiskProfile.BALANCED)
+        for goal in Goal
+    ]
+    intents.append(intents[0])
+
+    statements: list[str] = []
+    event.listen(
+        session.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    results = recommend_portfolios(session, intents)
+
+    # Two risk profiles times two goals give four distinct filter sets.
+    assert len(statements) == 4
+    assert results[-1] is results[0]
+    for intent, result in zip(intents, results):
+        expected = recommend_portfolio(
+            session,
+            intent.budget_inr,
+            intent.horizon_years,
+            intent.risk_profile,
+            intent.goal,
+        )
+        assert result == expected
+    session.close()
+
+
+def test_score_weighting_uses_snapshot_factor_scores():
+    from dataclasses import replace
+
+    import pytest
+
+    from app.domain.mapping import map_intent_to_filters
+    from app.domain.types import FactorWeights, WeightingScheme
+    from app.domain.universe import build_universe_snapshot
+    from app.services.portfolio import select_portfolio
+
+    session = _seed_session()
+    snapshot = build_universe_snapshot(session)
+    filters = replace(
+        map_intent_to_filters(RiskProfile.BALANCED, Goal.GROWTH, 5),
+        include_etfs=False,
+        weighting=WeightingScheme.SCORE,
+        factor_weights=FactorWeights(roe=1.0),
+    )
+    selection = select_portfolio(session, filters, snapshot)
+    # Percentile ROE scores are 1 for HDFCBANK and 0 for RELIANCE.
+    weights = {t.symbol: t.percent for t in selection.targets}
+    assert weights == {"HDFCBANK": 100, "RELIANCE": 0}
+
+    with pytest.raises(ValueError):
+        select_portfolio(session, replace(filters, factor_weights=None), snapshot)
+    session.close()
@@ -2,9 +2,12 @@ from __future__ import annotations
 
 from datetime import date
 
+import pytest
+
 from app.db.base import Base
-from app.db.models import Instrument, InstrumentType, Metric
+from app.db.models import Instrument, InstrumentType, LatestMetric, Metric
 from app.db.session import get_engine, get_session
+from app.db.upsert import upsert
 from app.repositories.instruments import InstrumentRepository
 from app.repositories.metrics import MetricRepository
 
@@ -59,3 +62,68 @@ def test_repositories_work() -> None:
     latest = metric_repo.latest_by_instrument("TCS")
     assert latest is not None
     assert latest.price == 110.0
+
+
+def test_bulk_upsert_is_idempotent() -> None:
+    engine = get_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = get_session(engine)
+    inst = InstrumentRepository(session).create(
+        Instrument(symbol="TCS", name="TCS", instrument_type=InstrumentType.STOCK)
+    )
+    repo = MetricRepository(session)
+    rows = [
+        {"instrument_id": inst.id, "as_of_date": date(2023, 1, d), "price": 100.0 + d}
+        for d in (1, 2)
+    ]
+    assert repo.bulk_upsert(rows) == 2
+    repo.bulk_upsert([{**rows[1], "price": 999.0}])
+    session.commit()
+
+    metrics = repo.list_by_instrument("TCS")
+    assert [m.price for m in metrics] == [101.0, 999.0]
+    assert repo.bulk_upsert([]) == 0
+    session.close()
+    with pytest.raises(ValueError):
+        upsert("mssql", Metric.__table__, ["instrument_id", "as_of_date"], ["price"])
+
+
+def test_latest_pointer_follows_orm_writes() -> None:
+    engine = get_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = get_session(engine)
+    tcs = InstrumentRepository(session).create(
+        Instrument(symbol="TCS", name="TCS", instrument_type=InstrumentType.STOCK)
+    )
+    repo = MetricRepository(session)
+    newest = repo.create(
+        Metric(instrument_id=tcs.id, as_of_date=date(2023, 1, 2), price=120.0)
+    )
+    repo.create(Metric(instrument_id=tcs.id, as_of_date=date(2023, 1, 1), price=100.0))
+    assert session.get(LatestMetric, tcs.id).metric_id == newest.id
+
+    session.delete(newest)
+    session.commit()
+    latest = repo.latest_by_instrument("TCS")
+    assert latest is not None and latest.price == 100.0
+
+    # Moving a metric to another instrument refreshes both pointers.
+    infy = InstrumentRepository(session).create(
+        Instrument(symbol="INFY", name="Infosys", instrument_type=InstrumentType.STOCK)
+    )
+    latest.instrument_id = infy.id
+    session.commit()
+    assert session.get(LatestMetric, tcs.id) is None
+    assert session.get(LatestMetric, infy.id).metric_id == latest.id
+    latest.instrument_id = tcs.id
+    session.commit()
+
+    # Core writes bypass the ORM events until the pointers are refreshed.
+    repo.bulk_upsert(
+        [{"instrument_id": tcs.id, "as_of_date": date(2023, 1, 5), "price": 150.0}]
+    )
+    repo.refresh_latest([tcs.id])
+    session.commit()
+    latest = repo.latest_by_instrument("TCS")
+    assert latest is not None and latest.price == 150.0
+    session.close()
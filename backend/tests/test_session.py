@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from app.core.config import Settings
+from app.db.session import dispose_engine, get_engine, get_session_factory, init_engine
+
+
+def test_session_factory_is_created_once(tmp_path) -> None:
+    settings = Settings(DATABASE_URL=f"sqlite:///{tmp_path / 'app.db'}", DB_POOL_SIZE=3)
+    try:
+        engine = init_engine(settings)
+        factory = get_session_factory(settings)
+        assert get_session_factory(settings) is factory
+        assert factory.kw["bind"] is engine
+        assert engine.pool.size() == 3  # type: ignore[attr-defined]
+    finally:
+        dispose_engine()
+
+
+def test_session_factory_is_lazily_initialised() -> None:
+    dispose_engine()
+    factory = get_session_factory(Settings())
+    try:
+        session = factory()
+        session.close()
+        assert get_session_factory(Settings()) is factory
+    finally:
+        dispose_engine()
+
+
+def test_memory_engine_ignores_pool_options() -> None:
+    engine = get_engine("sqlite:///:memory:", pool_size=5, max_overflow=10)
+    with engine.connect():
+        pass
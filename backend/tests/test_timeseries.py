@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from app.db.base import Base
+from app.db.models import IngestionRun, Instrument, InstrumentType, Metric
+from app.db.session import get_engine, get_session
+from app.repositories.metrics import MetricRepository
+from app.repositories.metrics import METRIC_VALUE_COLUMNS
+from app.repositories.timeseries import MetricHistoryRepository, SeriesCache
+
+START = date(2023, 1, 1)
+
+
+def _seed_session(days: int = 40):
+    engine = get_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = get_session(engine)
+    tcs = Instrument(symbol="TCS", name="TCS", instrument_type=InstrumentType.STOCK)
+    infy = Instrument(symbol="INFY", name="INFY", instrument_type=InstrumentType.STOCK)
+    session.add_all([tcs, infy])
+    session.flush()
+    # Insert out of order to check that reads come back sorted by date.
+    for day in reversed(range(days)):
+        session.add_all(
+            [
+                Metric(
+                    instrument_id=tcs.id,
+                    as_of_date=START + timedelta(days=day),
+                    price=100.0 + day,
+                    pe=None if day % 7 == 0 else 20.0 + day / 10,
+                ),
+                Metric(
+                    instrument_id=infy.id,
+                    as_of_date=START + timedelta(days=day),
+                    price=50.0,
+                ),
+            ]
+        )
+    session.add(IngestionRun())
+    session.commit()
+    return session
+
+
+def test_history_matches_orm_rows() -> None:
+    session = _seed_session()
+    history = MetricHistoryRepository(session)
+    metrics = MetricRepository(session).list_by_instrument("TCS")
+
+    series = history.history("TCS", columns=("price", "pe"))
+    assert len(series) == len(metrics)
+    assert series.dates.dtype == np.dtype("datetime64[D]")
+    assert series.dates.tolist() == [m.as_of_date for m in metrics]
+    assert series["price"].tolist() == [m.price for m in metrics]
+    pe = [np.nan if m.pe is None else m.pe for m in metrics]
+    np.testing.assert_array_equal(series["pe"], pe)
+    assert series["price"].flags.c_contiguous
+
+    window = history.history("TCS", start=date(2023, 1, 10), end=date(2023, 1, 19))
+    assert window.dates[0] == np.datetime64("2023-01-10")
+    assert window.dates[-1] == np.datetime64("2023-01-19")
+    assert list(window.values) == ["price"]
+    assert len(history.history("UNKNOWN")) == 0
+    with pytest.raises(ValueError):
+        history.history("TCS", columns=("price", "symbol"))
+
+
+def test_stream_and_pages_cover_the_range() -> None:
+    session = _seed_session()
+    history = MetricHistoryRepository(session)
+    expected = history.history("TCS", start=date(2023, 1, 5))
+
+    chunks = list(history.stream("TCS", start=date(2023, 1, 5), chunk_size=8))
+    assert [len(c) for c in chunks] == [8, 8, 8, 8, 4]
+    assert np.concatenate([c.dates for c in chunks]).tolist() == expected.dates.tolist()
+
+    pages, after = [], None
+    while len(page := history.page("TCS", after=after, limit=15)):
+        pages.append(page)
+        after = page.dates[-1].item()
+    assert [len(p) for p in pages] == [15, 15, 10]
+    assert np.concatenate([p["price"] for p in pages]).tolist() == (
+        history.history("TCS")["price"].tolist()
+    )
+
+
+def test_cache_serves_memory_maps_until_the_next_ingestion_run(tmp_path) -> None:
+    session = _seed_session()
+    cache = SeriesCache(tmp_path)
+    cached = MetricHistoryRepository(session, cache)
+    direct = MetricHistoryRepository(session)
+
+    series = cached.history("TCS", columns=("pe",), start=date(2023, 1, 3))
+    assert isinstance(series["pe"], np.memmap)
+    np.testing.assert_array_equal(
+        series["pe"], direct.history("TCS", ("pe",), start=date(2023, 1, 3))["pe"]
+    )
+    assert [p.name for p in (tmp_path / "TCS").iterdir()] == ["v1"]
+    chunks = list(cached.stream("TCS", chunk_size=16))
+    assert [len(c) for c in chunks] == [16, 16, 8]
+    assert cached.page("TCS", after=date(2023, 2, 5))["price"].tolist() == [
+        136.0,
+        137.0,
+        138.0,
+        139.0,
+    ]
+
+    # Until a new ingestion run, later writes are not visible through the cache.
+    tcs = session.query(Instrument).filter_by(symbol="TCS").one()
+    session.add(Metric(instrument_id=tcs.id, as_of_date=date(2023, 3, 1), price=1.0))
+    session.commit()
+    assert len(cached.history("TCS")) == 40
+    session.add(IngestionRun())
+    session.commit()
+    assert len(cached.history("TCS")) == 41
+    assert [p.name for p in (tmp_path / "TCS").iterdir()] == ["v2"]
+
+    # Unknown symbols are not stored and cannot leave the cache directory.
+    assert len(cached.history("../../etc")) == 0
+    assert [p.name for p in tmp_path.iterdir()] == ["TCS"]
+    cache.set("../x", 2, direct.history("TCS", METRIC_VALUE_COLUMNS))
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["%2E%2E%2Fx", "TCS"]
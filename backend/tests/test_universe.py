@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+import pytest
+
+from app.db.models import IngestionRun
+from app.domain.filtering import filter_candidates
+from app.domain.mapping import Goal, RiskProfile, map_intent_to_filters
+from app.domain.universe import build_universe_snapshot
+from app.services.universe import UniverseStore
+
+
+# Rolling-analytics thresholds, each checked on top of every mapped profile.
+PRICE_THRESHOLDS = dict(
+    max_volatility=0.45, max_drawdown=0.3, min_momentum=-0.1, above_sma_200=True
+)
+
+
+def test_snapshot_matches_sql_screening(random_universe):
+    session = random_universe(200, seed=3, etf_every=7, max_days=2)
+    snapshot = build_universe_snapshot(session)
+    assert len(snapshot) == 200
+    for risk in RiskProfile:
+        for goal in Goal:
+            mapped = map_intent_to_filters(risk, goal, 5)
+            lifted = replace(mapped, max_instruments=1000)
+            thresholds = [
+                replace(lifted, **{name: value})
+                for name, value in PRICE_THRESHOLDS.items()
+            ]
+            for filters in (mapped, lifted, *thresholds):
+                expected = [i.symbol for i in filter_candidates(session, filters)]
+                actual = [
+                    i.symbol for i in filter_candidates(session, filters, snapshot)
+                ]
+                assert actual == expected
+
+
+def test_snapshot_columns_are_read_only(random_universe):
+    snapshot = build_universe_snapshot(random_universe(10))
+    with pytest.raises(ValueError):
+        snapshot.roe[0] = 1.0
+
+
+def test_store_swaps_snapshot_when_data_version_changes(random_universe):
+    session = random_universe(20)
+    store = UniverseStore(refresh_seconds=0)
+    first = store.get(session)
+    assert store.get(session) is first
+    assert first.data_version is None
+
+    session.add(IngestionRun())
+    session.commit()
+    second = store.get(session)
+    assert second is not first
+    assert second.data_version == 1
+
+
+def test_store_rebuilds_for_a_different_database(random_universe):
+    store = UniverseStore(refresh_seconds=60)
+    first = store.get(random_universe(20))
+    other = random_universe(5)
+    assert len(store.get(other)) == 5
+    assert store.snapshot is not first
@@ -20,6 +20,8 @@ export interface Allocation {
   symbol: string;
   percent: number;
   amount_inr: number;
+  shares?: number | null;
+  cost_inr?: number | null;
 }
 
 export interface MetricPayload {
@@ -48,6 +50,7 @@ export interface ExplanationsPayload {
 
 export interface ScreenResponse {
   allocations: Allocation[];
+  residual_cash_inr?: number | null;
   instruments: InstrumentPayload[];
   explanations: ExplanationsPayload;
   disclaimer: string;